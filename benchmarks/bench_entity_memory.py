@@ -0,0 +1,90 @@
+"""
+Benchmark:
+Memory footprint of entity objects
+
+Builds many `Atom`, `Bond` and `ProteinSequence` objects and reports the
+memory allocated per object by the slotted classes in comparison to
+equivalent objects that store the same attributes in an instance
+dictionary, as the classes did before `__slots__` were introduced.
+The attribute values are shared between all objects, so that only the
+overhead of the objects themselves is measured.
+
+Usage:
+    python benchmarks/bench_entity_memory.py [--num 1000000]
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from af3cli.bond import Atom, Bond
+from af3cli.sequence import ProteinSequence, MSA
+
+
+# classes storing the attributes in an instance dictionary like the
+# previous classes, one per entity class to enable key-sharing dictionaries
+DICT_CLASSES: dict[type, type] = {}
+
+
+def slot_names(cls: type) -> list[str]:
+    return [name for klass in cls.__mro__
+            for name in getattr(klass, "__slots__", ())]
+
+
+def as_dict_object(obj: object) -> object:
+    cls = type(obj)
+    if cls not in DICT_CLASSES:
+        DICT_CLASSES[cls] = type(f"Dict{cls.__name__}", (object,), {})
+    legacy = DICT_CLASSES[cls]()
+    for name in slot_names(type(obj)):
+        setattr(legacy, name, getattr(obj, name))
+    return legacy
+
+
+def bytes_per_object(factory, num: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    objects = [factory(i) for i in range(num)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # the list holding the objects is not part of the per-object overhead
+    size -= objects.__sizeof__()
+    del objects
+    return size / num
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--num", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    atom1, atom2 = Atom("A", 1, "CA"), Atom("L", 1, "C1")
+    msa = MSA(unpaired="", unpaired_is_path=True)
+    seq_id, modifications, templates = ["A"], [], []
+
+    def sequence(_):
+        return ProteinSequence("MVKVGVNGFGRIGR", seq_id=seq_id, msa=msa,
+                               modifications=modifications,
+                               templates=templates)
+
+    cases = (
+        ("Atom", lambda _: Atom("A", 1, "CA")),
+        ("Bond", lambda _: Bond(atom1, atom2)),
+        ("ProteinSequence", sequence),
+    )
+
+    print(f"{'class':<16} {'__dict__':>12} {'__slots__':>12} {'saved':>8}")
+    for name, slotted in cases:
+        # the same values are stored in an instance dictionary, the
+        # temporary slotted object is released immediately
+        legacy_size = bytes_per_object(
+            lambda i: as_dict_object(slotted(i)), args.num
+        )
+        slotted_size = bytes_per_object(slotted, args.num)
+        saved = 1 - slotted_size / legacy_size
+        print(f"{name:<16} {legacy_size:>10.1f} B {slotted_size:>10.1f} B "
+              f"{saved:>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
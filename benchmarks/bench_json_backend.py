@@ -0,0 +1,86 @@
+"""
+Benchmark:
+JSON backends
+
+Measures the time for writing and reading synthetic AlphaFold3 input files
+with 1, 100 and 10k entities, with and without inline MSAs, for each
+installed JSON backend (orjson, ujson and the standard library).
+
+Usage:
+    python benchmarks/bench_json_backend.py [--msa-kb 10] [--repeat 3]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from af3cli import InputBuilder, ProteinSequence, MSA
+from af3cli.backend import JSON_BACKENDS, get_json_backend
+from af3cli.io import read_json, write_json
+
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+NUM_ENTITIES = (1, 100, 10_000)
+
+
+def build_input(num_entities: int, msa_kb: float):
+    rng = random.Random(42)
+    seq_len = 200
+    num_rows = int(msa_kb * 1024 / (seq_len + 6))
+    builder = InputBuilder()
+    for _ in range(num_entities):
+        seq = "".join(rng.choices(AMINO_ACIDS, k=seq_len))
+        msa = None
+        if num_rows:
+            a3m = f">query\n{seq}\n" + f">hit\n{seq}\n" * num_rows
+            msa = MSA(unpaired=a3m, paired=a3m)
+        builder.add_sequence(ProteinSequence(seq, msa=msa))
+    return builder.build()
+
+
+def best_of(repeat: int, func, *args, **kwargs) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--msa-kb", type=float, default=10.0,
+                        help="size of each inline MSA in KB")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    backends = []
+    for name in JSON_BACKENDS:
+        try:
+            get_json_backend(name)
+            backends.append(name)
+        except ImportError:
+            print(f"skipping {name} (not installed)")
+
+    print(f"{'entities':>9}{'MSA':>5}{'backend':>9}"
+          f"{'write [s]':>11}{'read [s]':>10}{'lazy [s]':>10}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, "input.json")
+        for num_entities in NUM_ENTITIES:
+            for msa_kb in (0, args.msa_kb):
+                data = build_input(num_entities, msa_kb)
+                for name in backends:
+                    t_write = best_of(args.repeat, write_json,
+                                      filename, data, backend=name)
+                    t_read = best_of(args.repeat, read_json,
+                                     filename, backend=name)
+                    t_lazy = best_of(args.repeat, read_json,
+                                     filename, lazy=True, backend=name)
+                    print(f"{num_entities:>9}{'yes' if msa_kb else 'no':>5}"
+                          f"{name:>9}{t_write:>11.4f}{t_read:>10.4f}"
+                          f"{t_lazy:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
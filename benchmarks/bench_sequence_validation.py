@@ -0,0 +1,90 @@
+"""
+Benchmark:
+Sequence validation
+
+Compares the previous character-by-character implementation of
+`is_valid_sequence` with the table-driven `find_invalid_residue` for short
+peptides, typical proteins and megabase-scale nucleic acids, as well as
+for a proteome-wide batch of sequences.
+
+Usage:
+    python benchmarks/bench_sequence_validation.py [--repeat 5]
+"""
+
+import argparse
+import random
+import time
+
+from af3cli.sequence import (SequenceType, SEQ_ALPHABETS,
+                             find_invalid_residue, is_valid_sequence)
+
+CASES = (
+    ("peptide", SequenceType.PROTEIN, 15, 100_000),
+    ("protein", SequenceType.PROTEIN, 400, 10_000),
+    ("dna 1 Mb", SequenceType.DNA, 1_000_000, 5),
+    ("rna 1 Mb", SequenceType.RNA, 1_000_000, 5),
+)
+PROTEOME_SIZE = 20_000
+
+
+def legacy_is_valid_sequence(seq_type: SequenceType, seq_str: str) -> bool:
+    # implementation before the table-driven validation
+    SEQ_CHAR_SETS = {
+        SequenceType.PROTEIN: set("ACDEFGHIKLMNPQRSTVWY"),
+        SequenceType.DNA: set("ACGT"),
+        SequenceType.RNA: set("ACGU")
+    }
+    return all(char in SEQ_CHAR_SETS[seq_type] for char in seq_str)
+
+
+def best_of(repeat: int, number: int, func, *args) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func(*args)
+        timings.append((time.perf_counter() - start) / number)
+    return min(timings)
+
+
+def validate_all(validator, seq_type: SequenceType, sequences: list[str]):
+    for seq_str in sequences:
+        validator(seq_type, seq_str)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    rng = random.Random(42)
+
+    print(f"{'case':>10}{'legacy [us]':>14}{'valid [us]':>13}"
+          f"{'find [us]':>12}{'speedup':>10}")
+    for name, seq_type, length, number in CASES:
+        seq_str = "".join(rng.choices(SEQ_ALPHABETS[seq_type], k=length))
+        legacy_number = max(1, number // 10)
+        t_legacy = best_of(args.repeat, legacy_number,
+                           legacy_is_valid_sequence, seq_type, seq_str)
+        t_valid = best_of(args.repeat, number,
+                          is_valid_sequence, seq_type, seq_str)
+        t_find = best_of(args.repeat, number,
+                         find_invalid_residue, seq_type, seq_str)
+        print(f"{name:>10}{t_legacy * 1e6:>14.2f}{t_valid * 1e6:>13.2f}"
+              f"{t_find * 1e6:>12.2f}{t_legacy / t_valid:>9.1f}x")
+
+    proteome = [
+        "".join(rng.choices(SEQ_ALPHABETS[SequenceType.PROTEIN],
+                            k=rng.randint(50, 1000)))
+        for _ in range(PROTEOME_SIZE)
+    ]
+    t_legacy = best_of(args.repeat, 1, validate_all,
+                       legacy_is_valid_sequence, SequenceType.PROTEIN, proteome)
+    t_valid = best_of(args.repeat, 1, validate_all,
+                      is_valid_sequence, SequenceType.PROTEIN, proteome)
+    print(f"\nproteome ({PROTEOME_SIZE} sequences): "
+          f"legacy {t_legacy:.3f} s, table-driven {t_valid:.3f} s "
+          f"({t_legacy / t_valid:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark:
+streaming JSON writer
+
+Compares the streaming `write_json` (indented and compact) with the former
+approach of building the complete dictionary and serializing it with
+`json.dump`. Every variant runs in a fresh process to measure the increase
+of the peak resident set size (RSS) caused by writing the file.
+
+Usage:
+    python benchmarks/bench_write_json.py [--entities 20] [--msa-mb 10]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import resource
+import tempfile
+import time
+
+from af3cli import InputBuilder, ProteinSequence, MSA
+from af3cli.io import write_json
+
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+
+
+def legacy_write_json(filename, data):
+    with open(filename, "w") as json_file:
+        json.dump(data.to_dict(), json_file, indent=4)
+
+
+def streaming_write_json(filename, data):
+    write_json(filename, data)
+
+
+def compact_write_json(filename, data):
+    write_json(filename, data, compact=True)
+
+
+VARIANTS = {
+    "json.dump(to_dict())": legacy_write_json,
+    "write_json": streaming_write_json,
+    "write_json(compact)": compact_write_json,
+}
+
+
+def build_input(num_entities: int, msa_mb: float):
+    rng = random.Random(42)
+    seq_len = 400
+    num_rows = int(msa_mb * 1024 * 1024 / (seq_len + 10))
+    builder = InputBuilder()
+    for _ in range(num_entities):
+        seq = "".join(rng.choices(AMINO_ACIDS, k=seq_len))
+        row = "".join(rng.choices(AMINO_ACIDS, k=seq_len))
+        a3m = f">query\n{seq}\n" + f">hit\n{row}\n" * num_rows
+        builder.add_sequence(
+            ProteinSequence(seq, msa=MSA(paired=a3m, unpaired=a3m))
+        )
+    return builder.build()
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is given in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_variant(name, num_entities, msa_mb, queue):
+    data = build_input(num_entities, msa_mb)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, "input.json")
+        rss_before = _peak_rss_mb()
+        start = time.perf_counter()
+        VARIANTS[name](filename, data)
+        elapsed = time.perf_counter() - start
+        rss_after = _peak_rss_mb()
+        size_mb = os.path.getsize(filename) / 1024 / 1024
+    queue.put((name, elapsed, rss_after - rss_before, size_mb))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entities", type=int, default=20)
+    parser.add_argument("--msa-mb", type=float, default=10.0,
+                        help="size of each inline MSA in MB")
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    print(f"{'variant':<24}{'time [s]':>10}{'peak RSS +[MB]':>16}{'size [MB]':>12}")
+    for name in VARIANTS:
+        proc = ctx.Process(
+            target=run_variant,
+            args=(name, args.entities, args.msa_mb, queue)
+        )
+        proc.start()
+        name, elapsed, rss, size_mb = queue.get()
+        proc.join()
+        print(f"{name:<24}{elapsed:>10.2f}{rss:>16.1f}{size_mb:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,13 +13,23 @@ from af3cli import InputFile
 from .builder import InputBuilder
 from .ligand import Ligand, LigandType, sdf2smiles
 from .bond import Bond
+from .batch import run_batch, fasta_split
+from .backend import set_json_backend
+from .store import externalize, externalize_files
+from .cache import harvest, attach_cached
+from .pairing import pair_msas
+from .mmcif import trim_mmcif
+from .align import align_template, align_templates
+from .validate import validate_many, write_report, check_bounds
 from .sequence import Sequence, SequenceType
 from .sequence import ProteinSequence, DNASequence, RNASequence
 from .sequence import Template, TemplateType, MSA
 from .sequence import (Modification, NucleotideModification,
                        ResidueModification)
-from .sequence import read_fasta, fasta2seq
+from .sequence import read_fasta, fasta2seq, fasta_fetch
 from .sequence import is_valid_sequence
+from .sequence import DEFAULT_MAX_IDENTITY
+from .exception import AFMSAError, AFTemplateError
 
 # CONSTANTS
 MAX_RANDOM_SEED: int = 99999
@@ -131,7 +141,7 @@ def read_sdf_file(filename: str) -> list[str]:
         exit_on_error(f"Failed to read SDF file: {e}")
 
 
-def read_fasta_entry(filename: str) -> str:
+def read_fasta_entry(filename: str, record: str | None = None) -> str:
     """
     Reads a single entry from a FASTA file and returns its sequence string.
 
@@ -139,6 +149,8 @@ def read_fasta_entry(filename: str) -> str:
     ----------
     filename : str
         The path to the FASTA file to be read.
+    record : str or None, optional
+        The identifier of the record. If None, the first record is used.
 
     Returns
     -------
@@ -148,11 +160,14 @@ def read_fasta_entry(filename: str) -> str:
     Raises
     ------
     SystemExit
-        If Biopython is not installed or if the specified FASTA file
-        does not exist / contains no valid sequences.
+        If the specified FASTA file does not exist or contains
+        no valid sequences.
     """
     try:
-        fasta_file = read_fasta(filename)
+        if record is None:
+            fasta_file = read_fasta(filename)
+        else:
+            fasta_file = fasta_fetch(filename, [record])
         seq_name, seq_str = next(fasta_file)
         if seq_str is None:
             exit_on_error("No valid sequence found in FASTA file.")
@@ -161,13 +176,18 @@ def read_fasta_entry(filename: str) -> str:
         exit_on_error(f"FASTA file not found: {e}")
     except StopIteration as e:
         exit_on_error(f"No sequence found in FASTA file. {e}")
+    except KeyError as e:
+        exit_on_error(e.args[0])
     except ImportError as e:
         exit_on_error(e.msg)
     except Exception as e:
         exit_on_error(f"Failed to read FASTA file: {e}")
 
 
-def read_fasta_file(filename: str) -> list[Sequence]:
+def read_fasta_file(
+    filename: str,
+    ids: list[str] | None = None
+) -> list[Sequence]:
     """
     Reads sequences from a FASTA file and returns a list of sequences.
 
@@ -175,6 +195,8 @@ def read_fasta_file(filename: str) -> list[Sequence]:
     ----------
     filename : str
         Path to the FASTA file to read.
+    ids : list of str or None, optional
+        If specified, only the records with these identifiers are read.
 
     Returns
     -------
@@ -184,11 +206,10 @@ def read_fasta_file(filename: str) -> list[Sequence]:
     Raises
     ------
     SystemExit
-        If Biopython is not installed or if the specified FASTA file
-        does not exist.
+        If the specified FASTA file does not exist or cannot be read.
     """
     try:
-        fasta_file = fasta2seq(filename)
+        fasta_file = fasta2seq(filename, ids=ids)
         sequences = []
         for entry in fasta_file:
             if entry is None:
@@ -200,6 +221,8 @@ def read_fasta_file(filename: str) -> list[Sequence]:
         return sequences
     except FileNotFoundError as e:
         exit_on_error(f"FASTA file not found: {e}")
+    except KeyError as e:
+        exit_on_error(e.args[0])
     except ImportError as e:
         exit_on_error(e.msg)
     except Exception as e:
@@ -452,7 +475,8 @@ class SequenceCommand(CLICommand, metaclass=ABCMeta):
         sequence: str,
         num: int = 1,
         ids: list[str] | None = None,
-        fasta: bool = False
+        fasta: bool = False,
+        record: str | None = None
     ) -> Self:
         """
         Adds a sequence and optionally specifies either a number or a list of IDs for the
@@ -475,6 +499,10 @@ class SequenceCommand(CLICommand, metaclass=ABCMeta):
         fasta: bool
             If `True`, the sequence will be interpreted as a FASTA file.
 
+        record : str
+            The identifier of the FASTA record to be used. By default,
+            the first record of the FASTA file is used.
+
         Returns
         -------
         SequenceCommand
@@ -485,7 +513,7 @@ class SequenceCommand(CLICommand, metaclass=ABCMeta):
         ids = ensure_opt_str_list(ids)
 
         if fasta:
-            self._sequence_str = read_fasta_entry(sequence)
+            self._sequence_str = read_fasta_entry(sequence, record)
         else:
             self._sequence_str = sequence
 
@@ -535,7 +563,15 @@ class SequenceCommand(CLICommand, metaclass=ABCMeta):
         paired: str | None = None,
         unpaired: str | None = None,
         pairedpath: str | None = None,
-        unpairedpath: str | None = None
+        unpairedpath: str | None = None,
+        check: bool = False,
+        maxrows: int | None = None,
+        strategy: str = "top",
+        seed: int | None = None,
+        minidentity: float = 0.0,
+        maxidentity: float = DEFAULT_MAX_IDENTITY,
+        pairedout: str | None = None,
+        unpairedout: str | None = None
     ) -> Self:
         """
         Subcommand to add multiple sequence alignment (MSA).
@@ -556,6 +592,29 @@ class SequenceCommand(CLICommand, metaclass=ABCMeta):
         unpairedpath : str
             The file path to unpaired sequences to be aligned. This parameter is mutually
             exclusive with `unpaired`.
+        check : bool, default=False
+            If True, the MSAs are streamed to check that their first row
+            matches the sequence and that all rows have the same width.
+        maxrows : int, optional
+            If specified, the MSAs are reduced to at most this number of
+            rows, including the query.
+        strategy : str, default="top"
+            The strategy for selecting the rows ("top", "identity" or
+            "random").
+        seed : int, optional
+            The seed of the random strategy.
+        minidentity : float, default=0.0
+            The minimum sequence identity to the query of the identity
+            strategy.
+        maxidentity : float, default=0.9
+            The maximum sequence identity to the query of the identity
+            strategy.
+        pairedout : str, optional
+            The file path where the reduced paired MSA is written. By default,
+            the reduced MSA is stored inline.
+        unpairedout : str, optional
+            The file path where the reduced unpaired MSA is written. By
+            default, the reduced MSA is stored inline.
 
         Returns
         -------
@@ -574,7 +633,7 @@ class SequenceCommand(CLICommand, metaclass=ABCMeta):
             exit_on_error("String and path variants "
                           "for MSA are mutually exclusive.")
 
-        paired = paired or unpairedpath
+        paired = paired or pairedpath
         unpaired = unpaired or unpairedpath
         self._msa = MSA(
             paired=paired,
@@ -582,6 +641,24 @@ class SequenceCommand(CLICommand, metaclass=ABCMeta):
             paired_is_path=pairedpath is not None,
             unpaired_is_path=unpairedpath is not None
         )
+        if check:
+            try:
+                stats = self._msa.check(self._sequence_str)
+            except (AFMSAError, OSError) as e:
+                exit_on_error(f"Failed to check MSA: {e}")
+            for key, msa_stats in stats.items():
+                logger.info(f"Checked {key} MSA: {msa_stats}")
+        if maxrows is not None:
+            try:
+                self._msa.cap(maxrows, strategy=strategy, seed=seed,
+                              min_identity=minidentity,
+                              max_identity=maxidentity,
+                              paired_output=pairedout,
+                              unpaired_output=unpairedout)
+            except (ValueError, OSError) as e:
+                exit_on_error(f"Failed to reduce MSA: {e}")
+            logger.info(f"Reduced MSA to at most {maxrows} rows "
+                        f"({strategy})")
         return self
 
     @abstractmethod
@@ -623,7 +700,9 @@ class ProteinCommand(SequenceCommand):
         mmcif: str,
         qidx: list[int] | None = None,
         tidx: list[int] | None = None,
-        read: bool = False
+        read: bool = False,
+        chain: str | None = None,
+        align: bool = False
     ) -> Self:
         """
         Subcommand to add a template from an mmCIF file.
@@ -642,26 +721,52 @@ class ProteinCommand(SequenceCommand):
             A list of template indices. Defaults to None.
         read : bool
             If True, the `mmcif` file content is read into a string. Defaults to False.
+        chain : str
+            If specified, only this chain (author chain ID) and the required
+            header categories are read into a string. Defaults to None.
+        align : bool
+            If True, the query and template indices are determined by aligning
+            the sequence of the template chain to the protein sequence. This
+            parameter is mutually exclusive with `qidx` and `tidx`.
 
         Returns
         -------
         ProteinCommand
             The current instance of the class, allowing for method chaining.
         """
-        if read:
+        if chain is not None:
+            logger.info(f"Reading chain '{chain}' of file '{mmcif}'")
+            try:
+                mmcif = trim_mmcif(mmcif, str(chain))
+            except (AFTemplateError, OSError) as e:
+                exit_on_error(f"Failed to read template: {e}")
+            template_type = TemplateType.STRING
+        elif read:
             mmcif = read_file_to_str(mmcif)
             template_type = TemplateType.STRING
         else:
             template_type = TemplateType.FILE
 
-        self._templates.append(
-            Template(
-                mmcif=mmcif,
-                template_type=template_type,
-                qidx=ensure_int_list(qidx),
-                tidx=ensure_int_list(tidx)
-            )
+        template = Template(
+            mmcif=mmcif,
+            template_type=template_type,
+            qidx=ensure_int_list(qidx),
+            tidx=ensure_int_list(tidx)
         )
+        if align:
+            if template.qidx or template.tidx:
+                exit_on_error("Template alignment and indices "
+                              "are mutually exclusive.")
+            if self._sequence_str is None:
+                exit_on_error("The sequence must be added before the "
+                              "template can be aligned.")
+            try:
+                align_template(template, self._sequence_str,
+                               chain=None if chain is None else str(chain))
+            except (AFTemplateError, OSError) as e:
+                exit_on_error(f"Failed to align template: {e}")
+            logger.info(f"Aligned {len(template.qidx)} template residues")
+        self._templates.append(template)
         return self
 
     @hide_from_cli
@@ -716,7 +821,8 @@ class DNACommand(SequenceCommand):
         num: int = 1,
         ids: list[str] | None = None,
         fasta: bool = False,
-        complement: bool = False
+        complement: bool = False,
+        record: str | None = None
     ) -> Self:
         """
         Adds a given sequence to the current object with options for specifying
@@ -738,6 +844,9 @@ class DNACommand(SequenceCommand):
         complement : bool, optional
             A flag to indicate if the reverse complement of the sequence should
             also be added. Modifications and IDs will be ignored. Default is False.
+        record : str or None, optional
+            The identifier of the FASTA record to be used. By default, the
+            first record of the FASTA file is used.
 
         Returns
         -------
@@ -745,7 +854,7 @@ class DNACommand(SequenceCommand):
             The updated instance of the calling object.
         """
         self._rev_complement = complement
-        return super().add(sequence, num, ids, fasta)
+        return super().add(sequence, num, ids, fasta, record)
 
     @hide_from_cli
     def sequence_type(self) -> SequenceType:
@@ -986,6 +1095,11 @@ class CLI(CommandBase):
         super().__init__()
         self._builder: InputBuilder = InputBuilder()
         self._filename: str = DEFAULT_FILENAME
+        self._compact: bool = False
+        self._store: str | None = None
+        self._incremental: bool = False
+        self._collapse: bool = False
+        self._cache: str | None = None
 
         self._debug_print: bool = False
 
@@ -1033,7 +1147,13 @@ class CLI(CommandBase):
         filename: str = DEFAULT_FILENAME,
         jobname: str = "job",
         version: int = 1,
-        dialect: str = "alphafold3"
+        dialect: str = "alphafold3",
+        compact: bool = False,
+        backend: str | None = None,
+        store: str | None = None,
+        incremental: bool = False,
+        collapse: bool = False,
+        cache: str | None = None
     ) -> Self:
         """
         Command to add basic information to the AlphaFold3 input file,
@@ -1049,6 +1169,27 @@ class CLI(CommandBase):
             The version number of the AlphaFold3 configuration.
         dialect : str, default="alphafold3"
             The AlphaFold3 dialect specification.
+        compact : bool, default=False
+            If True, the JSON file is written without indentation.
+        backend : str, optional
+            The JSON library used for reading and writing files ("auto",
+            "orjson", "ujson" or "json"). By default, orjson or ujson are
+            used if installed, except for indented files, which are
+            written with the standard library.
+        store : str, optional
+            If specified, inline MSAs and templates are written to this
+            content-addressed store directory and referenced by their path.
+        incremental : bool, default=False
+            If True, the file is only written if its content differs from
+            the existing file.
+        collapse : bool, default=False
+            If True, identical sequences and ligands are merged into a
+            single entity with multiple copies before writing the file.
+            The IDs of all copies and bonded atom pairs are preserved.
+        cache : str, optional
+            If specified, the MSAs and templates of protein and RNA sequences
+            without MSA are attached from this cache directory (see the
+            `harvest` command).
 
         Returns
         -------
@@ -1056,6 +1197,16 @@ class CLI(CommandBase):
             Returns the same instance of the class to enable method chaining.
         """
         self._filename = filename
+        self._compact = compact
+        self._store = store
+        self._incremental = incremental
+        self._collapse = collapse
+        self._cache = cache
+        if backend is not None:
+            try:
+                set_json_backend(backend)
+            except (ValueError, ImportError) as e:
+                exit_on_error(str(e))
         self._builder.set_name(jobname)
         self._builder.set_version(version)
         self._builder.set_dialect(dialect)
@@ -1096,7 +1247,8 @@ class CLI(CommandBase):
             Returns the same instance of the class to enable method chaining.
         """
         try:
-            other_input = InputFile.read(filename)
+            # large inline fields are copied without decoding them
+            other_input = InputFile.read(filename, lazy=True)
             if noreset:
                 logger.warning("Skipping reset might cause ID clashes.")
 
@@ -1112,7 +1264,11 @@ class CLI(CommandBase):
             exit_on_error(f"Failed to process existing input file: {filename}\n{e}")
         return self
 
-    def fasta(self, filename: str) -> Self:
+    def fasta(
+        self,
+        filename: str,
+        ids: list[str] | None = None
+    ) -> Self:
         """
         Command to process and incorporate sequences from a FASTA file.
 
@@ -1120,13 +1276,17 @@ class CLI(CommandBase):
         ----------
         filename : str
             The file path of the FASTA file to be read and processed.
+        ids : list of str, optional
+            The identifiers of the FASTA records to be read. By default,
+            all records are read. For uncompressed files, an index is
+            created to seek directly to the requested records.
 
         Returns
         -------
         CLI
             Returns the same instance of the class to enable method chaining.
         """
-        for seq in read_fasta_file(filename):
+        for seq in read_fasta_file(filename, ensure_opt_str_list(ids)):
             self._builder.add_sequence(seq)
         return self
 
@@ -1213,6 +1373,291 @@ class CLI(CommandBase):
         self._builder.add_bonded_atom_pair(b)
         return self
 
+    def batch(
+        self,
+        manifest: str,
+        outdir: str = ".",
+        workers: int | None = None,
+        compact: bool = False,
+        incremental: bool = False
+    ) -> None:
+        """
+        Command to generate many AlphaFold3 input files from a manifest file.
+
+        Each row of the CSV/TSV/JSONL manifest describes one job with the
+        columns `name`, `output`, `seeds`, `protein`, `dna`, `rna`, `smiles`
+        and `ccd`. Multiple values within a cell are separated by semicolons.
+        The jobs are built and written from a process pool. This command
+        cannot be chained with other commands.
+
+        Parameters
+        ----------
+        manifest : str
+            The path to the manifest file.
+        outdir : str, default="."
+            The directory where the input files will be written.
+        workers : int, optional
+            The number of worker processes. Defaults to the number of CPUs.
+        compact : bool, default=False
+            If True, the JSON files are written without indentation.
+        incremental : bool, default=False
+            If True, files whose content did not change are not written
+            again. The content hashes are stored in a sidecar file in
+            the output directory.
+        """
+        try:
+            report = run_batch(manifest, outdir=outdir, workers=workers,
+                               compact=compact, incremental=incremental)
+        except (FileNotFoundError, ValueError) as e:
+            exit_on_error(f"Failed to read manifest file: {e}")
+        for name, error in report.failed:
+            logger.warning(f"Failed to write job '{name}': {error}")
+        logger.info(f"Wrote {report}")
+
+    def fasta_split(
+        self,
+        filename: str,
+        outdir: str = ".",
+        prefix: str = "",
+        workers: int | None = None,
+        compact: bool = False,
+        incremental: bool = False
+    ) -> None:
+        """
+        Command to generate one AlphaFold3 input file per FASTA record.
+
+        The entities, seeds and user-provided CCD data added by preceding
+        commands are shared by all input files, e.g. to screen many proteins
+        against the same ligand. The records are streamed from the FASTA file
+        and written from a process pool. This command cannot be chained with
+        subsequent commands.
+
+        Parameters
+        ----------
+        filename : str
+            The path to the FASTA file, which may be gzip-compressed.
+        outdir : str, default="."
+            The directory where the input files will be written.
+        prefix : str, default=""
+            The prefix of the job names and output files.
+        workers : int, optional
+            The number of worker processes. Defaults to the number of CPUs.
+        compact : bool, default=False
+            If True, the JSON files are written without indentation.
+        incremental : bool, default=False
+            If True, files whose content did not change are not written
+            again. The content hashes are stored in a sidecar file in
+            the output directory.
+        """
+        try:
+            report = fasta_split(filename, outdir=outdir,
+                                 base=self._builder.build(), prefix=prefix,
+                                 workers=workers, compact=compact,
+                                 incremental=incremental)
+        except OSError as e:
+            exit_on_error(f"Failed to read FASTA file: {e}")
+        for name, error in report.failed:
+            logger.warning(f"Failed to write record '{name}': {error}")
+        logger.info(f"Wrote {report}")
+
+    def externalize(
+        self,
+        paths: str,
+        store: str,
+        workers: int | None = None,
+        compact: bool = False
+    ) -> None:
+        """
+        Command to move the inline MSAs and templates of existing input files
+        into a content-addressed store directory.
+
+        Each unique MSA or mmCIF string is written once to the store and
+        the input files are overwritten to reference the stored files by
+        their absolute path. This command cannot be chained with other
+        commands.
+
+        Parameters
+        ----------
+        paths : str
+            A directory containing the input files or a glob pattern.
+        store : str
+            The path of the store directory.
+        workers : int, optional
+            The number of threads used for reading the files.
+        compact : bool, default=False
+            If True, the JSON files are written without indentation.
+        """
+        report, blob_store = externalize_files(paths, store, workers=workers,
+                                               compact=compact)
+        for filename, error in report.failed:
+            logger.warning(f"Failed to externalize '{filename}': {error}")
+        logger.info(f"Processed {report}")
+        logger.info(f"Stored {blob_store.num_written} new and reused "
+                    f"{blob_store.num_reused} MSAs/templates in "
+                    f"'{blob_store.root}'")
+
+    def harvest(
+        self,
+        paths: str,
+        cache: str,
+        workers: int | None = None
+    ) -> None:
+        """
+        Command to add the MSAs and templates of the AlphaFold3 data pipeline
+        outputs (`*_data.json`) to a cache directory.
+
+        The cached MSAs and templates are attached to matching sequences
+        with `config --cache`, so that AlphaFold3 can be run without the
+        data pipeline. This command cannot be chained with other commands.
+
+        Parameters
+        ----------
+        paths : str
+            The AlphaFold3 output directory, which is searched recursively,
+            or a glob pattern.
+        cache : str
+            The path of the cache directory.
+        workers : int, optional
+            The number of threads used for reading the files.
+        """
+        try:
+            report, msa_cache = harvest(paths, cache, workers=workers)
+        except (OSError, ValueError) as e:
+            exit_on_error(f"Failed to update cache: {e}")
+        for filename, error in report.failed:
+            logger.warning(f"Failed to harvest '{filename}': {error}")
+        logger.info(f"Processed {report}")
+        logger.info(f"Cached MSAs/templates of {len(msa_cache)} sequences "
+                    f"in '{msa_cache.root}'")
+
+    def pair(
+        self,
+        filename: str,
+        output: str | None = None,
+        minchains: int | None = None,
+        maxrows: int | None = None,
+        compact: bool = False
+    ) -> None:
+        """
+        Command to build the paired MSAs of a heteromer from the unpaired MSAs
+        of its protein chains.
+
+        The rows of the unpaired MSAs are joined by the species in their A3M
+        headers and the paired MSAs of all protein chains with an unpaired
+        MSA are replaced by the inline paired MSAs. This command cannot be
+        chained with other commands.
+
+        Parameters
+        ----------
+        filename : str
+            The path of the input file.
+        output : str, optional
+            The path of the output file. By default, the input file is
+            overwritten.
+        minchains : int, optional
+            The minimum number of chains with rows of a species, missing
+            chains are filled with gaps. By default, only species found
+            in all chains are paired.
+        maxrows : int, optional
+            The maximum number of rows of the paired MSAs, including
+            the query.
+        compact : bool, default=False
+            If True, the JSON file is written without indentation.
+        """
+        try:
+            af_input_file = InputFile.read(filename, lazy=True)
+            num_rows = pair_msas(af_input_file, min_chains=minchains,
+                                 max_rows=maxrows)
+        except (AFMSAError, ValueError, OSError) as e:
+            exit_on_error(f"Failed to pair MSAs: {e}")
+        if not num_rows:
+            logger.warning("No paired rows were found.")
+        try:
+            af_input_file.write(output or filename, compact=compact)
+        except OSError as e:
+            exit_on_error(f"Failed to write input file: {e}")
+        logger.info(f"Paired {num_rows} rows")
+
+    def align(
+        self,
+        filename: str,
+        output: str | None = None,
+        workers: int | None = None,
+        overwrite: bool = False,
+        compact: bool = False
+    ) -> None:
+        """
+        Command to determine the query and template indices of all templates
+        of an input file by aligning the sequence of the template chain to
+        the protein sequence.
+
+        The templates are aligned in parallel. The chain of the first atom
+        of each template is used. This command cannot be chained with other
+        commands.
+
+        Parameters
+        ----------
+        filename : str
+            The path of the input file.
+        output : str, optional
+            The path of the output file. By default, the input file is
+            overwritten.
+        workers : int, optional
+            The number of worker processes. Defaults to the number of CPUs.
+        overwrite : bool, default=False
+            If True, existing indices are replaced. By default, only
+            templates without indices are aligned.
+        compact : bool, default=False
+            If True, the JSON file is written without indentation.
+        """
+        try:
+            af_input_file = InputFile.read(filename, lazy=True)
+        except OSError as e:
+            exit_on_error(f"Failed to read input file: {e}")
+        report = align_templates(af_input_file, workers=workers,
+                                 overwrite=overwrite)
+        for name, error in report.failed:
+            logger.warning(f"Failed to align template of '{name}': {error}")
+        try:
+            af_input_file.write(output or filename, compact=compact)
+        except OSError as e:
+            exit_on_error(f"Failed to write input file: {e}")
+        logger.info(f"Aligned {report}")
+
+    def validate(
+        self,
+        paths: str,
+        workers: int | None = None,
+        report: str | None = None
+    ) -> None:
+        """
+        Command to validate the structure of existing AlphaFold3 input files.
+
+        All files are checked in parallel and a machine-readable JSON report
+        with the issues of all invalid files is written. The program exits
+        with a non-zero status if any file is invalid. This command cannot
+        be chained with other commands.
+
+        Parameters
+        ----------
+        paths : str
+            A directory containing the input files, a glob pattern or a
+            single file.
+        workers : int, optional
+            The number of worker processes. Defaults to the number of CPUs.
+        report : str, optional
+            The path of the JSON report. By default, the report is printed
+            to the console.
+        """
+        validation_report = validate_many(paths, workers=workers)
+        try:
+            write_report(validation_report, report)
+        except OSError as e:
+            exit_on_error(f"Failed to write validation report: {e}")
+        logger.info(f"Validated {validation_report}")
+        if validation_report.num_invalid:
+            sys.exit(1)
+
     @hide_from_cli
     def builder(self) -> InputBuilder:
         """
@@ -1239,12 +1684,36 @@ class CLI(CommandBase):
         writes the file content in JSON format to the specified location.
         """
         af_input_file = self._builder.build()
+        if self._cache is not None:
+            try:
+                num_attached = attach_cached(af_input_file, self._cache)
+            except (OSError, ValueError) as e:
+                exit_on_error(f"Failed to read cache: {e}")
+            logger.info(f"Attached cached MSAs/templates to {num_attached} "
+                        f"sequences")
+        if self._collapse:
+            num_merged = af_input_file.collapse_identical()
+            logger.info(f"Merged {num_merged} identical entities")
         if self._debug_print:
             pp = pprint.PrettyPrinter(indent=4)
             pp.pprint(af_input_file.to_dict())
         else:
-            af_input_file.write(self._filename)
-            logger.info(f"Writing AF3 input file to '{self._filename}'")
+            # out-of-range positions would only fail within AlphaFold3
+            issues = check_bounds(af_input_file.to_dict())
+            if issues:
+                exit_on_error("\n".join(str(issue) for issue in issues))
+            if self._store is not None:
+                num_blobs = externalize(af_input_file, self._store)
+                logger.info(f"Externalized {num_blobs} MSAs/templates "
+                            f"to '{self._store}'")
+            written = af_input_file.write(self._filename,
+                                          compact=self._compact,
+                                          incremental=self._incremental)
+            if written:
+                logger.info(f"Writing AF3 input file to '{self._filename}'")
+            else:
+                logger.info(f"Skipping unchanged AF3 input file "
+                            f"'{self._filename}'")
 
 
 def main() -> None:
@@ -0,0 +1,341 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable
+
+from .input import InputFile
+from .batch import BatchReport
+from .sequence import ProteinSequence, Template, TemplateType
+from .mmcif import mmcif_sequence
+
+# BLOSUM62 substitution scores of the standard amino acids
+_BLOSUM62_ORDER: str = "ARNDCQEGHILKMFPSTWYV"
+_BLOSUM62_ROWS: tuple[str, ...] = (
+    " 4 -1 -2 -2  0 -1 -1  0 -2 -1 -1 -1 -1 -2 -1  1  0 -3 -2  0",
+    "-1  5  0 -2 -3  1  0 -2  0 -3 -2  2 -1 -3 -2 -1 -1 -3 -2 -3",
+    "-2  0  6  1 -3  0  0  0  1 -3 -3  0 -2 -3 -2  1  0 -4 -2 -3",
+    "-2 -2  1  6 -3  0  2 -1 -1 -3 -4 -1 -3 -3 -1  0 -1 -4 -3 -3",
+    " 0 -3 -3 -3  9 -3 -4 -3 -3 -1 -1 -3 -1 -2 -3 -1 -1 -2 -2 -1",
+    "-1  1  0  0 -3  5  2 -2  0 -3 -2  1  0 -3 -1  0 -1 -2 -1 -2",
+    "-1  0  0  2 -4  2  5 -2  0 -3 -3  1 -2 -3 -1  0 -1 -3 -2 -2",
+    " 0 -2  0 -1 -3 -2 -2  6 -2 -4 -4 -2 -3 -3 -2  0 -2 -2 -3 -3",
+    "-2  0  1 -1 -3  0  0 -2  8 -3 -3 -1 -2 -1 -2 -1 -2 -2  2 -3",
+    "-1 -3 -3 -3 -1 -3 -3 -4 -3  4  2 -3  1  0 -3 -2 -1 -3 -1  3",
+    "-1 -2 -3 -4 -1 -2 -3 -4 -3  2  4 -2  2  0 -3 -2 -1 -2 -1  1",
+    "-1  2  0 -1 -3  1  1 -2 -1 -3 -2  5 -1 -3 -1  0 -1 -3 -2 -2",
+    "-1 -1 -2 -3 -1  0 -2 -3 -2  1  2 -1  5  0 -2 -1 -1 -1 -1  1",
+    "-2 -3 -3 -3 -2 -3 -3 -3 -1  0  0 -3  0  6 -4 -2 -2  1  3 -1",
+    "-1 -2 -2 -1 -3 -1 -1 -2 -2 -3 -3 -1 -2 -4  7 -1 -1 -4 -3 -2",
+    " 1 -1  1  0 -1  0  0  0 -1 -2 -2  0 -1 -2 -1  4  1 -3 -2 -2",
+    " 0 -1  0 -1 -1 -1 -1 -2 -2 -1 -1 -1 -1 -2 -1  1  5 -2 -2  0",
+    "-3 -3 -4 -4 -2 -2 -3 -2 -2 -3 -2 -3 -1  1 -4 -3 -2 11  2 -3",
+    "-2 -2 -2 -3 -2 -1 -2 -3  2 -1 -1 -2 -1  3 -3 -2 -2  2  7 -1",
+    " 0 -3 -3 -3 -1 -2 -2 -3 -3  3  1 -2  1 -1 -2 -2  0 -3 -1  4",
+)
+BLOSUM62: dict[str, dict[str, int]] = {
+    residue: dict(zip(_BLOSUM62_ORDER, map(int, row.split())))
+    for residue, row in zip(_BLOSUM62_ORDER, _BLOSUM62_ROWS)
+}
+# score of unknown or non-standard residues
+UNKNOWN_SCORE: int = -1
+
+# affine gap penalties of the first and each further residue of a gap
+GAP_OPEN: int = -11
+GAP_EXTEND: int = -1
+# length of the shared words, whose diagonals determine the band
+SEED_LENGTH: int = 3
+# diagonals require this number of shared words to be part of the band
+MIN_SEED_HITS: int = 2
+# number of diagonals added on both sides of the seeded diagonals
+BAND_PADDING: int = 16
+# number of templates that are sent to each worker process at once
+ALIGN_CHUNKSIZE: int = 8
+
+_NEG_INF: int = -(1 << 30)
+# traceback states
+_MATCH, _QUERY_GAP, _TARGET_GAP, _START = 0, 1, 2, 3
+_QUERY_GAP_EXTEND, _TARGET_GAP_EXTEND = 4, 8
+
+
+def _band(query: str, target: str) -> tuple[int, int]:
+    """
+    Determines the range of diagonals (target minus query position) that
+    contain the shared words of both sequences. If too few words are
+    shared, all diagonals are used.
+    """
+    positions: dict[str, list[int]] = {}
+    for j in range(len(target) - SEED_LENGTH + 1):
+        positions.setdefault(target[j:j + SEED_LENGTH], []).append(j)
+
+    hits: dict[int, int] = {}
+    for i in range(len(query) - SEED_LENGTH + 1):
+        for j in positions.get(query[i:i + SEED_LENGTH], ()):
+            hits[j - i] = hits.get(j - i, 0) + 1
+
+    diagonals = [diagonal for diagonal, num_hits in hits.items()
+                 if num_hits >= MIN_SEED_HITS]
+    if not diagonals:
+        return -len(query), len(target)
+    return (max(min(diagonals) - BAND_PADDING, -len(query)),
+            min(max(diagonals) + BAND_PADDING, len(target)))
+
+
+def align_sequences(
+    query: str,
+    target: str,
+    banded: bool = True
+) -> tuple[list[int], list[int]]:
+    """
+    Aligns two protein sequences and returns the indices of the aligned
+    residues.
+
+    The sequences are aligned locally (Smith-Waterman-Gotoh) with BLOSUM62
+    scores and affine gap penalties, so that unaligned termini of both
+    sequences, e.g. expression tags of the template, are ignored. The dynamic
+    programming is restricted to a band of diagonals around the words of
+    length `SEED_LENGTH` shared by both sequences, which reduces the
+    runtime from the product of the sequence lengths to roughly the
+    length of the longer sequence for similar sequences.
+
+    Parameters
+    ----------
+    query : str
+        The query sequence.
+    target : str
+        The target sequence, e.g. of the template.
+    banded : bool, optional
+        If False, the complete dynamic programming matrix is computed.
+        Default is True.
+
+    Returns
+    -------
+    tuple of (list of int, list of int)
+        The 0-based indices of the aligned residues in the query and
+        in the target sequence.
+    """
+    n, m = len(query), len(target)
+    if not n or not m:
+        return [], []
+    lo, hi = _band(query, target) if banded else (-n, m)
+    width = hi - lo + 1
+
+    # the diagonal k of row i corresponds to the target position i + lo + k
+    prev_best = [_NEG_INF] * width
+    prev_gap = [_NEG_INF] * width
+    traceback: list[bytearray] = []
+
+    # the first row and column only contain the start of alignments
+    for k in range(width):
+        if 0 <= lo + k <= m:
+            prev_best[k] = 0
+    traceback.append(bytearray([_START] * width))
+
+    best_score, best_cell = 0, (0, 0)
+    for i in range(1, n + 1):
+        scores = BLOSUM62.get(query[i - 1], {})
+        best = [_NEG_INF] * width
+        query_gap = [_NEG_INF] * width
+        target_gap = _NEG_INF
+        row = bytearray(width)
+        first = max(0, -(i + lo))
+        last = min(width - 1, m - i - lo)
+        for k in range(first, last + 1):
+            j = i + lo + k
+            if j == 0:
+                best[k] = 0
+                row[k] = _START
+                continue
+
+            # the query residue is aligned to a gap in the target
+            if k + 1 < width:
+                opened = prev_best[k + 1] + GAP_OPEN
+                extended = prev_gap[k + 1] + GAP_EXTEND
+                if extended > opened:
+                    query_gap[k] = extended
+                    row[k] |= _QUERY_GAP_EXTEND
+                else:
+                    query_gap[k] = opened
+            # the target residue is aligned to a gap in the query
+            if k > first:
+                opened = best[k - 1] + GAP_OPEN
+                extended = target_gap + GAP_EXTEND
+                if extended > opened:
+                    target_gap = extended
+                    row[k] |= _TARGET_GAP_EXTEND
+                else:
+                    target_gap = opened
+            else:
+                target_gap = _NEG_INF
+
+            score = prev_best[k] + scores.get(target[j - 1], UNKNOWN_SCORE)
+            state = _MATCH
+            if query_gap[k] > score:
+                score, state = query_gap[k], _QUERY_GAP
+            if target_gap > score:
+                score, state = target_gap, _TARGET_GAP
+            # a new alignment starts if all previous alignments score lower
+            if score <= 0:
+                score, state = 0, _START
+            best[k] = score
+            row[k] |= state
+
+            if score > best_score:
+                best_score, best_cell = score, (i, j)
+        prev_best, prev_gap = best, query_gap
+        traceback.append(row)
+
+    query_indices, target_indices = [], []
+    i, j = best_cell
+    state = None
+    while i > 0 and j > 0:
+        code = traceback[i][j - i - lo]
+        if state is None:
+            state = code & 3
+            if state == _START:
+                break
+        if state == _MATCH:
+            i, j = i - 1, j - 1
+            query_indices.append(i)
+            target_indices.append(j)
+            state = None
+        elif state == _QUERY_GAP:
+            state = _QUERY_GAP if code & _QUERY_GAP_EXTEND else None
+            i -= 1
+        else:
+            state = _TARGET_GAP if code & _TARGET_GAP_EXTEND else None
+            j -= 1
+    query_indices.reverse()
+    target_indices.reverse()
+    return query_indices, target_indices
+
+
+def _align_one(
+    query: str,
+    mmcif: str,
+    is_path: bool,
+    chain: str | None
+) -> tuple[list[int], list[int]] | Exception:
+    try:
+        return align_sequences(query, mmcif_sequence(mmcif, is_path, chain))
+    except Exception as e:
+        return e
+
+
+def align_template(
+    template: Template,
+    query: str,
+    chain: str | None = None
+) -> Template:
+    """
+    Aligns the sequence of a template chain to the query sequence and sets
+    the query and template indices of the aligned residues.
+
+    Parameters
+    ----------
+    template : Template
+        The template, whose indices are replaced.
+    query : str
+        The sequence of the protein owning the template.
+    chain : str or None, optional
+        The chain of the template. By default, the chain of the first atom
+        is used.
+
+    Returns
+    -------
+    Template
+        The template with the new indices.
+
+    Raises
+    ------
+    AFTemplateError
+        If the mmCIF data contains no atom sites or the chain is not found.
+    """
+    template.qidx, template.tidx = align_sequences(
+        query, mmcif_sequence(template.mmcif,
+                              template.template_type == TemplateType.FILE,
+                              chain)
+    )
+    return template
+
+
+def align_templates(
+    input_files: InputFile | Iterable[InputFile],
+    workers: int | None = None,
+    overwrite: bool = False
+) -> BatchReport:
+    """
+    Aligns the templates of all protein sequences of one or more input
+    files to their sequences in parallel (see `align_template`).
+
+    The template chain is the chain of the first atom, as templates
+    usually contain a single chain (see `trim_mmcif`).
+
+    Parameters
+    ----------
+    input_files : InputFile or iterable of InputFile
+        The input files whose templates should be modified.
+    workers : int or None, optional
+        The number of worker processes. If None, the number of CPUs is used.
+        With a single worker, all templates are aligned in the current
+        process.
+    overwrite : bool, optional
+        If True, existing indices are replaced. By default, only templates
+        without query and template indices are aligned.
+
+    Returns
+    -------
+    BatchReport
+        The number of aligned and skipped templates with the failed
+        templates, which are named by the job and sequence index.
+    """
+    if isinstance(input_files, InputFile):
+        input_files = [input_files]
+
+    report = BatchReport(unit="templates")
+    jobs: list[tuple[str, Template, str]] = []
+    for input_file in input_files:
+        for index, sequence in enumerate(input_file.sequences):
+            if not isinstance(sequence, ProteinSequence):
+                continue
+            for template in sequence.templates:
+                report.num_jobs += 1
+                if (template.qidx or template.tidx) and not overwrite:
+                    report.num_skipped += 1
+                    continue
+                jobs.append((f"{input_file.name}:{index}", template,
+                             sequence.sequence))
+
+    start = time.perf_counter()
+    arguments = (
+        [query for _, _, query in jobs],
+        [template.mmcif for _, template, _ in jobs],
+        [template.template_type == TemplateType.FILE
+         for _, template, _ in jobs],
+        [None] * len(jobs)
+    )
+    if workers == 1:
+        results = map(_align_one, *arguments)
+        _collect_results(report, jobs, results)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_align_one, *arguments,
+                                   chunksize=ALIGN_CHUNKSIZE)
+            _collect_results(report, jobs, results)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def _collect_results(
+    report: BatchReport,
+    jobs: list[tuple[str, Template, str]],
+    results: Iterable[tuple[list[int], list[int]] | Exception]
+) -> None:
+    for (name, template, _), result in zip(jobs, results):
+        if isinstance(result, Exception):
+            report.failed.append(
+                (name, f"{result.__class__.__name__}: {result}")
+            )
+            continue
+        template.qidx, template.tidx = result
+        report.num_written += 1
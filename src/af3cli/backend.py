@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import json
+from abc import ABCMeta, abstractmethod
+from typing import Any, Generator
+
+
+class JSONBackend(object, metaclass=ABCMeta):
+    """
+    Defines the interface of the JSON libraries used for reading and writing
+    AlphaFold3 input files.
+
+    Attributes
+    ----------
+    name : str
+        The name used to select the backend.
+    indent : int
+        The number of spaces used for indentation. This value depends on the
+        capabilities of the underlying library.
+    """
+    name: str = ""
+    indent: int = 4
+
+    @abstractmethod
+    def loads(self, data: bytes | str) -> Any:
+        """
+        Parses a JSON document.
+
+        Parameters
+        ----------
+        data : bytes or str
+            The JSON document.
+
+        Returns
+        -------
+        Any
+            The parsed data.
+        """
+        pass
+
+    @abstractmethod
+    def iterencode(
+        self,
+        obj: Any,
+        compact: bool = False
+    ) -> Generator[bytes, None, None]:
+        """
+        Serializes an object into UTF-8 encoded JSON chunks.
+
+        Parameters
+        ----------
+        obj : Any
+            The JSON serializable object.
+        compact : bool, optional
+            If True, the output contains no indentation and whitespace.
+            Otherwise, the output is indented by `indent` spaces.
+
+        Yields
+        ------
+        bytes
+            Consecutive chunks of the JSON representation.
+        """
+        pass
+
+    def __str__(self) -> str:
+        return f"JSONBackend({self.name})"
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}>"
+
+
+class StdlibBackend(JSONBackend):
+    """
+    JSON backend using the `json` module of the Python standard library.
+    """
+    name: str = "json"
+    indent: int = 4
+
+    def __init__(self):
+        self._encoder = json.JSONEncoder(indent=self.indent)
+        self._compact_encoder = json.JSONEncoder(separators=(",", ":"))
+
+    def loads(self, data: bytes | str) -> Any:
+        return json.loads(data)
+
+    def iterencode(
+        self,
+        obj: Any,
+        compact: bool = False
+    ) -> Generator[bytes, None, None]:
+        encoder = self._compact_encoder if compact else self._encoder
+        for chunk in encoder.iterencode(obj):
+            yield chunk.encode()
+
+
+class OrjsonBackend(JSONBackend):
+    """
+    JSON backend using the `orjson` library, which only supports an
+    indentation of two spaces.
+    """
+    name: str = "orjson"
+    indent: int = 2
+
+    def __init__(self):
+        try:
+            import orjson
+        except ImportError as e:
+            raise ImportError(
+                "Please install orjson to use the orjson backend"
+            ) from e
+        self._orjson = orjson
+
+    def loads(self, data: bytes | str) -> Any:
+        return self._orjson.loads(data)
+
+    def iterencode(
+        self,
+        obj: Any,
+        compact: bool = False
+    ) -> Generator[bytes, None, None]:
+        option = 0 if compact else self._orjson.OPT_INDENT_2
+        yield self._orjson.dumps(obj, option=option)
+
+
+class UjsonBackend(JSONBackend):
+    """
+    JSON backend using the `ujson` library.
+    """
+    name: str = "ujson"
+    indent: int = 4
+
+    def __init__(self):
+        try:
+            import ujson
+        except ImportError as e:
+            raise ImportError(
+                "Please install ujson to use the ujson backend"
+            ) from e
+        self._ujson = ujson
+
+    def loads(self, data: bytes | str) -> Any:
+        return self._ujson.loads(data)
+
+    def iterencode(
+        self,
+        obj: Any,
+        compact: bool = False
+    ) -> Generator[bytes, None, None]:
+        yield self._ujson.dumps(
+            obj,
+            indent=0 if compact else self.indent,
+            escape_forward_slashes=False
+        ).encode()
+
+
+# ordered by preference for the automatic selection
+JSON_BACKENDS: dict[str, type[JSONBackend]] = {
+    "orjson": OrjsonBackend,
+    "ujson": UjsonBackend,
+    "json": StdlibBackend,
+}
+DEFAULT_BACKEND: str = "auto"
+
+_backend_cache: dict[str, JSONBackend] = {}
+_default_backend: str = DEFAULT_BACKEND
+
+
+def get_json_backend(name: str | None = None) -> JSONBackend:
+    """
+    Returns the JSON backend with the given name.
+
+    Parameters
+    ----------
+    name : str or None, optional
+        The name of the backend ("orjson", "ujson" or "json"). If "auto",
+        the first installed library in the order of `JSON_BACKENDS` is used.
+        If None, the backend selected with `set_json_backend` is returned.
+
+    Returns
+    -------
+    JSONBackend
+        The backend instance.
+
+    Raises
+    ------
+    ValueError
+        If the backend name is unknown.
+    ImportError
+        If the library of the requested backend is not installed.
+    """
+    if name is None:
+        name = _default_backend
+    if name in _backend_cache:
+        return _backend_cache[name]
+
+    if name == "auto":
+        for backend_name in JSON_BACKENDS:
+            try:
+                backend = get_json_backend(backend_name)
+            except ImportError:
+                continue
+            _backend_cache[name] = backend
+            return backend
+
+    if name not in JSON_BACKENDS:
+        raise ValueError(
+            f"Unknown JSON backend '{name}'. Available backends: "
+            f"{', '.join(['auto', *JSON_BACKENDS])}"
+        )
+    backend = JSON_BACKENDS[name]()
+    _backend_cache[name] = backend
+    return backend
+
+
+def get_encoder_backend(
+    name: str | None = None,
+    compact: bool = False
+) -> JSONBackend:
+    """
+    Returns the JSON backend used for writing. The automatic selection only
+    uses the faster libraries for compact output, while indented output is
+    written by the standard library. Thus, indented files are identical to
+    `json.dump(..., indent=4)` independent of the installed libraries,
+    unless orjson or ujson is selected explicitly.
+
+    Parameters
+    ----------
+    name : str or None, optional
+        The name of the backend (see `get_json_backend`).
+    compact : bool, optional
+        If True, the output contains no indentation and whitespace.
+
+    Returns
+    -------
+    JSONBackend
+        The backend instance.
+    """
+    if name is None:
+        name = _default_backend
+    if name == "auto" and not compact:
+        name = StdlibBackend.name
+    return get_json_backend(name)
+
+
+def set_json_backend(name: str) -> JSONBackend:
+    """
+    Selects the JSON backend that is used by default for reading and
+    writing AlphaFold3 input files.
+
+    Parameters
+    ----------
+    name : str
+        The name of the backend ("auto", "orjson", "ujson" or "json").
+
+    Returns
+    -------
+    JSONBackend
+        The selected backend instance.
+    """
+    global _default_backend
+    backend = get_json_backend(name)
+    _default_backend = name
+    return backend
@@ -0,0 +1,576 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Future
+from itertools import islice, repeat
+from typing import Generator, Iterable
+
+from .input import InputFile
+from .io import HashManifest, content_hash, write_json
+from .builder import InputBuilder
+from .ligand import CCDLigand, SMILigand
+from .sequence import ProteinSequence, DNASequence, RNASequence
+from .sequence import read_fasta, record2seq, classify_sequence
+from .sequence import sanitize_sequence_name
+
+# separator for multiple entities or seeds within a single CSV/TSV cell
+MANIFEST_ITEM_SEP: str = ";"
+MANIFEST_ENTITY_FIELDS: tuple[str, ...] = ("protein", "dna", "rna", "smiles", "ccd")
+BATCH_CHUNKSIZE: int = 64
+# number of chunks per worker that are submitted ahead of the results
+SPLIT_PREFETCH: int = 4
+
+
+class BatchReport(object):
+    """
+    Summarizes the result of a batch generation run.
+
+    Attributes
+    ----------
+    unit : str
+        The name of the processed items in the summary, e.g. "jobs".
+    num_jobs : int
+        The number of jobs that were processed.
+    num_written : int
+        The number of files that were written.
+    num_skipped : int
+        The number of unchanged files that were skipped.
+    elapsed : float
+        The wall time of the run in seconds.
+    failed : list of tuple of (str, str)
+        The names and error messages of the jobs that could not be written.
+    """
+    def __init__(self, unit: str = "jobs"):
+        self.unit: str = unit
+        self.num_jobs: int = 0
+        self.num_written: int = 0
+        self.num_skipped: int = 0
+        self.elapsed: float = 0.0
+        self.failed: list[tuple[str, str]] = []
+
+    @property
+    def jobs_per_second(self) -> float:
+        if self.elapsed <= 0:
+            return 0.0
+        return self.num_jobs / self.elapsed
+
+    def __str__(self) -> str:
+        return (f"{self.num_jobs} {self.unit} in {self.elapsed:.2f} s "
+                f"({self.jobs_per_second:.1f} {self.unit}/s, "
+                f"{self.num_written} written, {self.num_skipped} skipped, "
+                f"{len(self.failed)} failed)")
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}({self.num_jobs})>"
+
+
+def _split_items(value: str | list | None) -> list[str]:
+    """
+    Splits a manifest cell into its individual entries. Lists, as used in
+    JSONL manifests, are returned unchanged.
+
+    Parameters
+    ----------
+    value : str, list or None
+        The content of the manifest cell.
+
+    Returns
+    -------
+    list of str
+        The non-empty entries of the cell.
+    """
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    return [item.strip() for item in str(value).split(MANIFEST_ITEM_SEP)
+            if item.strip()]
+
+
+def _normalize_row(row: dict, index: int) -> dict:
+    """
+    Converts a raw manifest row into a normalized job description.
+
+    Parameters
+    ----------
+    row : dict
+        The row as read from a CSV/TSV or JSONL manifest.
+    index : int
+        The index of the row, used for the default job name.
+
+    Returns
+    -------
+    dict
+        The job description with a name, an output filename and lists of
+        the seeds and entity values for each entity type. The seeds are
+        converted by `build_job`, so that invalid seeds only fail their job.
+    """
+    name = row.get("name") or f"job_{index}"
+    job = {
+        "name": name,
+        "output": row.get("output") or f"{name}.json",
+        "seeds": _split_items(row.get("seeds")),
+    }
+    for field in MANIFEST_ENTITY_FIELDS:
+        job[field] = _split_items(row.get(field))
+    return job
+
+
+def read_manifest(filename: str) -> Generator[dict, None, None]:
+    """
+    Reads a batch manifest and yields one job description per row.
+
+    CSV and TSV manifests require a header line. Each row may contain the
+    columns `name`, `output`, `seeds`, `protein`, `dna`, `rna`, `smiles` and
+    `ccd`. Multiple seeds or entities of the same type are separated by
+    semicolons. JSONL manifests contain one object per line with the same
+    keys, whose values can alternatively be given as lists.
+
+    Parameters
+    ----------
+    filename : str
+        The path to the manifest file (.csv, .tsv or .jsonl).
+
+    Yields
+    ------
+    dict
+        A normalized job description.
+
+    Raises
+    ------
+    ValueError
+        If the file extension does not correspond to a supported format.
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    with open(filename, "r", newline="") as manifest_file:
+        match ext:
+            case ".jsonl" | ".ndjson":
+                rows = (json.loads(line) for line in manifest_file
+                        if line.strip())
+            case ".csv":
+                rows = csv.DictReader(manifest_file)
+            case ".tsv" | ".tab":
+                rows = csv.DictReader(manifest_file, delimiter="\t")
+            case _:
+                raise ValueError(f"Unsupported manifest format: '{ext}'")
+        for index, row in enumerate(rows):
+            yield _normalize_row(row, index)
+
+
+def build_job(job: dict) -> InputFile:
+    """
+    Builds an InputFile object from a normalized job description.
+
+    Parameters
+    ----------
+    job : dict
+        The job description as returned by `read_manifest`.
+
+    Returns
+    -------
+    InputFile
+        The constructed input file.
+
+    Raises
+    ------
+    ValueError
+        If a seed is not an integer.
+    """
+    builder = InputBuilder()
+    builder.set_name(job["name"])
+    if len(job["seeds"]):
+        builder.set_seeds([int(seed) for seed in job["seeds"]])
+    for seq_str in job["protein"]:
+        builder.add_sequence(ProteinSequence(seq_str))
+    for seq_str in job["dna"]:
+        builder.add_sequence(DNASequence(seq_str))
+    for seq_str in job["rna"]:
+        builder.add_sequence(RNASequence(seq_str))
+    for smiles in job["smiles"]:
+        builder.add_ligand(SMILigand(smiles))
+    for ccd in job["ccd"]:
+        builder.add_ligand(CCDLigand([ccd]))
+    return builder.build()
+
+
+def _write_job(
+    job: dict,
+    outdir: str,
+    compact: bool,
+    incremental: bool = False,
+    previous_hash: str | None = None
+) -> tuple[str, str | None, bool, str | None]:
+    """
+    Builds and writes a single job. Exceptions are caught and returned
+    to prevent a single invalid row from aborting the batch.
+
+    Returns
+    -------
+    tuple of (str, str or None, bool, str or None)
+        The job name, an error message if the job failed, whether the file
+        was written and the content hash in incremental mode.
+    """
+    try:
+        afinput = build_job(job)
+        digest = content_hash(afinput) if incremental else None
+        written = write_json(
+            os.path.join(outdir, job["output"]), afinput,
+            compact=compact, incremental=incremental,
+            previous_hash=previous_hash, digest=digest
+        )
+    except Exception as e:
+        return job["name"], f"{e.__class__.__name__}: {e}", False, None
+    return job["name"], None, written, digest
+
+
+def _collect_results(
+    report: BatchReport,
+    results: Iterable[tuple[str, str | None, bool, str | None]],
+    jobs: Iterable[dict],
+    hashes: HashManifest | None = None
+) -> None:
+    """
+    Adds the results of processed jobs to the batch report and updates
+    the content hashes of the written and skipped files.
+
+    Parameters
+    ----------
+    report : BatchReport
+        The report to be updated.
+    results : iterable of tuple of (str, str or None, bool, str or None)
+        The results as returned by `_write_job`.
+    jobs : iterable of dict
+        The processed jobs in the same order as the results.
+    hashes : HashManifest or None, optional
+        The manifest of content hashes in incremental mode.
+    """
+    for job, (name, error, written, digest) in zip(jobs, results):
+        report.num_jobs += 1
+        if error is not None:
+            report.failed.append((name, error))
+            continue
+        if written:
+            report.num_written += 1
+        else:
+            report.num_skipped += 1
+        if hashes is not None and digest is not None:
+            hashes.set(os.path.join(hashes.directory, job["output"]), digest)
+
+
+def run_batch(
+    manifest: str,
+    outdir: str = ".",
+    workers: int | None = None,
+    compact: bool = False,
+    incremental: bool = False
+) -> BatchReport:
+    """
+    Builds and writes all jobs of a manifest file using a process pool.
+
+    Parameters
+    ----------
+    manifest : str
+        The path to the manifest file.
+    outdir : str, optional
+        The directory where the input files will be written. Default is
+        the current working directory.
+    workers : int or None, optional
+        The number of worker processes. If None, the number of CPUs is used.
+        With a single worker, all jobs are processed in the current process.
+    compact : bool, optional
+        If True, the JSON files are written without indentation.
+    incremental : bool, optional
+        If True, files whose content did not change are not written again.
+        The content hashes are stored in a sidecar file within `outdir`,
+        existing files without a stored hash are read for comparison.
+
+    Returns
+    -------
+    BatchReport
+        The number of processed, written and skipped jobs, the elapsed time
+        and failed jobs. Rows with the output file of a preceding row
+        fail without being written.
+    """
+    os.makedirs(outdir, exist_ok=True)
+    report = BatchReport()
+    hashes = HashManifest(outdir) if incremental else None
+    # the jobs are consumed twice, by the workers and for the results
+    jobs = []
+    outputs: dict[str, str] = {}
+    for job in read_manifest(manifest):
+        # rows writing the same file would overwrite each other in the
+        # order in which the workers finish
+        output = os.path.normpath(job["output"])
+        if output in outputs:
+            report.num_jobs += 1
+            report.failed.append((job["name"], (
+                f"Output file '{job['output']}' is already written by "
+                f"job '{outputs[output]}'"
+            )))
+            continue
+        outputs[output] = job["name"]
+        jobs.append(job)
+    previous_hashes = [
+        hashes.get(os.path.join(outdir, job["output"]))
+        if hashes is not None else None
+        for job in jobs
+    ]
+
+    start = time.perf_counter()
+    try:
+        if workers == 1:
+            results = (
+                _write_job(job, outdir, compact, incremental, previous_hash)
+                for job, previous_hash in zip(jobs, previous_hashes)
+            )
+            _collect_results(report, results, jobs, hashes)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(
+                    _write_job, jobs,
+                    repeat(outdir), repeat(compact),
+                    repeat(incremental), previous_hashes,
+                    chunksize=BATCH_CHUNKSIZE
+                )
+                _collect_results(report, results, jobs, hashes)
+    finally:
+        if hashes is not None:
+            hashes.save()
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+# shared state of the worker processes of `fasta_split`, set by `_init_split`
+_split_base: InputFile | None = None
+_split_hashes: HashManifest | None = None
+
+
+def _init_split(base: InputFile | None, hashes: HashManifest | None) -> None:
+    """
+    Stores the shared base input file and the content hashes within a
+    worker process, so that they are only transferred once per worker
+    instead of once per record.
+    """
+    global _split_base, _split_hashes
+    _split_base = base
+    _split_hashes = hashes
+
+
+def _record_name(entry_name: str, prefix: str) -> str:
+    """
+    Derives the job name and output filename of a FASTA record from its
+    sanitized ID (see `record2seq`). Path separators are replaced, since
+    IDs such as "sp|P12345|X_HUMAN/1-4" must not create subdirectories.
+    """
+    name = f"{prefix}{sanitize_sequence_name(entry_name)}"
+    for sep in (os.sep, os.altsep, "/"):
+        if sep:
+            name = name.replace(sep, "_")
+    return name
+
+
+def _write_record(
+    name: str,
+    entry_name: str,
+    entry_seq: str | None,
+    outdir: str,
+    compact: bool,
+    incremental: bool
+) -> tuple[str, str | None, bool, str | None]:
+    """
+    Builds and writes the input file of a single FASTA record, which
+    contains the sequence of the record and all entities of the shared
+    base input file. Exceptions are caught and returned to prevent a single
+    invalid record from aborting the run.
+
+    Returns
+    -------
+    tuple of (str, str or None, bool, str or None)
+        The path of the output file (or the record ID if the record
+        failed), an error message if the record failed, whether the file
+        was written and the content hash in incremental mode.
+    """
+    try:
+        sequence = record2seq(entry_name, entry_seq)
+        if sequence is None:
+            reason = classify_sequence(entry_seq or "").reason
+            return entry_name, f"Unknown sequence type: {reason}", False, None
+
+        filename = os.path.join(outdir, f"{name}.json")
+        afinput = InputFile(name=name)
+        afinput.sequences.append(sequence)
+        if _split_base is not None:
+            afinput.seeds = set(_split_base.seeds)
+            afinput.merge(_split_base, reset=False,
+                          bonded_atoms=True, userccd=True)
+
+        previous_hash = None
+        if _split_hashes is not None:
+            previous_hash = _split_hashes.get(filename)
+        digest = content_hash(afinput) if incremental else None
+        written = write_json(filename, afinput, compact=compact,
+                             incremental=incremental,
+                             previous_hash=previous_hash, digest=digest)
+    except Exception as e:
+        return entry_name, f"{e.__class__.__name__}: {e}", False, None
+    return filename, None, written, digest
+
+
+def _write_records(
+    records: list[tuple[str, str, str | None]],
+    outdir: str,
+    compact: bool,
+    incremental: bool
+) -> list[tuple[str, str | None, bool, str | None]]:
+    return [
+        _write_record(name, entry_name, entry_seq, outdir, compact,
+                      incremental)
+        for name, entry_name, entry_seq in records
+    ]
+
+
+def _unique_records(
+    records: Iterable[tuple[str, str | None]],
+    prefix: str,
+    report: BatchReport
+) -> Generator[tuple[str, str, str | None], None, None]:
+    """
+    Assigns the job names to the records. Records with the name of a
+    preceding record are added to the failed records of the report, since
+    their files would be overwritten in the order the workers finish.
+    """
+    names: dict[str, str] = {}
+    for entry_name, entry_seq in records:
+        name = _record_name(entry_name, prefix)
+        if name in names:
+            report.num_jobs += 1
+            report.failed.append((entry_name, (
+                f"Output file '{name}.json' is already written by "
+                f"record '{names[name]}'"
+            )))
+            continue
+        names[name] = entry_name
+        yield name, entry_name, entry_seq
+
+
+def _add_split_results(
+    report: BatchReport,
+    results: Iterable[tuple[str, str | None, bool, str | None]],
+    hashes: HashManifest | None
+) -> None:
+    for filename, error, written, digest in results:
+        report.num_jobs += 1
+        if error is not None:
+            report.failed.append((filename, error))
+            continue
+        if written:
+            report.num_written += 1
+        else:
+            report.num_skipped += 1
+        if hashes is not None and digest is not None:
+            hashes.set(filename, digest)
+
+
+def fasta_split(
+    fasta: str,
+    outdir: str = ".",
+    base: InputFile | None = None,
+    prefix: str = "",
+    workers: int | None = None,
+    compact: bool = False,
+    incremental: bool = False
+) -> BatchReport:
+    """
+    Writes one input file per record of a FASTA file.
+
+    Each input file is named after the sanitized record ID (see
+    `fasta2seq`) with an optional prefix and contains the sequence of the
+    record followed by the sequences, ligands, bonded atom pairs, seeds and
+    user-provided CCD data of the base input file. The IDs of the base
+    entities are kept, so that its bonded atom pairs remain valid.
+
+    The records are streamed from the FASTA file in chunks and only a
+    bounded number of chunks is submitted to the process pool ahead of the
+    results. Therefore, the memory usage only depends on the number of
+    records through the set of assigned output names. Records whose output
+    file is already assigned to a preceding record, e.g. due to duplicate
+    IDs, fail without being written.
+
+    Parameters
+    ----------
+    fasta : str
+        The path to the FASTA file, which may be gzip-compressed.
+    outdir : str, optional
+        The directory where the input files will be written. Default is
+        the current working directory.
+    base : InputFile or None, optional
+        The input file providing shared entities and settings of all jobs.
+    prefix : str, optional
+        The prefix of the job names and output files.
+    workers : int or None, optional
+        The number of worker processes. If None, the number of CPUs is used.
+        With a single worker, all records are processed in the current
+        process.
+    compact : bool, optional
+        If True, the JSON files are written without indentation.
+    incremental : bool, optional
+        If True, files whose content did not change are not written again
+        (see `run_batch`).
+
+    Returns
+    -------
+    BatchReport
+        The number of processed, written and skipped records, the elapsed
+        time and failed records with the reason why their sequence type
+        could not be identified or their output file is duplicated.
+    """
+    os.makedirs(outdir, exist_ok=True)
+    report = BatchReport(unit="records")
+    hashes = HashManifest(outdir) if incremental else None
+
+    records = _unique_records(read_fasta(fasta), prefix, report)
+    chunks = iter(lambda: list(islice(records, BATCH_CHUNKSIZE)), [])
+    args = (outdir, compact, incremental)
+
+    start = time.perf_counter()
+    try:
+        if workers == 1:
+            _init_split(base, hashes)
+            try:
+                for chunk in chunks:
+                    _add_split_results(report, _write_records(chunk, *args),
+                                       hashes)
+            finally:
+                _init_split(None, None)
+        else:
+            window = SPLIT_PREFETCH * (workers or os.cpu_count() or 1)
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_split,
+                initargs=(base, hashes)
+            ) as executor:
+                queue: deque[Future] = deque()
+                try:
+                    for chunk in chunks:
+                        queue.append(
+                            executor.submit(_write_records, chunk, *args)
+                        )
+                        if len(queue) >= window:
+                            _add_split_results(
+                                report, queue.popleft().result(), hashes
+                            )
+                    while queue:
+                        _add_split_results(report, queue.popleft().result(),
+                                           hashes)
+                finally:
+                    for future in queue:
+                        future.cancel()
+    finally:
+        if hashes is not None:
+            hashes.save()
+    report.elapsed = time.perf_counter() - start
+    return report
@@ -17,6 +17,8 @@ class Atom(object):
     name : str
         The name of the Atom.
     """
+    __slots__ = ("eid", "resid", "name")
+
     def __init__(self, eid: str, resid: int, name: str):
         self.eid: str = eid
         self.resid: int = resid
@@ -68,6 +70,8 @@ class Bond(object):
     atom2 : Atom
         The second atom involved in the bond.
     """
+    __slots__ = ("atom1", "atom2")
+
     def __init__(self, atom1: Atom, atom2: Atom):
         self.atom1: Atom = atom1
         self.atom2: Atom = atom2
@@ -1,4 +1,6 @@
-from typing import Self
+from __future__ import annotations
+
+from typing import Self, TYPE_CHECKING
 
 from .input import InputFile
 from .seqid import IDRegister
@@ -6,6 +8,9 @@ from .ligand import Ligand
 from .bond import Bond
 from .sequence import Sequence
 
+if TYPE_CHECKING:
+    from .cache import MSACache
+
 
 class InputBuilder(object):
     """
@@ -60,6 +65,49 @@ class InputBuilder(object):
         self._afinput.reset_all_ids()
         return self
 
+    def collapse_identical(self, relabel: bool = False) -> Self:
+        """
+        Merges identical sequences and ligands of the current `Input` object
+        into single entities with multiple copies (see
+        `InputFile.collapse_identical`).
+
+        Parameters
+        ----------
+        relabel : bool, optional
+            If True, all IDs are reassigned and bonded atom pairs are
+            remapped accordingly. Default is False.
+
+        Returns
+        -------
+        Self
+            Returns the instance itself to allow method chaining.
+        """
+        self._afinput.collapse_identical(relabel=relabel)
+        return self
+
+    def attach_cached(self, cache: MSACache | str,
+                      overwrite: bool = False) -> Self:
+        """
+        Attaches the cached MSAs and templates to the protein and RNA
+        sequences of the current `Input` object (see `attach_cached`).
+
+        Parameters
+        ----------
+        cache : MSACache or str
+            The cache or the path of the cache directory.
+        overwrite : bool, optional
+            If True, existing MSAs and templates are replaced.
+            Default is False.
+
+        Returns
+        -------
+        Self
+            Returns the instance itself to allow method chaining.
+        """
+        from .cache import attach_cached
+        attach_cached(self._afinput, cache, overwrite=overwrite)
+        return self
+
     def build(self) -> InputFile:
         """
         Builds and retrieves the constructed `InputFile` instance.
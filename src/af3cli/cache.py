@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from typing import Iterable
+
+from .input import InputFile
+from .io import read_many
+from .batch import BatchReport
+from .store import BlobStore, MSA_EXTENSION, MMCIF_EXTENSION
+from .sequence import Sequence, SequenceType, ProteinSequence
+from .sequence import MSA, Template, TemplateType
+
+# name of the index file within the cache directory
+CACHE_INDEX_NAME: str = "index.json"
+# file name pattern of the outputs of the AlphaFold3 data pipeline
+DATA_FILE_PATTERN: str = "*_data.json"
+# sequence types with MSAs in the AlphaFold3 input
+CACHED_SEQUENCE_TYPES: tuple[SequenceType, ...] = (
+    SequenceType.PROTEIN, SequenceType.RNA
+)
+
+
+def sequence_hash(seq_str: str) -> str:
+    """
+    Computes the hash under which the MSA and templates of a sequence
+    are stored in the cache.
+
+    Parameters
+    ----------
+    seq_str : str
+        The sequence string.
+
+    Returns
+    -------
+    str
+        The hexadecimal SHA-256 hash of the sequence.
+    """
+    return hashlib.sha256(seq_str.encode()).hexdigest()
+
+
+class MSACache(object):
+    """
+    Stores the MSAs and templates of previously processed sequences, e.g.
+    from the `*_data.json` files written by the AlphaFold3 data pipeline.
+
+    The MSAs and mmCIF files are written once to a content-addressed
+    `BlobStore` within the cache directory. The index file maps the
+    sequence type and the hash of each sequence to the paths of its MSAs
+    and templates, in the same format as the fields of the AlphaFold3
+    input (`pairedMsaPath`, `unpairedMsaPath` and `templates`).
+
+    Attributes
+    ----------
+    root : str
+        The absolute path of the cache directory.
+    store : BlobStore
+        The store containing the MSAs and mmCIF files.
+    index : dict of str to dict
+        The entries by sequence type and sequence hash.
+    """
+    def __init__(self, root: str):
+        self.root: str = os.path.abspath(root)
+        self.store: BlobStore = BlobStore(self.root)
+        self.index: dict[str, dict[str, dict]] = {}
+        self._modified: bool = False
+
+        if os.path.exists(self.filename):
+            with open(self.filename, "r") as index_file:
+                self.index = json.load(index_file)
+
+    @property
+    def filename(self) -> str:
+        return os.path.join(self.root, CACHE_INDEX_NAME)
+
+    def get(self, seq_type: SequenceType, seq_str: str) -> dict | None:
+        """
+        Returns the entry of a sequence or None if it is unknown.
+
+        Parameters
+        ----------
+        seq_type : SequenceType
+            The type of the sequence.
+        seq_str : str
+            The sequence string.
+
+        Returns
+        -------
+        dict or None
+            The paths of the MSAs and the templates of the sequence.
+        """
+        return self.index.get(seq_type.value, {}).get(sequence_hash(seq_str))
+
+    def add(self, sequence: Sequence, directory: str = ".") -> bool:
+        """
+        Adds the MSAs and templates of a sequence to the cache. Inline
+        MSAs and templates are written to the store, relative paths are
+        resolved against `directory`. An existing entry of the same
+        sequence is replaced.
+
+        Parameters
+        ----------
+        sequence : Sequence
+            The sequence with its MSA and templates.
+        directory : str, optional
+            The directory of the file from which the sequence was read.
+
+        Returns
+        -------
+        bool
+            True if the sequence was added, False if it has no MSA.
+        """
+        if (sequence.sequence_type not in CACHED_SEQUENCE_TYPES
+                or sequence.msa is None):
+            return False
+
+        msa = sequence.msa
+        entry = dict()
+        for key, content, is_path in (
+            ("pairedMsaPath", msa.paired, msa.paired_is_path),
+            ("unpairedMsaPath", msa.unpaired, msa.unpaired_is_path)
+        ):
+            if content is None:
+                continue
+            entry[key] = self._put(content, is_path, MSA_EXTENSION, directory)
+
+        if isinstance(sequence, ProteinSequence):
+            # the data pipeline omits empty paired MSAs
+            entry.setdefault("pairedMsaPath",
+                             self.store.put("", MSA_EXTENSION))
+            entry["templates"] = [{
+                "mmcifPath": self._put(
+                    template.mmcif,
+                    template.template_type == TemplateType.FILE,
+                    MMCIF_EXTENSION, directory
+                ),
+                "queryIndices": template.qidx,
+                "templateIndices": template.tidx
+            } for template in sequence.templates]
+
+        self.index.setdefault(sequence.sequence_type.value, {})[
+            sequence_hash(sequence.sequence)] = entry
+        self._modified = True
+        return True
+
+    def _put(self, content: str, is_path: bool, ext: str,
+             directory: str) -> str:
+        if is_path:
+            return os.path.abspath(os.path.join(directory, content))
+        return self.store.put(content, ext)
+
+    def save(self) -> None:
+        """
+        Writes the index file if any entry was added.
+        """
+        if not self._modified:
+            return
+        os.makedirs(self.root, exist_ok=True)
+        tmp_filename = f"{self.filename}.{os.getpid()}.tmp"
+        with open(tmp_filename, "w") as index_file:
+            json.dump(self.index, index_file, indent=0, sort_keys=True)
+        os.replace(tmp_filename, self.filename)
+        self._modified = False
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self.index.values())
+
+    def __str__(self) -> str:
+        return f"MSACache({self.root}, {len(self)} sequences)"
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}({self.root})>"
+
+
+def harvest(
+    paths: str | Iterable[str],
+    cache: MSACache | str,
+    workers: int | None = None
+) -> tuple[BatchReport, MSACache]:
+    """
+    Adds the MSAs and templates of all sequences in the outputs of the
+    AlphaFold3 data pipeline to the cache.
+
+    The files are read concurrently and lazily, so that the large string
+    fields are only decoded for hashing. Entries of later files replace
+    the entries of earlier files with the same sequence.
+
+    Parameters
+    ----------
+    paths : str or iterable of str
+        The AlphaFold3 output directory, which is searched recursively for
+        `*_data.json` files, a glob pattern or an iterable of file paths.
+    cache : MSACache or str
+        The cache or the path of the cache directory.
+    workers : int or None, optional
+        The number of threads used for reading the files.
+
+    Returns
+    -------
+    tuple of (BatchReport, MSACache)
+        The number of harvested and skipped files with failed files and
+        the updated cache.
+    """
+    if isinstance(cache, str):
+        cache = MSACache(cache)
+    if isinstance(paths, str) and os.path.isdir(paths):
+        paths = os.path.join(paths, "**", DATA_FILE_PATTERN)
+    report = BatchReport(unit="files")
+
+    start = time.perf_counter()
+    for filename, result in read_many(paths, workers=workers, lazy=True):
+        report.num_jobs += 1
+        try:
+            if isinstance(result, Exception):
+                raise result
+            directory = os.path.dirname(os.path.abspath(filename))
+            num_added = sum(cache.add(sequence, directory)
+                            for sequence in result.sequences)
+        except Exception as e:
+            report.failed.append((filename, f"{e.__class__.__name__}: {e}"))
+            continue
+        if num_added:
+            report.num_written += 1
+        else:
+            report.num_skipped += 1
+    cache.save()
+    report.elapsed = time.perf_counter() - start
+    return report, cache
+
+
+def attach_cached(
+    input_file: InputFile,
+    cache: MSACache | str,
+    overwrite: bool = False
+) -> int:
+    """
+    Attaches the cached MSAs and templates to all protein and RNA sequences
+    of an input file, so that AlphaFold3 can be run without the data
+    pipeline. The sequences are modified in place to reference the stored
+    files by their absolute path.
+
+    Parameters
+    ----------
+    input_file : InputFile
+        The input file whose sequences should be modified.
+    cache : MSACache or str
+        The cache or the path of the cache directory.
+    overwrite : bool, optional
+        If True, existing MSAs and templates are replaced. By default,
+        only sequences without MSA are modified and existing templates
+        are kept.
+
+    Returns
+    -------
+    int
+        The number of sequences with attached MSAs.
+    """
+    if isinstance(cache, str):
+        cache = MSACache(cache)
+
+    num_attached = 0
+    for sequence in input_file.sequences:
+        if sequence.msa is not None and not overwrite:
+            continue
+        if sequence.sequence_type not in CACHED_SEQUENCE_TYPES:
+            continue
+        entry = cache.get(sequence.sequence_type, sequence.sequence)
+        if entry is None:
+            continue
+
+        sequence.msa = MSA(
+            paired=entry.get("pairedMsaPath"),
+            unpaired=entry.get("unpairedMsaPath"),
+            paired_is_path=True,
+            unpaired_is_path=True
+        )
+        # user-provided templates are kept unless they should be replaced
+        if isinstance(sequence, ProteinSequence) and (
+                overwrite or not sequence.templates):
+            sequence.templates[:] = [
+                Template(TemplateType.FILE, template["mmcifPath"],
+                         template["queryIndices"], template["templateIndices"])
+                for template in entry["templates"]
+            ]
+        num_attached += 1
+    return num_attached
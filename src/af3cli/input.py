@@ -1,12 +1,40 @@
 from __future__ import annotations
 
+import hashlib
+import json
 from copy import deepcopy
+from typing import Any, Generator, Iterator
 
 from .mixin import DictMixin
 from .ligand import Ligand
 from .bond import Bond
 from .sequence import Sequence
-from .seqid import IDRegister
+from .seqid import IDRecord, IDRegister
+from .lazy import LazyString, resolve
+
+
+def _entity_key(entry: Sequence | Ligand) -> str:
+    """
+    Computes a hash of the serialized content of a sequence or ligand
+    without its IDs. Entities with the same key only differ in their IDs,
+    i.e. the sequence type, sequence, modifications, templates and MSA of
+    sequences or the type and value of ligands are identical.
+
+    Parameters
+    ----------
+    entry : Sequence or Ligand
+        The entity to be hashed.
+
+    Returns
+    -------
+    str
+        The hexadecimal SHA-256 hash of the entity content.
+    """
+    (entity_type, content), = entry.to_dict().items()
+    content = {key: value for key, value in content.items() if key != "id"}
+    # lazily read strings are decoded by `str`
+    encoded = json.dumps([entity_type, content], sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
 
 
 class InputFile(DictMixin):
@@ -40,7 +68,7 @@ class InputFile(DictMixin):
         self.name: str = name
         self.version: int = version
         self.dialect: str = dialect
-        self.user_ccd: str = user_ccd
+        self._user_ccd: str | LazyString | None = user_ccd
         self.seeds: set[int] = set()
 
         if seeds is None:
@@ -53,6 +81,15 @@ class InputFile(DictMixin):
 
         self._id_register: IDRegister = IDRegister()
 
+    @property
+    def user_ccd(self) -> str | None:
+        self._user_ccd = resolve(self._user_ccd)
+        return self._user_ccd
+
+    @user_ccd.setter
+    def user_ccd(self, user_ccd: str | None) -> None:
+        self._user_ccd = user_ccd
+
     def _register_ids(self) -> None:
         """
         Registers unique IDs for sequences and ligands in the internal ID register.
@@ -110,6 +147,65 @@ class InputFile(DictMixin):
             for entry in seqtype:
                 entry.clear_temporary_id()
 
+    def collapse_identical(self, relabel: bool = False) -> int:
+        """
+        Merges identical sequences and identical ligands into a single
+        entity, whose number of copies and IDs cover all merged entities.
+        AlphaFold3 therefore processes each unique entity only once, e.g.
+        the chains of a homomultimer read separately from a FASTA file.
+
+        By default, the merged entity keeps the explicit and automatically
+        assigned IDs of all merged entities, so that the IDs of all chains
+        and the bonded atom pairs remain unchanged. Otherwise, all IDs are
+        reassigned consecutively and the bonded atom pairs are remapped to
+        the new IDs.
+
+        Parameters
+        ----------
+        relabel : bool, optional
+            If True, all IDs are reassigned and the bonded atom pairs are
+            remapped accordingly. Default is False.
+
+        Returns
+        -------
+        int
+            The number of entities that were merged into other entities.
+        """
+        self._prepare()
+        num_merged = 0
+        # the merged entities and the previous IDs of all their copies
+        collapsed: list[tuple[IDRecord, list[str]]] = []
+        for seqtype in [self.sequences, self.ligands]:
+            groups: dict[str, list[IDRecord]] = dict()
+            for entry in seqtype:
+                groups.setdefault(_entity_key(entry), []).append(entry)
+
+            seqtype.clear()
+            for entries in groups.values():
+                entry = entries[0]
+                seq_ids = [seq_id for other in entries
+                           for seq_id in other.get_full_id_list()]
+                if len(entries) > 1:
+                    entry.set_id(seq_ids)
+                    entry.num = len(seq_ids)
+                    num_merged += len(entries) - 1
+                seqtype.append(entry)
+                collapsed.append((entry, seq_ids))
+
+        if relabel:
+            id_map: dict[str, str] = dict()
+            self.reset_all_ids()
+            self._prepare()
+            for entry, seq_ids in collapsed:
+                id_map.update(zip(seq_ids, entry.get_full_id_list()))
+            # atoms might be shared between bonds and are only remapped once
+            atoms = {id(atom): atom for bond in self.bonded_atoms
+                     for atom in (bond.atom1, bond.atom2)}
+            for atom in atoms.values():
+                atom.eid = id_map.get(atom.eid, atom.eid)
+        self.clear_temporary_ids()
+        return num_merged
+
     def merge(
         self,
         other: InputFile,
@@ -163,7 +259,7 @@ class InputFile(DictMixin):
             for bond in tmp_input.bonded_atoms:
                 self.bonded_atoms.append(bond)
         if userccd:
-            self.user_ccd = tmp_input.user_ccd
+            self._user_ccd = tmp_input._user_ccd
 
         for seq in tmp_input.sequences:
             self.sequences.append(seq)
@@ -177,38 +273,64 @@ class InputFile(DictMixin):
         The created dictionary contains all necessary information for the AlphaFold3 input
         file. An ID will be assigned to all sequences and ligands if they do not already
         have one. This might result in an error if new sequences with duplicate IDs are
-        added to the input file.
+        added to the input file. Large string fields of lazily read input files are
+        returned as `LazyString` objects until they are accessed.
 
         Returns
         -------
         dict
             A dictionary containing all relevant attributes for running AlphaFold3 jobs.
         """
-        self._prepare()
-
         content = dict()
-        content["name"] = self.name
-        content["version"] = self.version
-        content["dialect"] = self.dialect
-        content["modelSeeds"] = list(self.seeds)
-        content["sequences"] = []
+        for key, value in self.iter_dict():
+            if isinstance(value, Iterator):
+                value = list(value)
+            content[key] = value
+        return content
 
-        for seqtype in [self.sequences, self.ligands]:
-            for entry in seqtype:
-                content["sequences"].append(entry.to_dict())
+    def iter_dict(self) -> Generator[tuple[str, Any], None, None]:
+        """
+        Lazily generates the top-level fields of the AlphaFold3 input file
+        in the same order as `to_dict`.
 
-        if len(self.bonded_atoms):
-            content["bondedAtomPairs"] = []
-            for entry in self.bonded_atoms:
-                content["bondedAtomPairs"].append(entry.as_list())
+        The entries of the `sequences` and `bondedAtomPairs` fields are
+        returned as generators, so that the dictionary of each entity is only
+        created when it is consumed. This allows serializing large input
+        files entity by entity without holding the complete nested
+        dictionary in memory.
+
+        Yields
+        ------
+        tuple of (str, Any)
+            The name of the field and its value or a generator over the
+            entries of the field.
+        """
+        self._prepare()
 
-        if self.user_ccd is not None:
-            content["userCCD"] = self.user_ccd
+        yield "name", self.name
+        yield "version", self.version
+        yield "dialect", self.dialect
+        yield "modelSeeds", list(self.seeds)
+        yield "sequences", (
+            entry.to_dict()
+            for seqtype in [self.sequences, self.ligands]
+            for entry in seqtype
+        )
 
-        return content
+        if len(self.bonded_atoms):
+            yield "bondedAtomPairs", (
+                entry.as_list() for entry in self.bonded_atoms
+            )
+
+        if self._user_ccd is not None:
+            yield "userCCD", self._user_ccd
 
     @staticmethod
-    def read(filename) -> InputFile:
+    def read(
+        filename,
+        lazy: bool = False,
+        backend: str | None = None
+    ) -> InputFile:
         """
         Reads a file and returns its content as an instance of InputFile.
 
@@ -216,6 +338,11 @@ class InputFile(DictMixin):
         ----------
         filename : str
             The path to the JSON file to be read.
+        lazy : bool, optional
+            If True, inline MSAs, templates and user-provided CCD data are only
+            decoded when they are accessed. Default is False.
+        backend : str or None, optional
+            The name of the JSON backend. If None, the default backend is used.
 
         Returns
         -------
@@ -224,9 +351,15 @@ class InputFile(DictMixin):
             of the provided JSON file.
         """
         from .io import read_json
-        return read_json(filename)
+        return read_json(filename, lazy=lazy, backend=backend)
 
-    def write(self, filename) -> None:
+    def write(
+        self,
+        filename,
+        compact: bool = False,
+        backend: str | None = None,
+        incremental: bool = False
+    ) -> bool:
         """
         Writes the current object's data to a JSON file.
 
@@ -235,6 +368,20 @@ class InputFile(DictMixin):
         filename : str
             The path to the file where the object's data will be saved.
             The file must be writable.
+        compact : bool, optional
+            If True, the JSON file is written without indentation and
+            whitespace. Default is False.
+        backend : str or None, optional
+            The name of the JSON backend. If None, the default backend is used.
+        incremental : bool, optional
+            If True, the file is only written if its content differs from
+            the existing file. Default is False.
+
+        Returns
+        -------
+        bool
+            True if the file was written, False if it was unchanged.
         """
         from .io import write_json
-        write_json(filename, self)
+        return write_json(filename, self, compact=compact, backend=backend,
+                          incremental=incremental)
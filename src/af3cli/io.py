@@ -1,22 +1,453 @@
+import bz2
+import glob
+import hashlib
+import gzip
 import json
+import lzma
+import mmap
+import os
+import re
+from collections import deque
+from concurrent.futures import (Future, ThreadPoolExecutor, ProcessPoolExecutor,
+                                FIRST_COMPLETED, wait)
+from contextlib import nullcontext
+from typing import Any, BinaryIO, Generator, Iterable, Iterator
 
 from .input import InputFile
 from .bond import Atom, Bond
 from .exception import AFMissingFieldError, AFTemplateError, AFMSAError
 from .builder import InputBuilder
+from .lazy import LazyString
+from .backend import JSONBackend, get_json_backend, get_encoder_backend
 from .ligand import Ligand, SMILigand, CCDLigand
 from .sequence import (Sequence,
+                       ProteinSequence, DNASequence, RNASequence,
                        ResidueModification,
                        NucleotideModification,
                        SequenceType, TemplateType,
                        Template, MSA, Modification)
 
 
-def write_json(filename: str, data: InputFile) -> None:
+# keys of string values that are deferred by the lazy reader
+LAZY_FIELDS: tuple[str, ...] = ("unpairedMsa", "pairedMsa", "mmcif", "userCCD")
+_LAZY_KEY_PATTERN: re.Pattern = re.compile(
+    rb'"(?:' + b"|".join(k.encode() for k in LAZY_FIELDS) + rb')"\s*:\s*"'
+)
+# placeholder for deferred values, which is encoded as '"\u0000lazy:<n>"'
+_LAZY_PLACEHOLDER: str = "\x00lazy:"
+_LAZY_ENCODED_PATTERN: re.Pattern = re.compile(rb'"\\u0000lazy:(\d+)"')
+
+# file extensions of the supported compression formats
+COMPRESSION_FORMATS: dict[str, str] = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+GZIP_COMPRESSLEVEL: int = 6
+
+# sidecar file with the content hashes for incremental writes
+HASH_MANIFEST_NAME: str = ".af3cli-hashes.json"
+# lazily read values are decoded by `str`
+_CANONICAL_ENCODER: json.JSONEncoder = json.JSONEncoder(
+    sort_keys=True, separators=(",", ":"), default=str
+)
+
+
+def get_compression(filename: str) -> str | None:
+    """
+    Determines the compression format from the file extension.
+
+    Parameters
+    ----------
+    filename : str
+        The path to the file.
+
+    Returns
+    -------
+    str or None
+        The compression format ("gzip", "bz2" or "xz") or None for
+        uncompressed files.
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    return COMPRESSION_FORMATS.get(ext)
+
+
+def _compress(fileobj: BinaryIO, filename: str) -> BinaryIO:
+    """
+    Wraps a writable binary file handle with a streaming compressor,
+    depending on the extension of the target filename.
+
+    Parameters
+    ----------
+    fileobj : BinaryIO
+        The file handle of the output file.
+    filename : str
+        The name of the target file, which determines the compression format.
+
+    Returns
+    -------
+    BinaryIO
+        A file handle that compresses all written data or the unchanged
+        file handle for uncompressed files.
+    """
+    match get_compression(filename):
+        case "gzip":
+            return gzip.GzipFile(
+                filename=os.path.basename(filename), mode="wb",
+                fileobj=fileobj, compresslevel=GZIP_COMPRESSLEVEL
+            )
+        case "bz2":
+            return bz2.BZ2File(fileobj, mode="wb")
+        case "xz":
+            return lzma.LZMAFile(fileobj, mode="wb")
+        case _:
+            return nullcontext(fileobj)
+
+
+def open_read(filename: str) -> BinaryIO:
+    """
+    Opens a file for reading and transparently decompresses it, depending on
+    the file extension.
+
+    Parameters
+    ----------
+    filename : str
+        The path to the file.
+
+    Returns
+    -------
+    BinaryIO
+        A readable binary file handle.
+    """
+    match get_compression(filename):
+        case "gzip":
+            return gzip.open(filename, "rb")
+        case "bz2":
+            return bz2.open(filename, "rb")
+        case "xz":
+            return lzma.open(filename, "rb")
+        case _:
+            return open(filename, "rb")
+
+
+def _replace_lazy(obj: Any, lazy_values: list[LazyString]) -> Any:
+    """
+    Replaces all `LazyString` objects within a nested structure of
+    dictionaries and lists by numbered placeholder strings.
+
+    Parameters
+    ----------
+    obj : Any
+        The object to be processed.
+    lazy_values : list of LazyString
+        The list to which the replaced values are appended. The index
+        within this list corresponds to the number of the placeholder.
+
+    Returns
+    -------
+    Any
+        The object with all lazy values being replaced.
+    """
+    if isinstance(obj, LazyString):
+        lazy_values.append(obj)
+        return f"{_LAZY_PLACEHOLDER}{len(lazy_values) - 1}"
+    if isinstance(obj, dict):
+        return {k: _replace_lazy(v, lazy_values) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_replace_lazy(v, lazy_values) for v in obj]
+    return obj
+
+
+def _encode_nested(
+    backend: JSONBackend,
+    obj: Any,
+    level: int,
+    compact: bool
+) -> Generator[bytes | memoryview, None, None]:
+    """
+    Encodes an object as JSON chunks, shifting the indentation of all nested
+    lines to the given nesting level of the enclosing document. Lazily read
+    string values are copied from the memory-mapped input file without
+    being decoded.
+
+    Parameters
+    ----------
+    backend : JSONBackend
+        The backend used for serialization.
+    obj : Any
+        The JSON serializable object.
+    level : int
+        The nesting level of the object within the document.
+    compact : bool
+        If True, the output contains no indentation and whitespace.
+
+    Yields
+    ------
+    bytes or memoryview
+        Chunks of the JSON representation of the object.
+    """
+    lazy_values = []
+    obj = _replace_lazy(obj, lazy_values)
+
+    # newlines cannot be part of encoded strings, since they are escaped
+    newline = b"\n" + b" " * backend.indent * level
+
+    for chunk in backend.iterencode(obj, compact=compact):
+        if not compact:
+            chunk = chunk.replace(b"\n", newline)
+        if not lazy_values:
+            yield chunk
+            continue
+        pos = 0
+        for match in _LAZY_ENCODED_PATTERN.finditer(chunk):
+            yield chunk[pos:match.start()]
+            yield lazy_values[int(match.group(1))].raw()
+            pos = match.end()
+        yield chunk[pos:]
+
+
+def iter_json(
+    data: InputFile,
+    compact: bool = False,
+    backend: str | None = None
+) -> Generator[bytes | memoryview, None, None]:
+    """
+    Serializes an InputFile object into UTF-8 encoded JSON chunks.
+
+    The top-level fields are encoded one after another and each sequence,
+    ligand and bonded atom pair is converted to its dictionary representation
+    only when it is reached. Therefore, the complete nested dictionary of the
+    input file is never created at once. Unless orjson or ujson is selected
+    explicitly, the indented output is written by the standard library
+    (see `get_encoder_backend`) and is identical to
+    `json.dump(data.to_dict(), fp, indent=4)`.
+
+    Parameters
+    ----------
+    data : InputFile
+        The InputFile object to be serialized.
+    compact : bool, optional
+        If True, the output contains no indentation and whitespace.
+        Default is False.
+    backend : str or None, optional
+        The name of the JSON backend. If None, the default backend
+        is used (see `set_json_backend`).
+
+    Yields
+    ------
+    bytes or memoryview
+        Consecutive chunks of the JSON document.
+    """
+    json_backend = get_encoder_backend(backend, compact)
+    key_sep = b":" if compact else b": "
+
+    def _indent(level: int) -> bytes:
+        if compact:
+            return b""
+        return b"\n" + b" " * json_backend.indent * level
+
+    yield b"{"
+    for num_field, (key, value) in enumerate(data.iter_dict()):
+        if num_field:
+            yield b","
+        yield _indent(1) + json.dumps(key).encode() + key_sep
+        if not isinstance(value, Iterator):
+            yield from _encode_nested(json_backend, value, 1, compact)
+            continue
+
+        yield b"["
+        num_entries = 0
+        for entry in value:
+            if num_entries:
+                yield b","
+            yield _indent(2)
+            yield from _encode_nested(json_backend, entry, 2, compact)
+            num_entries += 1
+        if num_entries:
+            yield _indent(1)
+        yield b"]"
+    yield _indent(0) + b"}"
+
+
+def dump_json(
+    fp: BinaryIO,
+    data: InputFile,
+    compact: bool = False,
+    backend: str | None = None
+) -> None:
+    """
+    Streams the JSON representation of an InputFile object to a file handle.
+
+    Parameters
+    ----------
+    fp : BinaryIO
+        A writable binary file handle.
+    data : InputFile
+        The InputFile object to be serialized.
+    compact : bool, optional
+        If True, the output contains no indentation and whitespace.
+        Default is False.
+    backend : str or None, optional
+        The name of the JSON backend. If None, the default backend is used.
+    """
+    for chunk in iter_json(data, compact=compact, backend=backend):
+        fp.write(chunk)
+
+
+def content_hash(data: InputFile) -> str:
+    """
+    Computes a canonical hash of the content of an InputFile object.
+
+    The hash is calculated over a compact JSON representation with sorted
+    keys, which is independent of the indentation and the JSON backend.
+    The entities are hashed one after another, so that the complete nested
+    dictionary is never created at once.
+
+    Parameters
+    ----------
+    data : InputFile
+        The InputFile object to be hashed.
+
+    Returns
+    -------
+    str
+        The hexadecimal SHA-256 hash of the content.
+    """
+    hasher = hashlib.sha256()
+    for key, value in data.iter_dict():
+        hasher.update(b"\x1d" + key.encode())
+        entries = value if isinstance(value, Iterator) else [value]
+        for entry in entries:
+            hasher.update(b"\x1e")
+            for chunk in _CANONICAL_ENCODER.iterencode(entry):
+                hasher.update(chunk.encode())
+    return hasher.hexdigest()
+
+
+class HashManifest(object):
+    """
+    Stores the content hashes of written input files in a sidecar file
+    within the output directory. This allows incremental writes to skip
+    unchanged files without reading them.
+
+    Attributes
+    ----------
+    directory : str
+        The directory containing the input files and the sidecar file.
+    hashes : dict of str to str
+        The content hashes by file path relative to `directory`.
+    """
+    def __init__(self, directory: str):
+        self.directory: str = directory
+        self.hashes: dict[str, str] = {}
+        self._modified: bool = False
+
+        if os.path.exists(self.filename):
+            with open(self.filename, "r") as manifest_file:
+                self.hashes = json.load(manifest_file)
+
+    @property
+    def filename(self) -> str:
+        return os.path.join(self.directory, HASH_MANIFEST_NAME)
+
+    def _key(self, filename: str) -> str:
+        return os.path.relpath(filename, self.directory)
+
+    def get(self, filename: str) -> str | None:
+        """
+        Returns the stored hash of a file or None if it is unknown.
+
+        Parameters
+        ----------
+        filename : str
+            The path of the input file.
+
+        Returns
+        -------
+        str or None
+            The content hash of the last write.
+        """
+        return self.hashes.get(self._key(filename))
+
+    def set(self, filename: str, digest: str) -> None:
+        """
+        Updates the stored hash of a file.
+
+        Parameters
+        ----------
+        filename : str
+            The path of the input file.
+        digest : str
+            The content hash of the written file.
+        """
+        key = self._key(filename)
+        if self.hashes.get(key) != digest:
+            self.hashes[key] = digest
+            self._modified = True
+
+    def save(self) -> None:
+        """
+        Writes the sidecar file if any hash was updated.
+        """
+        if not self._modified:
+            return
+        tmp_filename = f"{self.filename}.{os.getpid()}.tmp"
+        with open(tmp_filename, "w") as manifest_file:
+            json.dump(self.hashes, manifest_file, indent=0, sort_keys=True)
+        os.replace(tmp_filename, self.filename)
+        self._modified = False
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def __str__(self) -> str:
+        return f"HashManifest({self.filename}, {len(self)})"
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}({self.directory})>"
+
+
+def _existing_hash(filename: str, backend: str | None = None) -> str | None:
+    """
+    Computes the content hash of an existing input file.
+
+    Returns
+    -------
+    str or None
+        The content hash or None if the file does not exist or
+        cannot be read.
+    """
+    if not os.path.exists(filename):
+        return None
+    try:
+        return content_hash(read_json(filename, check=False, lazy=True,
+                                      backend=backend))
+    except Exception:
+        return None
+
+
+def write_json(
+    filename: str,
+    data: InputFile,
+    compact: bool = False,
+    backend: str | None = None,
+    incremental: bool = False,
+    hashes: HashManifest | None = None,
+    previous_hash: str | None = None,
+    digest: str | None = None
+) -> bool:
     """
     Writes the contents of an InputFile object to the specified JSON file. The
-    data is serialized into a JSON structure with readable indentation and then
-    saved to a file.
+    data is streamed entity by entity to the file, either with readable
+    indentation or in a compact form.
+
+    The content is first written to a temporary file in the same directory,
+    which replaces the target file afterward. Thus, an existing file is left
+    untouched if the serialization fails and lazily read input files can be
+    written back to their original location. Filenames ending in `.gz`,
+    `.bz2` or `.xz` are compressed while the data is streamed to the file.
+
+    In incremental mode, the content hash of the data is compared to the
+    hash of the previous write and the file is only written if the content
+    changed. The previous hash is taken from `previous_hash`, the `hashes`
+    manifest or, as a fallback, computed from the existing file. Changes of
+    the formatting options (`compact`, `backend`) are not detected.
 
     Parameters
     ----------
@@ -25,28 +456,195 @@ def write_json(filename: str, data: InputFile) -> None:
     data : InputFile
         The InputFile object containing the data to be serialized and written
         to the JSON file.
+    compact : bool, optional
+        If True, the JSON file is written without indentation and whitespace.
+        Default is False.
+    backend : str or None, optional
+        The name of the JSON backend ("orjson", "ujson", "json" or "auto").
+        If None, the default backend is used (see `set_json_backend`).
+    incremental : bool, optional
+        If True, unchanged files are not written again. Default is False.
+    hashes : HashManifest or None, optional
+        The manifest with the hashes of previous writes. The hash of the
+        written file is updated, but the manifest is not saved.
+    previous_hash : str or None, optional
+        The known content hash of the existing file.
+    digest : str or None, optional
+        The precomputed content hash of `data` (see `content_hash`), which
+        avoids serializing the data twice if the caller needs the hash.
+
+    Returns
+    -------
+    bool
+        True if the file was written, False if it was skipped.
+    """
+    if incremental:
+        if digest is None:
+            digest = content_hash(data)
+        if previous_hash is None and hashes is not None:
+            previous_hash = hashes.get(filename)
+        if previous_hash is not None and not os.path.exists(filename):
+            previous_hash = None
+        if previous_hash is None:
+            previous_hash = _existing_hash(filename, backend=backend)
+        if digest == previous_hash:
+            if hashes is not None:
+                hashes.set(filename, digest)
+            return False
+
+    tmp_filename = f"{filename}.{os.getpid()}.tmp"
+    try:
+        with (open(tmp_filename, 'wb') as raw_file,
+              _compress(raw_file, filename) as json_file):
+            dump_json(json_file, data, compact=compact, backend=backend)
+        os.replace(tmp_filename, filename)
+    except BaseException:
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+        raise
+
+    if hashes is not None:
+        hashes.set(filename, digest or content_hash(data))
+    return True
+
+
+def read_raw(filename: str, backend: str | None = None) -> dict:
+    """
+    Reads a JSON file and returns its content as a dictionary without
+    creating an InputFile object, e.g. for validation. Compressed files
+    are decompressed depending on their file extension.
+
+    Parameters
+    ----------
+    filename : str
+        The path to the JSON file that should be read.
+    backend : str or None, optional
+        The name of the JSON backend. If None, the default backend is used.
+
+    Returns
+    -------
+    dict
+        A dictionary containing the parsed data from the JSON file.
+    """
+    with open_read(filename) as json_file:
+        return get_json_backend(backend).loads(json_file.read())
+
+
+def _is_escaped(buffer: mmap.mmap, pos: int) -> bool:
+    """
+    Checks whether the character at the given offset is escaped, i.e. it is
+    preceded by an odd number of backslashes.
+    """
+    num_backslashes = 0
+    while (pos > num_backslashes
+           and buffer[pos - num_backslashes - 1] == ord("\\")):
+        num_backslashes += 1
+    return num_backslashes % 2 == 1
+
+
+def _find_string_end(buffer: mmap.mmap, start: int) -> int:
+    """
+    Finds the closing quote of an encoded JSON string.
+
+    Parameters
+    ----------
+    buffer : mmap.mmap
+        The memory-mapped JSON file.
+    start : int
+        The offset of the first byte after the opening quote.
+
+    Returns
+    -------
+    int
+        The offset of the closing quote.
+
+    Raises
+    ------
+    ValueError
+        If the string is not terminated.
     """
-    with open(filename, 'w') as json_file:
-        json.dump(data.to_dict(), json_file, indent=4)
+    end = buffer.find(b'"', start)
+    while end != -1:
+        if not _is_escaped(buffer, end):
+            return end
+        end = buffer.find(b'"', end + 1)
+    raise ValueError(f"Unterminated string starting at offset {start}.")
 
 
-def _read(filename: str) -> dict:
+def _substitute_lazy(obj: Any, lazy_values: list[LazyString]) -> Any:
     """
-    Reads a JSON file and returns its content as a dictionary.
+    Replaces the placeholder strings of deferred values within the parsed
+    JSON data by the corresponding `LazyString` objects.
+
+    Parameters
+    ----------
+    obj : Any
+        The parsed JSON data.
+    lazy_values : list of LazyString
+        The deferred values in the order of their placeholder numbers.
+
+    Returns
+    -------
+    Any
+        The data with all placeholders being replaced.
+    """
+    if isinstance(obj, str) and obj.startswith(_LAZY_PLACEHOLDER):
+        return lazy_values[int(obj[len(_LAZY_PLACEHOLDER):])]
+    if isinstance(obj, dict):
+        return {k: _substitute_lazy(v, lazy_values) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_substitute_lazy(v, lazy_values) for v in obj]
+    return obj
+
+
+def _read_lazy(filename: str, backend: str | None = None) -> dict:
+    """
+    Reads a JSON file and returns its content as a dictionary, deferring the
+    decoding of large string fields.
+
+    The file is memory-mapped and the values of the `LAZY_FIELDS` keys are
+    located by their byte offsets and replaced by short placeholders. Only
+    the remaining, small part of the file is parsed. The deferred values are
+    represented by `LazyString` objects referencing the memory-mapped file.
 
     Parameters
     ----------
     filename : str
         The path to the JSON file that should be read.
+    backend : str or None, optional
+        The name of the JSON backend. If None, the default backend is used.
 
     Returns
     -------
     dict
         A dictionary containing the parsed data from the JSON file.
     """
-    with open(filename, "r") as json_file:
-        data = json.load(json_file)
-        return data
+    json_backend = get_json_backend(backend)
+    with open(filename, "rb") as json_file:
+        if os.fstat(json_file.fileno()).st_size == 0:
+            return json_backend.loads(json_file.read())
+        buffer = mmap.mmap(json_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    segments = []
+    lazy_values = []
+    pos = 0
+    match = _LAZY_KEY_PATTERN.search(buffer, pos)
+    while match is not None:
+        start = match.end()
+        if _is_escaped(buffer, match.start()):
+            # the key is part of another string value
+            match = _LAZY_KEY_PATTERN.search(buffer, match.start() + 1)
+            continue
+        end = _find_string_end(buffer, start)
+        segments.append(buffer[pos:start])
+        segments.append(f"\\u0000lazy:{len(lazy_values)}".encode())
+        lazy_values.append(LazyString(buffer, start, end))
+        pos = end
+        match = _LAZY_KEY_PATTERN.search(buffer, pos)
+    segments.append(buffer[pos:])
+
+    data = json_backend.loads(b"".join(segments))
+    return _substitute_lazy(data, lazy_values)
 
 
 def _check_data(data: dict) -> None:
@@ -176,7 +774,7 @@ def _parse_modifcations(
         if seq_type == SequenceType.PROTEIN:
             tmp_mod = ResidueModification(
                 mod_str=modification["ptmType"],
-                mod_pos=modification["position"]
+                mod_pos=modification["ptmPosition"]
             )
         else:
             tmp_mod = NucleotideModification(
@@ -315,17 +913,37 @@ def _parse_sequence(seq_type: str, seq_content: dict) -> Sequence:
     if seq_type != SequenceType.DNA:
         msa = _parse_msa(seq_type, seq_content)
 
-    return Sequence(
-        seq_type=seq_type,
-        seq_str=seq_content["sequence"],
-        seq_id=seq_id,
-        modifications=modifications,
-        templates=templates,
-        msa=msa,
-    )
+    match seq_type:
+        case SequenceType.PROTEIN:
+            # templates are only serialized by the protein subclass
+            return ProteinSequence(
+                seq_str=seq_content["sequence"],
+                seq_id=seq_id,
+                modifications=modifications,
+                templates=templates,
+                msa=msa,
+            )
+        case SequenceType.RNA:
+            return RNASequence(
+                seq_str=seq_content["sequence"],
+                seq_id=seq_id,
+                modifications=modifications,
+                msa=msa,
+            )
+        case _:
+            return DNASequence(
+                seq_str=seq_content["sequence"],
+                seq_id=seq_id,
+                modifications=modifications,
+            )
 
 
-def read_json(filename: str, check: bool = True) -> InputFile:
+def read_json(
+    filename: str,
+    check: bool = True,
+    lazy: bool = False,
+    backend: str | None = None
+) -> InputFile:
     """
     Reads a JSON file and constructs an `InputFile` object by parsing the data.
 
@@ -341,6 +959,15 @@ def read_json(filename: str, check: bool = True) -> InputFile:
     check : bool, optional
         Whether to perform a data consistency check after reading the input data.
         Default is True.
+    lazy : bool, optional
+        If True, the file is memory-mapped and the values of inline MSAs,
+        templates and user-provided CCD data are only decoded when they are
+        accessed. Untouched values are copied directly into the output when
+        writing the input file. Compressed files cannot be memory-mapped
+        and are always read completely. Default is False.
+    backend : str or None, optional
+        The name of the JSON backend ("orjson", "ujson", "json" or "auto").
+        If None, the default backend is used (see `set_json_backend`).
 
     Returns
     -------
@@ -353,7 +980,10 @@ def read_json(filename: str, check: bool = True) -> InputFile:
         If an invalid bonded atom pair is detected in the JSON data, specifically
         when a pair does not contain exactly two elements or is malformed.
     """
-    data = _read(filename)
+    if lazy and get_compression(filename) is None:
+        data = _read_lazy(filename, backend=backend)
+    else:
+        data = read_raw(filename, backend=backend)
     if check:
         _check_data(data)
 
@@ -389,3 +1019,172 @@ def read_json(filename: str, check: bool = True) -> InputFile:
         builder.set_user_ccd(data["userCCD"])
 
     return builder.build()
+
+
+def _read_one(
+    filename: str,
+    check: bool,
+    lazy: bool,
+    backend: str | None
+) -> InputFile | Exception:
+    """
+    Reads a single input file for `read_many`. Exceptions are returned
+    instead of raised, so that a single invalid file does not abort
+    reading the remaining files.
+
+    Returns
+    -------
+    InputFile or Exception
+        The parsed input file or the error that occurred while reading it.
+    """
+    try:
+        return read_json(filename, check=check, lazy=lazy, backend=backend)
+    except Exception as e:
+        return e
+
+
+def expand_paths(paths: str | Iterable[str]) -> Iterator[str]:
+    """
+    Expands a directory, a glob pattern or an iterable of paths
+    into individual file paths.
+
+    Parameters
+    ----------
+    paths : str or iterable of str
+        A directory, in which all (compressed) JSON files are selected,
+        a glob pattern or an iterable of file paths.
+
+    Returns
+    -------
+    iterator of str
+        The paths of the files that should be read.
+    """
+    if not isinstance(paths, str):
+        return iter(paths)
+    if os.path.isdir(paths):
+        return iter(sorted(
+            entry.path for entry in os.scandir(paths)
+            if entry.is_file() and _is_json_file(entry.name)
+        ))
+    return iter(sorted(glob.glob(paths, recursive=True)))
+
+
+def _is_json_file(filename: str) -> bool:
+    if get_compression(filename) is not None:
+        filename = os.path.splitext(filename)[0]
+    return filename.lower().endswith(".json")
+
+
+def read_many(
+    paths: str | Iterable[str],
+    workers: int | None = None,
+    ordered: bool = True,
+    prefetch: int | None = None,
+    executor: str = "thread",
+    check: bool = True,
+    lazy: bool = False,
+    backend: str | None = None
+) -> Generator[tuple[str, InputFile | Exception], None, None]:
+    """
+    Reads many input files concurrently using a thread or process pool.
+
+    At most `prefetch` files are submitted to the pool at the same time
+    and new files are only submitted when the previous results have been
+    consumed. Therefore, the memory usage is bounded independent of the
+    number of files, as long as the caller does not keep the results.
+    Errors are returned together with the path of the file instead of
+    being raised.
+
+    Parameters
+    ----------
+    paths : str or iterable of str
+        A directory, in which all files with the extensions `.json`,
+        `.json.gz`, `.json.bz2` or `.json.xz` are read, a glob pattern
+        (e.g. "jobs/**/*.json") or an iterable of file paths.
+    workers : int or None, optional
+        The number of worker threads or processes. If None, the default of
+        the corresponding executor of `concurrent.futures` is used.
+    ordered : bool, optional
+        If True (default), the results are yielded in the order of the input
+        paths. Otherwise, they are yielded in the order of completion.
+    prefetch : int or None, optional
+        The maximum number of files that are read ahead of the consumer.
+        If None, four times the number of workers is used.
+    executor : str, optional
+        Either "thread" (default) or "process". Threads are sufficient for
+        I/O-bound workloads, processes avoid contention on the GIL when
+        parsing many large files.
+    check : bool, optional
+        Whether to perform a data consistency check. Default is True.
+    lazy : bool, optional
+        If True, large string fields are only decoded when they are accessed
+        (see `read_json`). This only applies to the thread executor, since
+        memory-mapped values are decoded when results are transferred
+        between processes. Default is False.
+    backend : str or None, optional
+        The name of the JSON backend. If None, the default backend is used.
+
+    Yields
+    ------
+    tuple of (str, InputFile or Exception)
+        The path of the file and either the parsed input file or the
+        exception that occurred while reading it.
+
+    Raises
+    ------
+    ValueError
+        If the executor type or the prefetch window is invalid.
+    """
+    if executor == "thread":
+        pool_type = ThreadPoolExecutor
+    elif executor == "process":
+        pool_type = ProcessPoolExecutor
+        lazy = False
+    else:
+        raise ValueError(
+            f"Unknown executor '{executor}'. Use 'thread' or 'process'."
+        )
+
+    if prefetch is None:
+        prefetch = 4 * (workers or os.cpu_count() or 1)
+    if prefetch < 1:
+        raise ValueError("The prefetch window must contain at least one file.")
+
+    path_iter = expand_paths(paths)
+    with pool_type(max_workers=workers) as pool:
+        pending: dict[Future, str] = {}
+        queue: deque[Future] = deque()
+
+        def _submit() -> bool:
+            filename = next(path_iter, None)
+            if filename is None:
+                return False
+            future = pool.submit(_read_one, str(filename), check, lazy, backend)
+            pending[future] = str(filename)
+            if ordered:
+                queue.append(future)
+            return True
+
+        while len(pending) < prefetch and _submit():
+            pass
+
+        try:
+            while pending:
+                if ordered:
+                    done = [queue.popleft()]
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    filename = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # e.g. a terminated worker process
+                        result = e
+                    _submit()
+                    yield filename, result
+        finally:
+            # files that were not consumed are skipped when the caller
+            # stops iterating early
+            for future in pending:
+                future.cancel()
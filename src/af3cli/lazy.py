@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import json
+import mmap
+from typing import Any
+
+
+class LazyString(object):
+    """
+    Represents a JSON string value within a memory-mapped file that is only
+    decoded when it is accessed.
+
+    Large fields of AlphaFold3 input files, such as inline MSAs, templates or
+    user-provided CCD data, are often not modified when an existing input
+    file is read and written again. Keeping a reference to the byte range of
+    the encoded value allows copying it directly into the output file without
+    decoding and encoding the string.
+
+    Attributes
+    ----------
+    _buffer : mmap.mmap
+        The memory-mapped file containing the value.
+    _start : int
+        The offset of the first byte after the opening quote.
+    _end : int
+        The offset of the closing quote.
+    """
+    def __init__(self, buffer: mmap.mmap, start: int, end: int):
+        self._buffer: mmap.mmap = buffer
+        self._start: int = start
+        self._end: int = end
+
+    @property
+    def nbytes(self) -> int:
+        return self._end - self._start
+
+    def raw(self) -> memoryview:
+        """
+        Returns the encoded JSON string including the enclosing quotes
+        without copying the underlying data.
+
+        Returns
+        -------
+        memoryview
+            A view of the encoded string within the memory-mapped file.
+        """
+        return memoryview(self._buffer)[self._start - 1:self._end + 1]
+
+    def decode(self) -> str:
+        """
+        Decodes the JSON string from the memory-mapped file.
+
+        Returns
+        -------
+        str
+            The decoded string value.
+        """
+        return json.loads(self._buffer[self._start - 1:self._end + 1])
+
+    def __bool__(self) -> bool:
+        return self._end > self._start
+
+    def __copy__(self) -> LazyString:
+        return self
+
+    def __deepcopy__(self, memo: dict) -> LazyString:
+        # the referenced data is read-only, therefore no copy is required
+        return self
+
+    def __reduce__(self) -> tuple:
+        # memory maps cannot be pickled, the decoded string is used instead
+        return str, (self.decode(),)
+
+    def __str__(self) -> str:
+        return self.decode()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}({self.nbytes} bytes)>"
+
+
+def resolve(value: Any) -> Any:
+    """
+    Decodes the value if it is a `LazyString`, otherwise the value is
+    returned unchanged.
+
+    Parameters
+    ----------
+    value : Any
+        The value to be resolved.
+
+    Returns
+    -------
+    Any
+        The decoded string or the unchanged value.
+    """
+    if isinstance(value, LazyString):
+        return value.decode()
+    return value
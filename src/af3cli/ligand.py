@@ -38,6 +38,8 @@ class Ligand(IDRecord, DictMixin):
         either specified as a list of strings or will be automatically
         assigned by `IDRegister`.
     """
+    __slots__ = ("_ligand_value", "_ligand_type")
+
     def __init__(
         self,
         ligand_type: LigandType,
@@ -100,6 +102,8 @@ class CCDLigand(Ligand):
     """
     Represents a CCD (Chemical Component Dictionary) ligand.
     """
+    __slots__ = ()
+
     def __init__(
         self,
         ligand_value: list[str],
@@ -113,6 +117,8 @@ class SMILigand(Ligand):
     """
     Represents a ligand that uses SMILES notation to define the chemical structure.
     """
+    __slots__ = ()
+
     def __init__(
         self,
         ligand_value: str,
@@ -15,6 +15,9 @@ class DictMixin(metaclass=ABCMeta):
         Abstract method that must be implemented by subclasses.
         Converts the object into a dictionary.
     """
+    # allows subclasses to omit the instance dictionary
+    __slots__ = ()
+
     @abstractmethod
     def to_dict(self) -> dict:
         pass
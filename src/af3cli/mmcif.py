@@ -0,0 +1,479 @@
+from __future__ import annotations
+
+import mmap
+import os
+import re
+import itertools
+from contextlib import contextmanager
+from typing import Generator, Iterator
+
+from .io import get_compression, open_read
+from .exception import AFTemplateError
+
+# categories that are kept by `trim_mmcif`, e.g. the release date, the
+# resolution and the chemical components of the structure
+TEMPLATE_CATEGORIES: tuple[str, ...] = (
+    "_entry", "_exptl", "_pdbx_audit_revision_history",
+    "_pdbx_database_status", "_refine", "_reflns", "_em_3d_reconstruction",
+    "_cell", "_symmetry", "_chem_comp", "_atom_type",
+)
+# chain-specific categories and the field referencing the kept chains
+ASYM_CATEGORIES: dict[str, str] = {
+    "_struct_asym": "id",
+    "_pdbx_poly_seq_scheme": "asym_id",
+    "_pdbx_nonpoly_scheme": "asym_id",
+}
+ENTITY_CATEGORIES: dict[str, str] = {
+    "_entity": "id",
+    "_entity_poly": "entity_id",
+    "_entity_poly_seq": "entity_id",
+}
+
+# one-letter codes of the standard and common modified amino acids,
+# other residues are represented by "X"
+RESIDUE_CODES: dict[str, str] = {
+    "ALA": "A", "ARG": "R", "ASN": "N", "ASP": "D", "CYS": "C",
+    "GLN": "Q", "GLU": "E", "GLY": "G", "HIS": "H", "ILE": "I",
+    "LEU": "L", "LYS": "K", "MET": "M", "PHE": "F", "PRO": "P",
+    "SER": "S", "THR": "T", "TRP": "W", "TYR": "Y", "VAL": "V",
+    "SEC": "U", "PYL": "O", "MSE": "M", "UNK": "X",
+}
+
+# the number of bytes of the atom sites that are split into lines at once
+LINE_CHUNK_SIZE: int = 1 << 20
+
+# lines starting a data block, a loop, an item, a text field or a comment,
+# the leading line break is much faster to search for than the line start
+_MARKER_RE: re.Pattern = re.compile(rb"\n((?:loop_|data_|[_;#])[^\n]*)")
+_FIRST_MARKER_RE: re.Pattern = re.compile(rb"((?:loop_|data_|[_;#])[^\n]*)")
+# text fields, quoted and unquoted values
+_TOKEN_RE: re.Pattern = re.compile(
+    rb"^;.*?^;|'[^\n]*?'(?=\s|$)|\"[^\n]*?\"(?=\s|$)|\S+",
+    re.MULTILINE | re.DOTALL
+)
+
+
+class _Section(object):
+    """
+    The byte range of a category within an mmCIF file. The values of loops
+    start after the header with the field names.
+    """
+    __slots__ = ("name", "start", "header_end", "end", "loop", "fields")
+
+    def __init__(self, name: str | None, start: int, header_end: int,
+                 loop: bool):
+        self.name: str | None = name
+        self.start: int = start
+        self.header_end: int = header_end
+        self.end: int = header_end
+        self.loop: bool = loop
+        self.fields: list[str] = []
+
+
+@contextmanager
+def _map_file(filename: str) -> Generator[mmap.mmap | bytes, None, None]:
+    if get_compression(filename) is not None:
+        # compressed files cannot be mapped and are decompressed instead
+        with open_read(filename) as cif_file:
+            yield cif_file.read()
+        return
+
+    with open(filename, "rb") as cif_file:
+        if os.fstat(cif_file.fileno()).st_size == 0:
+            buffer = None
+        else:
+            buffer = mmap.mmap(cif_file.fileno(), 0, access=mmap.ACCESS_READ)
+    if buffer is None:
+        yield b""
+        return
+    try:
+        yield buffer
+    finally:
+        buffer.close()
+
+
+def _sections(buffer: mmap.mmap | bytes) -> tuple[bytes, list[_Section]]:
+    """
+    Locates the categories of an mmCIF file by scanning only the lines that
+    start an item, a loop or a comment. The rows of loops are skipped.
+    """
+    data_line = b""
+    sections: list[_Section] = []
+    current: _Section | None = None
+    in_text = False
+
+    size = len(buffer)
+    first = _FIRST_MARKER_RE.match(buffer)
+    for match in itertools.chain([first] if first else [],
+                                 _MARKER_RE.finditer(buffer)):
+        line = match.group(1)
+        # the range of the line including its line break
+        start, end = match.start(1), min(match.end(1) + 1, size)
+        if line.startswith(b";"):
+            in_text = not in_text
+            continue
+        if in_text:
+            continue
+
+        if line.startswith(b"_"):
+            category, _, field = line.split(None, 1)[0].partition(b".")
+            if (current is not None and current.loop
+                    and current.header_end == start):
+                current.name = current.name or category.decode()
+                current.fields.append(field.decode())
+                current.header_end = current.end = end
+                continue
+            if (current is not None and not current.loop
+                    and current.name == category.decode()):
+                continue
+            if current is not None:
+                current.end = start
+            current = _Section(category.decode(), start, start, False)
+            sections.append(current)
+            continue
+
+        if current is not None:
+            current.end = start
+        current = None
+        if line.startswith(b"loop_"):
+            current = _Section(None, start, end, True)
+            sections.append(current)
+        elif line.startswith(b"data_") and not data_line:
+            data_line = bytes(line).rstrip() + b"\n"
+
+    if current is not None:
+        current.end = size
+    return data_line, [section for section in sections
+                       if section.name is not None]
+
+
+def _value(token: bytes) -> bytes:
+    if token[:1] in (b"'", b'"'):
+        return token[1:-1]
+    if token[:1] == b";":
+        return token[1:-1].strip()
+    return token
+
+
+def _loop_rows(
+    buffer: mmap.mmap | bytes,
+    section: _Section
+) -> Iterator[tuple[list[bytes], int, int]]:
+    """
+    Yields the values and the byte range of each row of a loop.
+    """
+    num_fields = len(section.fields)
+    tokens = []
+    for match in _TOKEN_RE.finditer(buffer, section.header_end, section.end):
+        tokens.append(match)
+        if len(tokens) == num_fields:
+            yield ([_value(token.group()) for token in tokens],
+                   tokens[0].start(), tokens[-1].end())
+            tokens = []
+
+
+def _lines(
+    buffer: mmap.mmap | bytes,
+    section: _Section
+) -> Iterator[bytes]:
+    """
+    Yields the non-empty lines of the values of a loop. The lines are split
+    in chunks, which is much faster than searching each line break.
+    """
+    pos = section.header_end
+    while pos < section.end:
+        chunk_end = min(pos + LINE_CHUNK_SIZE, section.end)
+        if chunk_end < section.end:
+            line_end = buffer.rfind(b"\n", pos, chunk_end)
+            if line_end == -1:
+                line_end = buffer.find(b"\n", chunk_end, section.end)
+            if line_end != -1:
+                chunk_end = line_end
+        for line in buffer[pos:chunk_end].splitlines():
+            if line.strip():
+                yield line.rstrip()
+        pos = chunk_end + 1
+
+
+def _split_row(line: bytes, section: _Section) -> list[bytes]:
+    """
+    Splits a row of a loop, whose values are written on a single line
+    like the atom sites, into its values.
+    """
+    if b"'" in line or b'"' in line:
+        values = [_value(token) for token in _TOKEN_RE.findall(line)]
+    else:
+        values = line.split()
+    if len(values) != len(section.fields):
+        raise AFTemplateError(
+            f"Rows of '{section.name}' spanning multiple lines "
+            f"are not supported."
+        )
+    return values
+
+
+def _filter_section(
+    buffer: mmap.mmap | bytes,
+    section: _Section,
+    key: str,
+    ids: set[bytes]
+) -> list[bytes]:
+    """
+    Returns the parts of a category whose key field references the given
+    IDs or an empty list if no row references them.
+    """
+    if not section.loop:
+        tokens = _TOKEN_RE.findall(buffer, section.start, section.end)
+        items = dict(zip(tokens[::2], tokens[1::2]))
+        value = items.get(f"{section.name}.{key}".encode())
+        if value is None or _value(value) not in ids:
+            return []
+        return [buffer[section.start:section.end]]
+
+    if key not in section.fields:
+        return []
+    column = section.fields.index(key)
+    rows = [buffer[start:end] + b"\n"
+            for values, start, end in _loop_rows(buffer, section)
+            if values[column] in ids]
+    if not rows:
+        return []
+    return [buffer[section.start:section.header_end], *rows]
+
+
+def _column(section: _Section, field: str) -> int | None:
+    if field not in section.fields:
+        return None
+    return section.fields.index(field)
+
+
+def _atom_site(sections: list[_Section]) -> _Section:
+    atom_site = next((section for section in sections
+                      if section.name == "_atom_site" and section.loop), None)
+    if atom_site is None:
+        raise AFTemplateError("The mmCIF file contains no atom sites.")
+    return atom_site
+
+
+def _chain_atoms(
+    buffer: mmap.mmap | bytes,
+    atom_site: _Section,
+    chain: str | None
+) -> Iterator[tuple[list[bytes], bytes]]:
+    """
+    Yields the values and the line of the atom sites of the first model of
+    a chain. If no chain is given, the chain of the first atom is used.
+    """
+    chain_column = _column(atom_site, "auth_asym_id")
+    if chain_column is None:
+        chain_column = _column(atom_site, "label_asym_id")
+    if chain_column is None:
+        raise AFTemplateError("The atom sites contain no chain IDs.")
+    model_column = _column(atom_site, "pdbx_PDB_model_num")
+
+    chain_id = chain.encode() if chain is not None else None
+    model = None
+    for line in _lines(buffer, atom_site):
+        # the lines of other chains are rejected before splitting all values
+        if chain_id is not None and b"'" not in line and b'"' not in line:
+            values = line.split(None, chain_column + 1)
+            if len(values) > chain_column and values[chain_column] != chain_id:
+                continue
+        values = _split_row(line, atom_site)
+        if chain_id is None:
+            chain_id = values[chain_column]
+        elif values[chain_column] != chain_id:
+            continue
+        # only the first model of NMR structures is kept
+        if model_column is not None:
+            if model is None:
+                model = values[model_column]
+            elif values[model_column] != model:
+                continue
+        yield values, line
+
+
+def _trim(
+    buffer: mmap.mmap | bytes,
+    chain: str,
+    categories: tuple[str, ...]
+) -> str:
+    data_line, sections = _sections(buffer)
+    atom_site = _atom_site(sections)
+    asym_column = _column(atom_site, "label_asym_id")
+    entity_column = _column(atom_site, "label_entity_id")
+
+    asym_ids: set[bytes] = set()
+    entity_ids: set[bytes] = set()
+    rows: list[bytes] = []
+    for values, line in _chain_atoms(buffer, atom_site, chain):
+        if asym_column is not None:
+            asym_ids.add(values[asym_column])
+        if entity_column is not None:
+            entity_ids.add(values[entity_column])
+        rows.append(line + b"\n")
+    if not rows:
+        raise AFTemplateError(f"Chain '{chain}' not found in the mmCIF file.")
+
+    parts = [data_line or b"data_template\n", b"#\n"]
+    for section in sections:
+        if section is atom_site:
+            section_parts = [buffer[section.start:section.header_end], *rows]
+        elif section.name in ASYM_CATEGORIES:
+            section_parts = _filter_section(
+                buffer, section, ASYM_CATEGORIES[section.name], asym_ids
+            )
+        elif section.name in ENTITY_CATEGORIES:
+            section_parts = _filter_section(
+                buffer, section, ENTITY_CATEGORIES[section.name], entity_ids
+            )
+        elif section.name in categories:
+            section_parts = [buffer[section.start:section.end]]
+        else:
+            continue
+        if not section_parts:
+            continue
+        if not section_parts[-1].endswith(b"\n"):
+            section_parts.append(b"\n")
+        parts.extend(section_parts)
+        parts.append(b"#\n")
+    return b"".join(parts).decode()
+
+
+def trim_mmcif(
+    filename: str,
+    chain: str,
+    categories: tuple[str, ...] = TEMPLATE_CATEGORIES
+) -> str:
+    """
+    Extracts a single chain from an mmCIF file to be embedded as template.
+
+    The file is memory-mapped and only the lines starting a category are
+    scanned, so that the atom sites of other chains and all other
+    categories are never decoded. The atom sites of the first model of the
+    chain are kept together with the entity and asym categories of the
+    chain and the given header categories.
+
+    Parameters
+    ----------
+    filename : str
+        The path to the (compressed) mmCIF file.
+    chain : str
+        The author chain ID, or the label chain ID if the file contains
+        no author chain IDs.
+    categories : tuple of str, optional
+        The categories that are kept unchanged.
+        Default is `TEMPLATE_CATEGORIES`.
+
+    Returns
+    -------
+    str
+        The mmCIF data of the chain.
+
+    Raises
+    ------
+    AFTemplateError
+        If the file contains no atom sites or the chain is not found.
+    """
+    with _map_file(filename) as buffer:
+        return _trim(buffer, chain, categories)
+
+
+def _residues(
+    buffer: mmap.mmap | bytes,
+    section: _Section,
+    key: str,
+    ids: set[bytes],
+    number: str,
+    residue: str
+) -> list[bytes]:
+    """
+    Returns the residue names of a polymer category in the order of their
+    numbers. Only the first residue of each number is used for residues
+    with alternative conformations or microheterogeneity.
+    """
+    if not section.loop or not {key, number, residue} <= set(section.fields):
+        return []
+    key_column = section.fields.index(key)
+    number_column = section.fields.index(number)
+    residue_column = section.fields.index(residue)
+    residues: dict[bytes, bytes] = {}
+    for values, _, _ in _loop_rows(buffer, section):
+        if values[key_column] in ids:
+            residues.setdefault(values[number_column], values[residue_column])
+    return list(residues.values())
+
+
+def _sequence(buffer: mmap.mmap | bytes, chain: str | None) -> str:
+    _, sections = _sections(buffer)
+    atom_site = _atom_site(sections)
+    asym_column = _column(atom_site, "label_asym_id")
+    entity_column = _column(atom_site, "label_entity_id")
+    seq_column = _column(atom_site, "label_seq_id")
+    comp_column = _column(atom_site, "label_comp_id")
+
+    asym_ids: set[bytes] = set()
+    entity_ids: set[bytes] = set()
+    # the resolved residues are used if no polymer category is found
+    atom_residues: dict[bytes, bytes] = {}
+    for values, _ in _chain_atoms(buffer, atom_site, chain):
+        if asym_column is not None:
+            asym_ids.add(values[asym_column])
+        if entity_column is not None:
+            entity_ids.add(values[entity_column])
+        if (seq_column is not None and comp_column is not None
+                and values[seq_column] not in (b".", b"?")):
+            atom_residues.setdefault(values[seq_column], values[comp_column])
+    if not asym_ids and not entity_ids and not atom_residues:
+        raise AFTemplateError(f"Chain '{chain}' not found in the mmCIF file.")
+
+    residues = []
+    for section in sections:
+        if section.name == "_pdbx_poly_seq_scheme":
+            residues = _residues(buffer, section, "asym_id", asym_ids,
+                                 "seq_id", "mon_id")
+        elif section.name == "_entity_poly_seq" and not residues:
+            residues = _residues(buffer, section, "entity_id", entity_ids,
+                                 "num", "mon_id")
+    if not residues:
+        residues = list(atom_residues.values())
+    return "".join(RESIDUE_CODES.get(name.decode(), "X") for name in residues)
+
+
+def mmcif_sequence(
+    mmcif: str,
+    is_path: bool = False,
+    chain: str | None = None
+) -> str:
+    """
+    Reads the sequence of a protein chain from an mmCIF file or string.
+
+    The sequence contains all residues of the polymer, including residues
+    without resolved atoms, as given by the `_pdbx_poly_seq_scheme` or the
+    `_entity_poly_seq` category. Otherwise, the resolved residues of the
+    atom sites are used. Non-standard residues are represented by "X".
+
+    Parameters
+    ----------
+    mmcif : str
+        The mmCIF data or the path to the (compressed) mmCIF file.
+    is_path : bool, optional
+        If True, `mmcif` is treated as a file path. Default is False.
+    chain : str or None, optional
+        The author chain ID, or the label chain ID if the file contains no
+        author chain IDs. By default, the chain of the first atom is used.
+
+    Returns
+    -------
+    str
+        The one-letter sequence of the chain.
+
+    Raises
+    ------
+    AFTemplateError
+        If the file contains no atom sites or the chain is not found.
+    """
+    if not is_path:
+        return _sequence(mmcif.encode(), chain)
+    with _map_file(mmcif) as buffer:
+        return _sequence(buffer, chain)
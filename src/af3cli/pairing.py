@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import re
+
+from .input import InputFile
+from .sequence import ProteinSequence
+from .sequence import parse_a3m, A3M_INSERTION_CHARS
+from .lazy import LazyString
+from .exception import AFMSAError
+
+# species identifiers of UniProt entry names, e.g. "tr|A0A0A0|A0A0A0_HUMAN",
+# which are also used by the MSA pairing of AlphaFold
+_UNIPROT_SPECIES_RE: re.Pattern = re.compile(
+    r"^(?:tr|sp)\|[A-Za-z0-9]{6,10}(?:_\d+)?\|[A-Za-z0-9]+_([A-Za-z0-9]{1,5})"
+)
+# taxonomy identifiers of UniProt ("OX=9606") and UniRef ("TaxID=9606")
+_TAXONOMY_RE: re.Pattern = re.compile(r"\b(?:OX|TaxID)=(\d+)")
+
+_INSERTION_TABLE: dict[int, None] = str.maketrans("", "", A3M_INSERTION_CHARS)
+# description of the gap rows of chains without a row of the species
+GAP_DESCRIPTION: str = "gap"
+
+
+def species_key(description: str) -> str | None:
+    """
+    Extracts the species of an MSA row from its A3M header. The taxonomy
+    identifier ("OX=9606" or "TaxID=9606") is preferred, so that rows of
+    UniProt and UniRef databases share their keys. The species identifier
+    of UniProt entry names (e.g. "sp|P69905|HBA_HUMAN") is only used for
+    headers without a taxonomy identifier.
+
+    Parameters
+    ----------
+    description : str
+        The header of the row without the leading ">".
+
+    Returns
+    -------
+    str or None
+        The species key or None if the header contains no species.
+    """
+    match = _TAXONOMY_RE.search(description)
+    if match is None:
+        match = _UNIPROT_SPECIES_RE.match(description)
+    if match is None:
+        return None
+    return match.group(1)
+
+
+def _species_table(
+    content: str | LazyString,
+    is_path: bool
+) -> tuple[tuple[str, str], dict[str, list[tuple[int, str, str]]]]:
+    """
+    Reads the query and groups the remaining rows of an MSA by species.
+    The rows of each species keep their order, i.e. their rank.
+    """
+    rows = parse_a3m(content, is_path)
+    query = next(rows, None)
+    if query is None:
+        raise AFMSAError("The unpaired MSA is empty.")
+
+    table: dict[str, list[tuple[int, str, str]]] = {}
+    for index, (description, row) in enumerate(rows):
+        key = species_key(description)
+        if key is not None:
+            table.setdefault(key, []).append((index, description, row))
+    return query, table
+
+
+def _pair_rows(
+    contents: list[str | LazyString],
+    is_path: list[bool] | bool,
+    min_chains: int | None,
+    max_rows: int | None
+) -> list[list[tuple[str, str]]]:
+    num_chains = len(contents)
+    if isinstance(is_path, bool):
+        is_path = [is_path] * num_chains
+    if min_chains is None:
+        min_chains = num_chains
+    if num_chains < 2:
+        raise ValueError("Pairing requires the MSAs of at least two chains.")
+    if not 2 <= min_chains <= num_chains:
+        raise ValueError(f"The minimum number of chains must lie between "
+                         f"2 and {num_chains}.")
+    if max_rows is not None and max_rows < 1:
+        raise ValueError("The MSA must contain at least the query row.")
+
+    queries, tables = zip(*(
+        _species_table(content, path)
+        for content, path in zip(contents, is_path)
+    ))
+    gaps = ["-" * len(row.translate(_INSERTION_TABLE)) for _, row in queries]
+
+    # the best rank of each species in any chain
+    ranks: dict[str, int] = {}
+    for table in tables:
+        for key, rows in table.items():
+            index = rows[0][0]
+            if index < ranks.get(key, index + 1):
+                ranks[key] = index
+
+    paired: list[list[tuple[str, str]]] = [[query] for query in queries]
+    depth = 1
+    for key in sorted(ranks, key=ranks.__getitem__):
+        if max_rows is not None and depth >= max_rows:
+            break
+        species_rows = [table.get(key) for table in tables]
+        present = [rows for rows in species_rows if rows is not None]
+        if len(present) < min_chains:
+            continue
+        num_rows = min(len(rows) for rows in present)
+        if max_rows is not None:
+            num_rows = min(num_rows, max_rows - depth)
+        for chain, rows in enumerate(species_rows):
+            if rows is None:
+                paired[chain].extend(
+                    [(GAP_DESCRIPTION, gaps[chain])] * num_rows
+                )
+            else:
+                paired[chain].extend(
+                    (description, row)
+                    for _, description, row in rows[:num_rows]
+                )
+        depth += num_rows
+    return paired
+
+
+def pair_a3m(
+    contents: list[str | LazyString],
+    is_path: list[bool] | bool = False,
+    min_chains: int | None = None,
+    max_rows: int | None = None
+) -> list[str]:
+    """
+    Builds the paired MSAs of the chains of a heteromer from their unpaired
+    MSAs in A3M format.
+
+    The rows of each MSA are grouped by their species (see `species_key`)
+    in a single pass, before the groups of all chains are joined by the
+    species. The i-th rows of a species in all chains form a paired row,
+    therefore the number of paired rows per species is limited by the
+    chain with the fewest rows of that species. Chains without a row of
+    a species are filled with gap rows if the species is found in at least
+    `min_chains` chains. The species are sorted by their best rank in any
+    chain, so that the most similar sequences come first.
+
+    Parameters
+    ----------
+    contents : list of str or LazyString
+        The inline A3M data or the paths to the A3M files of the chains.
+    is_path : list of bool or bool, optional
+        If True, the respective content is treated as a file path.
+        Default is False.
+    min_chains : int or None, optional
+        The minimum number of chains with rows of a species. By default,
+        only species found in all chains are paired.
+    max_rows : int or None, optional
+        The maximum number of rows of the paired MSAs, including the query.
+
+    Returns
+    -------
+    list of str
+        The paired MSAs in the order of the chains, each starting with
+        the query of the unpaired MSA.
+
+    Raises
+    ------
+    ValueError
+        If fewer than two MSAs are given or `min_chains` or `max_rows`
+        is out of range.
+    AFMSAError
+        If an unpaired MSA is empty.
+    """
+    paired = _pair_rows(contents, is_path, min_chains, max_rows)
+    return ["".join(f">{description}\n{row}\n" for description, row in rows)
+            for rows in paired]
+
+
+def pair_msas(
+    input_file: InputFile,
+    min_chains: int | None = None,
+    max_rows: int | None = None
+) -> int:
+    """
+    Builds the paired MSAs of all protein chains of an input file with an
+    unpaired MSA (see `pair_a3m`). The existing paired MSAs of these chains
+    are replaced by the inline paired MSAs.
+
+    Parameters
+    ----------
+    input_file : InputFile
+        The input file whose sequences should be modified.
+    min_chains : int or None, optional
+        The minimum number of chains with rows of a species. By default,
+        only species found in all chains are paired.
+    max_rows : int or None, optional
+        The maximum number of rows of the paired MSAs, including the query.
+
+    Returns
+    -------
+    int
+        The number of paired rows, excluding the query, or 0 if fewer
+        than two chains have an unpaired MSA.
+    """
+    msas = [
+        sequence.msa for sequence in input_file.sequences
+        if isinstance(sequence, ProteinSequence)
+        and sequence.msa is not None and sequence.msa.unpaired is not None
+    ]
+    if len(msas) < 2:
+        return 0
+
+    paired = _pair_rows(
+        [msa.unpaired for msa in msas],
+        [msa.unpaired_is_path for msa in msas],
+        min_chains, max_rows
+    )
+    for msa, rows in zip(msas, paired):
+        msa.paired = "".join(f">{description}\n{row}\n"
+                             for description, row in rows)
+        msa.paired_is_path = False
+    return len(paired[0]) - 1
@@ -52,6 +52,8 @@ class IDRecord(object):
         The number of ligand sequences, default is 1. This value
         will be overwritten if `seq_id` is larger.
     """
+    __slots__ = ("_seq_id", "_tmp_seq_id", "_num")
+
     def __init__(self, num: int = 1, seq_id: list[str] | None = None):
         self._seq_id: list[str] | None = seq_id
         self._tmp_seq_id: list[str] = []
@@ -2,13 +2,22 @@ from __future__ import annotations
 
 from enum import StrEnum
 from abc import ABCMeta
-from typing import Generator
+from contextlib import nullcontext
+from functools import lru_cache
+from itertools import islice
+from operator import eq
+from typing import IO, ContextManager, Generator, Iterable, Iterator
+import gzip
+import io
+import os
+import random
 import re
 
 from .mixin import DictMixin
 from .exception import (AFSequenceError, AFTemplateError,
-                        AFModificationError)
+                        AFModificationError, AFMSAError)
 from .seqid import IDRecord
+from .lazy import LazyString, resolve
 
 
 class SequenceType(StrEnum):
@@ -23,6 +32,94 @@ class SequenceType(StrEnum):
     DNA: str = "dna"
 
 
+# valid residue characters of each sequence type
+SEQ_ALPHABETS: dict[SequenceType, str] = {
+    SequenceType.PROTEIN: "ACDEFGHIKLMNPQRSTVWY",
+    SequenceType.DNA: "ACGT",
+    SequenceType.RNA: "ACGU"
+}
+# compiled once, used by `find_invalid_residue`
+_SEQ_DELETE_TABLES: dict[SequenceType, bytes] = {
+    seq_type: alphabet.encode("ascii")
+    for seq_type, alphabet in SEQ_ALPHABETS.items()
+}
+_SEQ_INVALID_PATTERNS: dict[SequenceType, re.Pattern] = {
+    seq_type: re.compile(f"[^{alphabet}]")
+    for seq_type, alphabet in SEQ_ALPHABETS.items()
+}
+# number of validated sequences cached per process, see `_cached_invalid_residue`
+VALIDATION_CACHE_SIZE: int = 4096
+# used by `classify_sequence`, each residue is translated to a byte that
+# represents the alphabets containing it, residues of all alphabets are removed
+CLASSIFY_CHUNKSIZE: int = 1 << 20
+_RESIDUE_CLASS_COMMON: bytes = b"ACG"
+_RESIDUE_CLASS_EXCLUDES: dict[bytes, tuple[SequenceType, ...]] = {
+    b"T": (SequenceType.RNA,),
+    b"U": (SequenceType.DNA, SequenceType.PROTEIN),
+    b"P": (SequenceType.DNA, SequenceType.RNA),
+    b"X": (SequenceType.DNA, SequenceType.RNA, SequenceType.PROTEIN),
+}
+
+
+def _residue_class_table() -> bytes:
+    table = bytearray(b"X" * 256)
+    for char in SEQ_ALPHABETS[SequenceType.PROTEIN]:
+        table[ord(char)] = ord("P")
+    table[ord("T")] = ord("T")
+    table[ord("U")] = ord("U")
+    return bytes(table)
+
+
+_RESIDUE_CLASS_TABLE: bytes = _residue_class_table()
+_INVALID_RESIDUE_PATTERN: re.Pattern = re.compile(
+    f"[^{''.join(sorted(set(''.join(SEQ_ALPHABETS.values()))))}]"
+)
+
+
+# used by `reverse_complement`, pairs of bases and IUPAC ambiguity codes
+# with their complements
+COMPLEMENT_BASES: dict[SequenceType, tuple[str, str]] = {
+    SequenceType.DNA: ("ACGT", "TGCA"),
+    SequenceType.RNA: ("ACGU", "UGCA"),
+}
+IUPAC_AMBIGUITY_CODES: tuple[str, str] = ("RYSWKMBDHVN", "YRSWMKVHDBN")
+
+
+def _complement_tables() -> dict[tuple[SequenceType, bool], tuple]:
+    tables = dict()
+    for seq_type, (bases, complements) in COMPLEMENT_BASES.items():
+        for iupac in (False, True):
+            if iupac:
+                chars = bases + IUPAC_AMBIGUITY_CODES[0]
+                targets = complements + IUPAC_AMBIGUITY_CODES[1]
+            else:
+                chars, targets = bases, complements
+            tables[(seq_type, iupac)] = (
+                bytes.maketrans(chars.encode("ascii"),
+                                targets.encode("ascii")),
+                chars.encode("ascii"),
+                re.compile(f"[^{chars}]")
+            )
+    return tables
+
+
+_COMPLEMENT_TABLES: dict[tuple[SequenceType, bool], tuple] = _complement_tables()
+
+
+# used by `parse_fasta`
+FASTA_CHUNKSIZE: int = 1 << 20
+FASTA_HEADER_START: int = ord(">")
+FASTA_WHITESPACE: bytes = b" \t\r\n\v\f"
+GZIP_MAGIC: bytes = b"\x1f\x8b"
+FASTA_INDEX_EXTENSION: str = ".fai"
+# lower-case residues and dots are insertions relative to the query in A3M rows
+A3M_INSERTION_CHARS: str = "abcdefghijklmnopqrstuvwxyz."
+_A3M_INSERTION_TABLE: dict[int, None] = str.maketrans("", "", A3M_INSERTION_CHARS)
+# used by `cap_a3m`
+MSA_CAP_STRATEGIES: tuple[str, ...] = ("top", "identity", "random")
+DEFAULT_MAX_IDENTITY: float = 0.9
+
+
 class TemplateType(StrEnum):
     """
     Represents both types of templates that can be used for
@@ -59,6 +156,8 @@ class Template(DictMixin):
         List of template indices that map to the positions in the template
         structure.
     """
+    __slots__ = ("template_type", "_mmcif", "qidx", "tidx")
+
     def __init__(
         self,
         template_type: TemplateType,
@@ -67,10 +166,19 @@ class Template(DictMixin):
         tidx: list[int]
     ):
         self.template_type: TemplateType = template_type
-        self.mmcif: str = mmcif
+        self._mmcif: str | LazyString = mmcif
         self.qidx: list[int] = qidx
         self.tidx: list[int] = tidx
 
+    @property
+    def mmcif(self) -> str:
+        self._mmcif = resolve(self._mmcif)
+        return self._mmcif
+
+    @mmcif.setter
+    def mmcif(self, mmcif: str) -> None:
+        self._mmcif = mmcif
+
     def to_dict(self):
         """
         Converts the attributes of the object into a dictionary representation
@@ -85,7 +193,7 @@ class Template(DictMixin):
             conditions of the attributes.
         """
         return {
-            self.template_type.value: self.mmcif,
+            self.template_type.value: self._mmcif,
             "queryIndices": self.qidx,
             "templateIndices": self.tidx
        }
@@ -114,6 +222,8 @@ class MSA(DictMixin):
     unpaired_is_path : bool
         Indicates whether `unpaired` represents a file path.
     """
+    __slots__ = ("_paired", "_unpaired", "paired_is_path", "unpaired_is_path")
+
     def __init__(
         self,
         paired: str | None = None,
@@ -121,11 +231,114 @@ class MSA(DictMixin):
         paired_is_path: bool = False,
         unpaired_is_path: bool = False,
     ):
-        self.paired: str | None = paired
-        self.unpaired: str | None = unpaired
+        self._paired: str | LazyString | None = paired
+        self._unpaired: str | LazyString | None = unpaired
         self.paired_is_path: bool = paired_is_path
         self.unpaired_is_path: bool = unpaired_is_path
 
+    @property
+    def paired(self) -> str | None:
+        self._paired = resolve(self._paired)
+        return self._paired
+
+    @paired.setter
+    def paired(self, paired: str | None) -> None:
+        self._paired = paired
+
+    @property
+    def unpaired(self) -> str | None:
+        self._unpaired = resolve(self._unpaired)
+        return self._unpaired
+
+    @unpaired.setter
+    def unpaired(self, unpaired: str | None) -> None:
+        self._unpaired = unpaired
+
+    def check(self, query: str | None = None) -> dict[str, A3MStats]:
+        """
+        Streams the paired and unpaired MSA and checks their consistency
+        (see `a3m_stats`).
+
+        Parameters
+        ----------
+        query : str or None, optional
+            The sequence of the entity the MSA belongs to, which must
+            match the first row of each MSA.
+
+        Returns
+        -------
+        dict of str to A3MStats
+            The statistics of the MSAs with the keys "paired" and
+            "unpaired", if the respective MSA is present.
+
+        Raises
+        ------
+        AFMSAError
+            If an MSA is inconsistent.
+        OSError
+            If an MSA file cannot be read.
+        """
+        stats = dict()
+        for key, content, is_path in (
+                ("paired", self._paired, self.paired_is_path),
+                ("unpaired", self._unpaired, self.unpaired_is_path)):
+            if content is None:
+                continue
+            try:
+                stats[key] = a3m_stats(content, is_path, query)
+            except AFMSAError as e:
+                raise AFMSAError(f"Invalid {key} MSA: {e}") from e
+        return stats
+
+    def cap(
+        self,
+        max_rows: int,
+        strategy: str = "top",
+        seed: int | None = None,
+        min_identity: float = 0.0,
+        max_identity: float = DEFAULT_MAX_IDENTITY,
+        paired_output: str | None = None,
+        unpaired_output: str | None = None
+    ) -> None:
+        """
+        Reduces the paired and unpaired MSA to at most `max_rows` rows
+        (see `cap_a3m`). The reduced MSAs replace the current MSAs, either
+        inline or as path of the written file.
+
+        Parameters
+        ----------
+        max_rows : int
+            The maximum number of rows of each MSA, including the query.
+        strategy : str, optional
+            The selection strategy ("top", "identity" or "random").
+        seed : int or None, optional
+            The seed of the random strategy.
+        min_identity : float, optional
+            The minimum sequence identity to the query of the identity
+            strategy.
+        max_identity : float, optional
+            The maximum sequence identity to the query of the identity
+            strategy.
+        paired_output : str or None, optional
+            The path where the reduced paired MSA is written. If None,
+            the reduced MSA is stored inline.
+        unpaired_output : str or None, optional
+            The path where the reduced unpaired MSA is written. If None,
+            the reduced MSA is stored inline.
+        """
+        options = dict(strategy=strategy, seed=seed,
+                       min_identity=min_identity, max_identity=max_identity)
+        if self._paired is not None:
+            self._paired = cap_a3m(self._paired, max_rows,
+                                   is_path=self.paired_is_path,
+                                   output=paired_output, **options)
+            self.paired_is_path = paired_output is not None
+        if self._unpaired is not None:
+            self._unpaired = cap_a3m(self._unpaired, max_rows,
+                                     is_path=self.unpaired_is_path,
+                                     output=unpaired_output, **options)
+            self.unpaired_is_path = unpaired_output is not None
+
     def to_dict(self) -> dict:
         """
         Converts the attributes of the object into a dictionary representation
@@ -140,21 +353,21 @@ class MSA(DictMixin):
             conditions of the attributes.
         """
         tmp_dict = {}
-        if self.paired is not None:
+        if self._paired is not None:
             if self.paired_is_path:
-                tmp_dict["pairedMsaPath"] = self.paired
+                tmp_dict["pairedMsaPath"] = self._paired
             else:
-                tmp_dict["pairedMsa"] = self.unpaired
-        if self.unpaired is not None:
+                tmp_dict["pairedMsa"] = self._paired
+        if self._unpaired is not None:
             if self.unpaired_is_path:
-                tmp_dict["unpairedMsaPath"] = self.unpaired
+                tmp_dict["unpairedMsaPath"] = self._unpaired
             else:
-                tmp_dict["unpairedMsa"] = self.unpaired
+                tmp_dict["unpairedMsa"] = self._unpaired
         return tmp_dict
 
     def __str__(self) -> str:
-        display_paired = "paired" if self.paired is not None else ""
-        display_unpaired = "unpaired" if self.unpaired is not None else ""
+        display_paired = "paired" if self._paired is not None else ""
+        display_unpaired = "unpaired" if self._unpaired is not None else ""
         return f"MSA({display_paired}, {display_unpaired})"
 
     def __repr__(self) -> str:
@@ -172,6 +385,8 @@ class Modification(DictMixin, metaclass=ABCMeta):
     mod_pos : int
         The position of the modification within its given context.
     """
+    __slots__ = ("mod_str", "mod_pos")
+
     def __init__(self, mod_str: str, mod_pos: int):
         self.mod_str: str = mod_str
         self.mod_pos: int = mod_pos
@@ -191,6 +406,8 @@ class ResidueModification(Modification):
         An integer representing the position of the modification
         within the sequence.
     """
+    __slots__ = ()
+
     def __init__(self, mod_str: str, mod_pos: int):
         super().__init__(mod_str, mod_pos)
 
@@ -219,6 +436,8 @@ class NucleotideModification(Modification):
     mod_pos : int
         Position of the modification in the nucleotide sequence.
     """
+    __slots__ = ()
+
     def __init__(self, mod_str: str, mod_pos: int):
         super().__init__(mod_str, mod_pos)
 
@@ -264,6 +483,9 @@ class Sequence(IDRecord, DictMixin):
         either specified as a list of strings or will be automatically
         assigned by `IDRegister`.
     """
+    __slots__ = ("_seq_str", "_seq_type", "seq_name", "_msa",
+                 "_modifications", "_templates", "_validated")
+
     def __init__(
         self,
         seq_type: SequenceType,
@@ -294,6 +516,8 @@ class Sequence(IDRecord, DictMixin):
         if templates is None:
             templates = []
         self._templates: list[Template] = templates
+        # the validated state, the checks are repeated when it changes
+        self._validated: tuple | None = None
 
         # this will overwrite the sequence count if the length
         # is larger than the specified number
@@ -311,6 +535,10 @@ class Sequence(IDRecord, DictMixin):
     def msa(self) -> MSA | None:
         return self._msa
 
+    @msa.setter
+    def msa(self, msa: MSA | None) -> None:
+        self._msa = msa
+
     @property
     def modifications(self) -> list[Modification]:
         return self._modifications
@@ -338,6 +566,56 @@ class Sequence(IDRecord, DictMixin):
                 for mod in self._modifications
             )
 
+    def check_msa(self) -> dict[str, A3MStats]:
+        """
+        Checks that the first row of the paired and unpaired MSA matches
+        the sequence and that the MSAs are not truncated (see `MSA.check`).
+
+        Returns
+        -------
+        dict of str to A3MStats
+            The statistics of the MSAs with the keys "paired" and
+            "unpaired", or an empty dictionary without MSA.
+        """
+        if self._msa is None:
+            return dict()
+        return self._msa.check(self._seq_str)
+
+    def _validate(self) -> None:
+        """
+        Validates the sequence string and the modification types.
+
+        The result is cached for the current sequence string and list of
+        modifications, so that repeated conversions of the same object are
+        not validated again. Additionally, the validation of sequence
+        strings is shared by all objects with the same sequence.
+
+        Raises
+        ------
+        AFSequenceError
+            If the sequence is invalid for the sequence type.
+        AFModificationError
+            If the modifications are invalid for the sequence type.
+        """
+        state = (self._seq_type, self._seq_str, tuple(self._modifications))
+        if state == self._validated:
+            return
+
+        invalid_residue = _cached_invalid_residue(self._seq_type, self._seq_str)
+        if invalid_residue is not None:
+            position, residue = invalid_residue
+            raise AFSequenceError(
+                f"Invalid sequence for sequence type "
+                f"{self._seq_type.name} ({self}): "
+                f"'{residue}' at position {position + 1}."
+            )
+
+        if not self._validate_modification_types():
+            raise AFModificationError(
+                f"Invalid modification types for sequence {self}."
+            )
+        self._validated = state
+
     def to_dict(self) -> dict:
         """
          Convert the object to a dictionary representation.
@@ -359,16 +637,7 @@ class Sequence(IDRecord, DictMixin):
          AFModificationError
              If the modifications are invalid for the sequence type.
          """
-        if not is_valid_sequence(self._seq_type, self._seq_str):
-            raise AFSequenceError(
-                f"Invalid sequence for sequence type "
-                f"{self._seq_type.name} ({self})."
-            )
-
-        if not self._validate_modification_types():
-            raise AFModificationError(
-                f"Invalid modification types for sequence {self}."
-            )
+        self._validate()
 
         content = dict()
         content["id"] = self.get_full_id_list()
@@ -397,6 +666,8 @@ class ProteinSequence(Sequence):
     Represents a protein sequence, inheriting properties and functionality
     from the `Sequence` base class.
     """
+    __slots__ = ()
+
     def __init__(
         self,
         seq_str: str,
@@ -434,6 +705,8 @@ class DNASequence(Sequence):
     Represents a DNA sequence, inheriting properties and functionality
     from the `Sequence` base class.
     """
+    __slots__ = ()
+
     def __init__(
         self,
         seq_str: str,
@@ -451,10 +724,15 @@ class DNASequence(Sequence):
             modifications=modifications,
         )
 
-    def reverse_complement(self) -> DNASequence:
+    def reverse_complement(self, iupac: bool = False) -> DNASequence:
         """
             Generates the reverse complement of the DNA sequence.
 
+            Parameters
+            ----------
+            iupac : bool, optional
+                If True, IUPAC ambiguity codes are complemented as well.
+
             Returns
             -------
             DNASequence
@@ -462,16 +740,9 @@ class DNASequence(Sequence):
                 of this sequence with the same sequence name and number of
                 entities.
         """
-        cmap = {
-            'A': 'T',
-            'T': 'A',
-            'C': 'G',
-            'G': 'C'
-        }
-        complement = ''.join(cmap[base] for base in self._seq_str)
-        complement = complement[::-1]
         return DNASequence(
-            complement, num=self._num, seq_name=self.seq_name,
+            reverse_complement(self._seq_str, SequenceType.DNA, iupac),
+            num=self._num, seq_name=self.seq_name,
         )
 
 
@@ -480,6 +751,8 @@ class RNASequence(Sequence):
     Represents a RNA sequence, inheriting properties and functionality
     from the `Sequence` base class.
     """
+    __slots__ = ()
+
     def __init__(
         self,
         seq_str: str,
@@ -499,20 +772,156 @@ class RNASequence(Sequence):
             msa=msa,
         )
 
+    def reverse_complement(self, iupac: bool = False) -> RNASequence:
+        """
+            Generates the reverse complement of the RNA sequence.
+
+            Parameters
+            ----------
+            iupac : bool, optional
+                If True, IUPAC ambiguity codes are complemented as well.
+
+            Returns
+            -------
+            RNASequence
+                A new RNASequence instance representing the reverse complement
+                of this sequence with the same sequence name and number of
+                entities.
+        """
+        return RNASequence(
+            reverse_complement(self._seq_str, SequenceType.RNA, iupac),
+            num=self._num, seq_name=self.seq_name,
+        )
+
+
+def _open_fasta(source: str | IO) -> ContextManager[IO]:
+    """
+    Opens a FASTA file for reading in binary mode. Gzip-compressed files are
+    detected by their magic number and decompressed transparently. Open file
+    handles are returned unchanged and are not closed afterward.
+
+    Parameters
+    ----------
+    source : str or file-like object
+        The path to the FASTA file or an open text or binary file handle.
+
+    Returns
+    -------
+    context manager
+        The file handle.
+    """
+    if not isinstance(source, (str, os.PathLike)):
+        return nullcontext(source)
+    with open(source, "rb") as fasta_file:
+        is_gzip = fasta_file.read(2) == GZIP_MAGIC
+    if is_gzip:
+        return gzip.open(source, "rb")
+    return open(source, "rb")
+
+
+def _fasta_record(
+    header_parts: list[bytes],
+    seq_parts: list[bytes],
+    uppercase: bool = True
+) -> tuple[str, str, str]:
+    description = b"".join(header_parts).decode().strip()
+    seq_id = description.split(maxsplit=1)[0] if description else ""
+    seq_str = b"".join(seq_parts).translate(None, FASTA_WHITESPACE)
+    if uppercase:
+        seq_str = seq_str.upper()
+    return seq_id, description, seq_str.decode()
+
+
+def parse_fasta(
+    source: str | IO,
+    uppercase: bool = True
+) -> Generator[tuple[str, str, str], None, None]:
+    """
+    Parses a FASTA file and yields its records without depending on
+    Biopython.
+
+    The file is read in large chunks of `FASTA_CHUNKSIZE` bytes. Sequence
+    lines are not split individually, instead the data between two headers
+    is collected as slices of the chunks and joined once per record.
+    Lines before the first header are ignored.
 
-def read_fasta(filename: str) -> Generator[tuple[str, str], None, None]:
+    Parameters
+    ----------
+    source : str or file-like object
+        The path to a plain or gzip-compressed FASTA file or an open text
+        or binary file handle.
+    uppercase : bool, optional
+        If True (default), the sequences are converted to upper case.
+        Otherwise, the case is preserved, e.g. for insertions in A3M files.
+
+    Yields
+    ------
+    tuple of (str, str, str)
+        The identifier (the first word of the header), the complete header
+        line without the leading '>' and the sequence without whitespace.
+    """
+    header_parts: list[bytes] | None = None
+    seq_parts: list[bytes] = []
+    in_header = False
+    line_start = True
+
+    with _open_fasta(source) as fasta_file:
+        while chunk := fasta_file.read(FASTA_CHUNKSIZE):
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            pos = 0
+            size = len(chunk)
+            while pos < size:
+                if in_header:
+                    end = chunk.find(b"\n", pos)
+                    if end < 0:
+                        header_parts.append(chunk[pos:])
+                        break
+                    header_parts.append(chunk[pos:end])
+                    in_header = False
+                    line_start = True
+                    pos = end + 1
+                elif line_start and chunk[pos] == FASTA_HEADER_START:
+                    if header_parts is not None:
+                        yield _fasta_record(header_parts, seq_parts,
+                                            uppercase)
+                    header_parts = []
+                    seq_parts = []
+                    in_header = True
+                    pos += 1
+                else:
+                    end = chunk.find(b"\n>", pos)
+                    if end < 0:
+                        end = size
+                        line_start = chunk.endswith(b"\n")
+                    else:
+                        end += 1
+                        line_start = True
+                    if header_parts is not None:
+                        seq_parts.append(chunk[pos:end])
+                    pos = end
+
+    if header_parts is not None:
+        yield _fasta_record(header_parts, seq_parts, uppercase)
+
+
+def read_fasta(
+    filename: str | IO,
+    biopython: bool = False
+) -> Generator[tuple[str, str], None, None]:
     """
     Reads a FASTA file and yields sequences with their identifiers as tuples.
 
-    This function utilizes Biopython's SeqIO to parse a given FASTA file and
-    yield tuples containing sequence identifiers and their corresponding
-    sequences. The function ensures that Biopython is installed and raises
-    an appropriate error if it is not available.
+    By default, the built-in parser `parse_fasta` is used, which also
+    handles gzip-compressed files. Biopython's SeqIO can be used instead,
+    e.g. for unusual FASTA dialects.
 
     Parameters
     ----------
-    filename : str
-        Path to the FASTA file to be read.
+    filename : str or file-like object
+        Path to the FASTA file to be read or an open file handle.
+    biopython : bool, optional
+        If True, the file is parsed with Biopython. Default is False.
 
     Yields
     ------
@@ -523,14 +932,554 @@ def read_fasta(filename: str) -> Generator[tuple[str, str], None, None]:
     Raises
     ------
     ImportError
-        If Biopython is not installed and cannot be imported.
+        If Biopython is requested but not installed.
     """
+    if not biopython:
+        for seq_id, _, seq_str in parse_fasta(filename):
+            yield seq_id, seq_str
+        return
+
     try:
         from Bio import SeqIO
-        for entry in SeqIO.parse(filename, "fasta"):
-            yield entry.id, str(entry.seq).upper()
     except ImportError as e:
         raise ImportError("Please install Biopython to read FASTA files") from e
+    with _open_fasta(filename) as fasta_file:
+        if isinstance(fasta_file, io.BufferedIOBase):
+            fasta_file = io.TextIOWrapper(fasta_file)
+        for entry in SeqIO.parse(fasta_file, "fasta"):
+            yield entry.id, str(entry.seq).upper()
+
+
+class FastaIndexEntry(object):
+    """
+    Represents a record of a FASTA index, using the columns of the
+    `.fai` format of samtools.
+
+    Attributes
+    ----------
+    name : str
+        The identifier of the record.
+    length : int
+        The number of residues of the sequence.
+    offset : int
+        The byte offset of the first residue in the file.
+    line_bases : int
+        The number of residues of the first sequence line.
+    line_width : int
+        The number of bytes of the first sequence line including the
+        line terminator.
+    """
+    def __init__(
+        self,
+        name: str,
+        length: int,
+        offset: int,
+        line_bases: int,
+        line_width: int
+    ):
+        self.name: str = name
+        self.length: int = length
+        self.offset: int = offset
+        self.line_bases: int = line_bases
+        self.line_width: int = line_width
+
+    def to_line(self) -> str:
+        return (f"{self.name}\t{self.length}\t{self.offset}\t"
+                f"{self.line_bases}\t{self.line_width}\n")
+
+    @classmethod
+    def from_line(cls, line: str) -> FastaIndexEntry:
+        name, *values = line.rstrip("\n").split("\t")[:5]
+        return cls(name, *(int(value) for value in values))
+
+    def __str__(self) -> str:
+        return f"FastaIndexEntry({self.name}, {self.length})"
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}({self.name})>"
+
+
+def build_fasta_index(filename: str) -> dict[str, FastaIndexEntry]:
+    """
+    Scans an uncompressed FASTA file once and determines the byte offset
+    and the length of each record.
+
+    Parameters
+    ----------
+    filename : str
+        The path to the FASTA file.
+
+    Returns
+    -------
+    dict of str to FastaIndexEntry
+        The index entries by record identifier. For duplicate identifiers,
+        only the first record is indexed.
+    """
+    index = {}
+    entry = None
+    offset = 0
+    with open(filename, "rb") as fasta_file:
+        for line in fasta_file:
+            if line.startswith(b">"):
+                header = line[1:].decode().split(maxsplit=1)
+                name = header[0] if header else ""
+                entry = FastaIndexEntry(name, 0, offset + len(line), 0, 0)
+                index.setdefault(name, entry)
+            elif entry is not None:
+                num_bases = len(line.translate(None, FASTA_WHITESPACE))
+                if entry.line_width == 0:
+                    entry.line_bases = num_bases
+                    entry.line_width = len(line)
+                entry.length += num_bases
+            offset += len(line)
+    return index
+
+
+def fasta_index(
+    filename: str,
+    rebuild: bool = False
+) -> dict[str, FastaIndexEntry]:
+    """
+    Returns the offset index of a FASTA file. The index is stored next to
+    the FASTA file with the extension `.fai` and reused as long as the
+    FASTA file was not modified after the index was written. Existing
+    indices created by `samtools faidx` are reused as well.
+
+    Parameters
+    ----------
+    filename : str
+        The path to the uncompressed FASTA file.
+    rebuild : bool, optional
+        If True, the index is always created again. Default is False.
+
+    Returns
+    -------
+    dict of str to FastaIndexEntry
+        The index entries by record identifier.
+    """
+    index_filename = f"{filename}{FASTA_INDEX_EXTENSION}"
+    if not rebuild and os.path.exists(index_filename) and \
+            os.path.getmtime(index_filename) >= os.path.getmtime(filename):
+        with open(index_filename, "r") as index_file:
+            entries = (FastaIndexEntry.from_line(line)
+                       for line in index_file if line.strip())
+            return {entry.name: entry for entry in entries}
+
+    index = build_fasta_index(filename)
+    try:
+        with open(index_filename, "w") as index_file:
+            index_file.writelines(entry.to_line() for entry in index.values())
+    except OSError:
+        # the index is only a cache, e.g. for read-only directories
+        pass
+    return index
+
+
+def _read_indexed(fasta_file: IO, entry: FastaIndexEntry) -> str:
+    """
+    Reads the sequence of an indexed record, starting at its offset until
+    the expected number of residues has been read.
+    """
+    fasta_file.seek(entry.offset)
+    # estimate of the record size including the line terminators
+    line_ratio = entry.line_width / entry.line_bases if entry.line_bases else 1
+    chunksize = max(int(entry.length * line_ratio) + 2, 1024)
+    seq_parts = []
+    num_bases = 0
+    while num_bases < entry.length:
+        chunk = fasta_file.read(chunksize)
+        if not chunk:
+            break
+        chunk = chunk.translate(None, FASTA_WHITESPACE)
+        seq_parts.append(chunk)
+        num_bases += len(chunk)
+    seq_str = b"".join(seq_parts)[:entry.length]
+    return seq_str.upper().decode()
+
+
+def fasta_fetch(
+    filename: str,
+    ids: Iterable[str]
+) -> Generator[tuple[str, str], None, None]:
+    """
+    Reads specific records of a FASTA file by their identifier.
+
+    For uncompressed files, an offset index is used (see `fasta_index`) to
+    seek directly to the requested records. Gzip-compressed files do not
+    support random access and are scanned until all records are found.
+
+    Parameters
+    ----------
+    filename : str
+        The path to the FASTA file.
+    ids : iterable of str
+        The identifiers of the requested records, i.e. the first word of
+        the header lines.
+
+    Yields
+    ------
+    tuple of (str, str)
+        The identifier and the sequence of each record in the requested order.
+
+    Raises
+    ------
+    KeyError
+        If any of the requested identifiers is not present in the file.
+    """
+    ids = list(ids)
+    with open(filename, "rb") as fasta_file:
+        is_gzip = fasta_file.read(2) == GZIP_MAGIC
+
+    if is_gzip:
+        requested = set(ids)
+        records = {}
+        for seq_id, _, seq_str in parse_fasta(filename):
+            if seq_id in requested and seq_id not in records:
+                records[seq_id] = seq_str
+                if len(records) == len(requested):
+                    break
+        missing = [seq_id for seq_id in ids if seq_id not in records]
+        if missing:
+            raise KeyError(f"Records not found in FASTA file: "
+                           f"{', '.join(missing)}")
+        for seq_id in ids:
+            yield seq_id, records[seq_id]
+        return
+
+    index = fasta_index(filename)
+    missing = [seq_id for seq_id in ids if seq_id not in index]
+    if missing:
+        raise KeyError(f"Records not found in FASTA file: "
+                       f"{', '.join(missing)}")
+    with open(filename, "rb") as fasta_file:
+        for seq_id in ids:
+            yield seq_id, _read_indexed(fasta_file, index[seq_id])
+
+
+def _open_a3m(
+    content: str | LazyString,
+    is_path: bool
+) -> ContextManager[IO]:
+    if is_path:
+        return _open_fasta(content)
+    return nullcontext(io.StringIO(resolve(content)))
+
+
+def parse_a3m(
+    content: str | LazyString,
+    is_path: bool = False
+) -> Generator[tuple[str, str], None, None]:
+    """
+    Parses an MSA in A3M format row by row.
+
+    The rows are streamed from the (gzip-compressed) file or the inline
+    string with the FASTA parser, so that large alignments are never
+    loaded completely. Lower-case insertions are preserved.
+
+    Parameters
+    ----------
+    content : str or LazyString
+        The inline A3M data or the path to the A3M file.
+    is_path : bool, optional
+        If True, `content` is treated as a file path. Default is False.
+
+    Yields
+    ------
+    tuple of (str, str)
+        The header line without the leading '>' and the aligned sequence.
+    """
+    with _open_a3m(content, is_path) as a3m_file:
+        for _, description, row in parse_fasta(a3m_file, uppercase=False):
+            yield description, row
+
+
+class A3MStats(object):
+    """
+    Summarizes an MSA in A3M format.
+
+    Attributes
+    ----------
+    depth : int
+        The number of rows, including the query.
+    width : int
+        The number of aligned columns, i.e. the length of the query.
+    query : str or None
+        The first row of the MSA, or None if the MSA is empty.
+    """
+    def __init__(self):
+        self.depth: int = 0
+        self.width: int = 0
+        self.query: str | None = None
+
+    def __str__(self) -> str:
+        return f"A3M({self.depth} rows, {self.width} columns)"
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}({self.depth}, {self.width})>"
+
+
+def a3m_stats(
+    content: str | LazyString,
+    is_path: bool = False,
+    query: str | None = None
+) -> A3MStats:
+    """
+    Streams an MSA in A3M format and checks its consistency.
+
+    The first row must match the query sequence, if it is specified, and
+    all rows must have the same number of aligned columns, i.e. upper-case
+    residues and gaps ('-'). Insertions (lower-case residues and '.') are
+    not counted. Truncated files are therefore detected by the width of
+    their last row. An empty MSA is valid.
+
+    Parameters
+    ----------
+    content : str or LazyString
+        The inline A3M data or the path to the A3M file.
+    is_path : bool, optional
+        If True, `content` is treated as a file path. Default is False.
+    query : str or None, optional
+        The sequence of the entity the MSA belongs to.
+
+    Returns
+    -------
+    A3MStats
+        The depth, the width and the query row of the MSA.
+
+    Raises
+    ------
+    AFMSAError
+        If the first row does not match the query or the rows differ
+        in width.
+    """
+    stats = A3MStats()
+    for num_row, (description, row) in enumerate(
+            parse_a3m(content, is_path), start=1):
+        width = len(row.translate(_A3M_INSERTION_TABLE))
+        if num_row == 1:
+            if query is not None and row != query:
+                position = next(
+                    (pos for pos, residues in enumerate(zip(row, query))
+                     if residues[0] != residues[1]),
+                    min(len(row), len(query))
+                )
+                raise AFMSAError(
+                    f"The first row of the MSA ('{description}') does not "
+                    f"match the query sequence at position {position + 1}."
+                )
+            stats.query = row
+            stats.width = width
+        elif width != stats.width:
+            raise AFMSAError(
+                f"Row {num_row} of the MSA ('{description}') has {width} "
+                f"aligned columns instead of {stats.width}."
+            )
+        stats.depth += 1
+    return stats
+
+
+def a3m_identity(row: str, query: str) -> float:
+    """
+    Computes the sequence identity of an A3M row to the query, i.e. the
+    fraction of identical residues among the aligned non-gap columns of
+    the row. Insertions are ignored.
+
+    Parameters
+    ----------
+    row : str
+        The aligned sequence.
+    query : str
+        The query sequence, i.e. the first row of the MSA.
+
+    Returns
+    -------
+    float
+        The sequence identity between 0 and 1.
+    """
+    aligned = row.translate(_A3M_INSERTION_TABLE)
+    num_aligned = len(aligned) - aligned.count("-")
+    if not num_aligned:
+        return 0.0
+    return sum(map(eq, aligned, query)) / num_aligned
+
+
+def _select_a3m_rows(
+    rows: Iterator[tuple[str, str]],
+    max_rows: int,
+    strategy: str,
+    seed: int | None,
+    min_identity: float,
+    max_identity: float
+) -> Generator[tuple[str, str], None, None]:
+    query = next(rows, None)
+    if query is None:
+        return
+    yield query
+
+    num_rows = max_rows - 1
+    match strategy:
+        case "top":
+            yield from islice(rows, num_rows)
+        case "identity":
+            yield from islice(
+                (row for row in rows
+                 if min_identity <= a3m_identity(row[1], query[1])
+                 <= max_identity),
+                num_rows
+            )
+        case "random":
+            # reservoir sampling keeps at most `num_rows` rows in memory
+            rng = random.Random(seed)
+            reservoir: list[tuple[int, tuple[str, str]]] = []
+            for index, row in enumerate(rows):
+                if index < num_rows:
+                    reservoir.append((index, row))
+                    continue
+                replace = rng.randint(0, index)
+                if replace < num_rows:
+                    reservoir[replace] = (index, row)
+            reservoir.sort(key=lambda item: item[0])
+            yield from (row for _, row in reservoir)
+
+
+def _write_a3m(rows: Iterable[tuple[str, str]], filename: str) -> None:
+    tmp_filename = f"{filename}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_filename, "w") as a3m_file:
+            for description, row in rows:
+                a3m_file.write(f">{description}\n{row}\n")
+        os.replace(tmp_filename, filename)
+    except BaseException:
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+        raise
+
+
+def cap_a3m(
+    content: str | LazyString,
+    max_rows: int,
+    is_path: bool = False,
+    strategy: str = "top",
+    seed: int | None = None,
+    min_identity: float = 0.0,
+    max_identity: float = DEFAULT_MAX_IDENTITY,
+    output: str | None = None
+) -> str:
+    """
+    Reduces an MSA in A3M format to at most `max_rows` rows, including the
+    query, which is always kept as the first row.
+
+    The rows are streamed from the inline string or file, therefore only
+    the selected rows are held in memory. The "top" strategy keeps the
+    first rows, which are usually sorted by their score, and stops reading
+    afterward. The "identity" strategy keeps the first rows whose sequence
+    identity to the query lies within the given range, e.g. to remove
+    near-identical rows. The "random" strategy draws a uniform sample of
+    the rows with reservoir sampling, which is reproducible with a seed.
+    The selected rows keep their original order.
+
+    Parameters
+    ----------
+    content : str or LazyString
+        The inline A3M data or the path to the A3M file.
+    max_rows : int
+        The maximum number of rows, including the query.
+    is_path : bool, optional
+        If True, `content` is treated as a file path. Default is False.
+    strategy : str, optional
+        The selection strategy ("top", "identity" or "random").
+        Default is "top".
+    seed : int or None, optional
+        The seed of the random strategy.
+    min_identity : float, optional
+        The minimum sequence identity to the query of the identity strategy.
+    max_identity : float, optional
+        The maximum sequence identity to the query of the identity strategy.
+        Default is `DEFAULT_MAX_IDENTITY`.
+    output : str or None, optional
+        The path of the file where the reduced MSA is written. If None,
+        the reduced MSA is returned as string.
+
+    Returns
+    -------
+    str
+        The reduced A3M data or the path of the written file.
+
+    Raises
+    ------
+    ValueError
+        If the strategy is unknown, `max_rows` is smaller than one or
+        the identity range is invalid.
+    """
+    if strategy not in MSA_CAP_STRATEGIES:
+        raise ValueError(
+            f"Unknown strategy '{strategy}'. "
+            f"Use one of: {', '.join(MSA_CAP_STRATEGIES)}."
+        )
+    if max_rows < 1:
+        raise ValueError("The MSA must contain at least the query row.")
+    if not 0.0 <= min_identity <= max_identity <= 1.0:
+        raise ValueError("The identity range must lie between 0 and 1.")
+
+    rows = _select_a3m_rows(
+        parse_a3m(content, is_path), max_rows, strategy, seed,
+        min_identity, max_identity
+    )
+    if output is not None:
+        _write_a3m(rows, output)
+        return output
+    return "".join(f">{description}\n{row}\n" for description, row in rows)
+
+
+def find_invalid_residue(
+    seq_type: SequenceType,
+    seq_str: str
+) -> tuple[int, str] | None:
+    """
+    Finds the first character of a sequence string that is not valid for
+    the specified sequence type.
+
+    The check uses precompiled tables instead of iterating over the
+    characters in Python. Valid ASCII sequences are detected by deleting
+    all valid characters with `bytes.translate`, the position of the first
+    invalid character is only searched for invalid sequences.
+
+    Parameters
+    ----------
+    seq_type : SequenceType
+        Type of the sequence to validate.
+    seq_str : str
+        The sequence string to validate against the specified sequence type.
+
+    Returns
+    -------
+    tuple of (int, str) or None
+        The zero-based position and the first invalid character, or None
+        if all characters are valid.
+    """
+    try:
+        invalid = seq_str.encode("ascii").translate(
+            None, _SEQ_DELETE_TABLES[seq_type]
+        )
+        if not invalid:
+            return None
+    except UnicodeEncodeError:
+        pass
+    match = _SEQ_INVALID_PATTERNS[seq_type].search(seq_str)
+    return match.start(), match.group()
+
+
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _cached_invalid_residue(
+    seq_type: SequenceType,
+    seq_str: str
+) -> tuple[int, str] | None:
+    """
+    Memoized version of `find_invalid_residue` used for sequence objects,
+    so that a sequence shared by many input files, such as a common
+    receptor, is only validated once per process.
+    """
+    return find_invalid_residue(seq_type, seq_str)
 
 
 def is_valid_sequence(seq_type: SequenceType, seq_str: str) -> bool:
@@ -550,19 +1499,227 @@ def is_valid_sequence(seq_type: SequenceType, seq_str: str) -> bool:
         True if all characters in `seq_str` belong to the valid character set for
         the specified `seq_type`; False otherwise.
     """
-    SEQ_CHAR_SETS = {
-        SequenceType.PROTEIN: set("ACDEFGHIKLMNPQRSTVWY"),
-        SequenceType.DNA: set("ACGT"),
-        SequenceType.RNA: set("ACGU")
-    }
-    return all(char in SEQ_CHAR_SETS[seq_type] for char in seq_str)
+    return find_invalid_residue(seq_type, seq_str) is None
+
+
+def reverse_complement(
+    seq_str: str,
+    seq_type: SequenceType = SequenceType.DNA,
+    iupac: bool = False
+) -> str:
+    """
+    Returns the reverse complement of a DNA or RNA sequence string.
+
+    The bases are complemented with a precompiled translation table, so
+    that long sequences are processed without iterating over the
+    characters in Python.
+
+    Parameters
+    ----------
+    seq_str : str
+        The sequence string to be complemented.
+    seq_type : SequenceType, optional
+        The type of the sequence, either DNA (default) or RNA.
+    iupac : bool, optional
+        If True, IUPAC ambiguity codes (e.g. `N`, `R` or `Y`) are accepted
+        and complemented as well. Default is False.
+
+    Returns
+    -------
+    str
+        The reverse complement of the sequence.
+
+    Raises
+    ------
+    AFSequenceError
+        If the sequence type cannot be complemented or the sequence
+        contains an invalid character.
+    """
+    if (seq_type, iupac) not in _COMPLEMENT_TABLES:
+        raise AFSequenceError(
+            f"Reverse complement is not supported for sequence type "
+            f"{seq_type.name}."
+        )
+    table, bases, pattern = _COMPLEMENT_TABLES[(seq_type, iupac)]
+    try:
+        encoded = seq_str.encode("ascii")
+        if not encoded.translate(None, bases):
+            return encoded.translate(table)[::-1].decode("ascii")
+    except UnicodeEncodeError:
+        pass
+    match = pattern.search(seq_str)
+    raise AFSequenceError(
+        f"Invalid residue for sequence type {seq_type.name}: "
+        f"'{match.group()}' at position {match.start() + 1}."
+    )
+
+
+def reverse_complements(
+    sequences: Iterable[str | Sequence],
+    seq_type: SequenceType = SequenceType.DNA,
+    iupac: bool = False
+) -> Generator[str | Sequence, None, None]:
+    """
+    Lazily returns the reverse complements of many sequences, e.g. to
+    generate the complementary strands of a large duplex library.
+
+    Parameters
+    ----------
+    sequences : iterable of str or Sequence
+        The sequence strings or `DNASequence`/`RNASequence` objects.
+    seq_type : SequenceType, optional
+        The type of the sequence strings, either DNA (default) or RNA.
+        The type of sequence objects is taken from the objects.
+    iupac : bool, optional
+        If True, IUPAC ambiguity codes are accepted and complemented.
+
+    Yields
+    ------
+    str or Sequence
+        The reverse complement of each sequence of the same kind as the
+        input, i.e. a string or a new sequence object.
+    """
+    for sequence in sequences:
+        if isinstance(sequence, str):
+            yield reverse_complement(sequence, seq_type, iupac)
+        else:
+            yield sequence.reverse_complement(iupac=iupac)
+
+
+class SequenceClassification(object):
+    """
+    Represents the result of the classification of a sequence string.
+
+    Attributes
+    ----------
+    seq_type : SequenceType or None
+        The identified sequence type or None if the sequence is invalid
+        or ambiguous.
+    reason : str or None
+        The reason why no sequence type could be identified.
+    """
+    def __init__(
+        self,
+        seq_type: SequenceType | None,
+        reason: str | None = None
+    ):
+        self.seq_type: SequenceType | None = seq_type
+        self.reason: str | None = reason
+
+    def __bool__(self) -> bool:
+        return self.seq_type is not None
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SequenceClassification):
+            return NotImplemented
+        return self.seq_type == other.seq_type and self.reason == other.reason
+
+    def __str__(self) -> str:
+        if self.seq_type is None:
+            return f"SequenceClassification(None, {self.reason})"
+        return f"SequenceClassification({self.seq_type.name})"
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}({self.seq_type})>"
+
+
+def _classify_invalid(seq_str: str) -> SequenceClassification:
+    """
+    Determines the reason why a sequence does not match any alphabet.
+    """
+    match = _INVALID_RESIDUE_PATTERN.search(seq_str)
+    if match is not None:
+        return SequenceClassification(
+            None, f"invalid character '{match.group()}' "
+                  f"at position {match.start() + 1}"
+        )
+    return SequenceClassification(
+        None, f"residues {', '.join(sorted(set(seq_str)))} do not belong "
+              f"to a single alphabet"
+    )
+
+
+def classify_sequence(seq_str: str) -> SequenceClassification:
+    """
+    Classifies a sequence string as DNA, RNA or protein in a single pass.
+
+    Each residue is mapped to the class of alphabets it belongs to with a
+    precompiled translation table, while residues that are valid in all
+    alphabets (A, C and G) are removed. The presence of each class in the
+    remaining residues determines the alphabets that are still possible.
+    Long sequences are processed in chunks and the scan stops as soon as
+    no alphabet remains. Sequences that are valid DNA and RNA at the same
+    time (i.e., only consist of A, C and G) are ambiguous. DNA takes
+    precedence over protein, since all nucleotides of DNA are also valid
+    amino acid codes.
+
+    Parameters
+    ----------
+    seq_str : str
+        The biological sequence to be analyzed.
+
+    Returns
+    -------
+    SequenceClassification
+        The identified sequence type or the reason why the sequence is
+        invalid or ambiguous.
+    """
+    if not seq_str:
+        return SequenceClassification(None, "empty sequence")
+
+    candidates = set(SEQ_ALPHABETS)
+    for start in range(0, len(seq_str), CLASSIFY_CHUNKSIZE):
+        chunk = seq_str[start:start + CLASSIFY_CHUNKSIZE]
+        try:
+            classes = chunk.encode("ascii").translate(
+                _RESIDUE_CLASS_TABLE, _RESIDUE_CLASS_COMMON
+            )
+        except UnicodeEncodeError:
+            candidates.clear()
+        else:
+            for residue_class, excluded in _RESIDUE_CLASS_EXCLUDES.items():
+                if residue_class in classes:
+                    candidates.difference_update(excluded)
+        if not candidates:
+            return _classify_invalid(seq_str)
+
+    if SequenceType.DNA in candidates and SequenceType.RNA in candidates:
+        return SequenceClassification(
+            None, f"only {', '.join(sorted(set(seq_str)))}: "
+                  f"valid DNA and RNA sequence"
+        )
+    for seq_type in (SequenceType.DNA, SequenceType.RNA):
+        if seq_type in candidates:
+            return SequenceClassification(seq_type)
+    return SequenceClassification(SequenceType.PROTEIN)
+
+
+def classify_sequences(
+    seq_strs: Iterable[str]
+) -> Generator[SequenceClassification, None, None]:
+    """
+    Classifies many sequence strings, e.g. all records of a FASTA file.
+
+    Parameters
+    ----------
+    seq_strs : iterable of str
+        The sequences to be analyzed.
+
+    Yields
+    ------
+    SequenceClassification
+        The classification of each sequence in the same order.
+    """
+    for seq_str in seq_strs:
+        yield classify_sequence(seq_str)
 
 
 def identify_sequence_type(seq_str: str) -> SequenceType | None:
     """
     Identifies the type of a given biological sequence based on its composition.
     The function examines if the sequence can be classified as DNA, RNA, or
-    protein, and returns the corresponding sequence type.
+    protein, and returns the corresponding sequence type. Use
+    `classify_sequence` to obtain the reason for ambiguous sequences.
 
     Parameters
     ----------
@@ -579,19 +1736,7 @@ def identify_sequence_type(seq_str: str) -> SequenceType | None:
         Returns None if the sequence is ambiguous (e.g., qualifies as both DNA and RNA)
         or does not fit any of the known sequence types.
     """
-    is_protein = is_valid_sequence(SequenceType.PROTEIN, seq_str)
-    is_dna = is_valid_sequence(SequenceType.DNA, seq_str)
-    is_rna = is_valid_sequence(SequenceType.RNA, seq_str)
-
-    if is_dna and is_rna:
-        return None
-    elif is_dna:
-        return SequenceType.DNA
-    elif is_rna:
-        return SequenceType.RNA
-    elif is_protein:
-        return SequenceType.PROTEIN
-    return None
+    return classify_sequence(seq_str).seq_type
 
 
 def sanitize_sequence_name(name: str) -> str:
@@ -612,32 +1757,69 @@ def sanitize_sequence_name(name: str) -> str:
     return re.sub(r'[ |:|]', '_', name).strip()
 
 
-def fasta2seq(filename: str) -> Generator[Sequence | None, None, None]:
+def record2seq(entry_name: str, entry_seq: str | None) -> Sequence | None:
+    """
+    Converts a FASTA record into a sequence object of the identified type.
+
+    Parameters
+    ----------
+    entry_name : str
+        The identifier of the record, which is sanitized for the sequence name.
+    entry_seq : str or None
+        The sequence of the record.
+
+    Returns
+    -------
+    Sequence or None
+        A `Sequence` object if the sequence type can be identified; otherwise, `None`.
+    """
+    if entry_seq is None:
+        return None
+
+    seq_type = identify_sequence_type(entry_seq)
+    if seq_type is None:
+        return None
+
+    return Sequence(
+        seq_type=seq_type,
+        seq_name=entry_name.replace(' ', '_').replace('|', '_').replace(':', '_').strip(),
+        seq_str=entry_seq
+    )
+
+
+def fasta2seq(
+    filename: str | IO,
+    biopython: bool = False,
+    ids: Iterable[str] | None = None
+) -> Generator[Sequence | None, None, None]:
     """
     Converts a FASTA file into a sequence generator.
 
     Parameters
     ----------
-    filename : str
-        The path to the FASTA file to be read.
+    filename : str or file-like object
+        The path to the FASTA file to be read or an open file handle.
+    biopython : bool, optional
+        If True, the file is parsed with Biopython instead of the built-in
+        parser. Default is False.
+    ids : iterable of str or None, optional
+        If specified, only the records with these identifiers are read
+        by seeking to their position (see `fasta_fetch`).
 
     Yields
     ------
     Sequence or None
         A `Sequence` object if the sequence type can be identified; otherwise, `None`.
-    """
-    for entry_name, entry_seq in read_fasta(filename):
-        if entry_seq is None:
-            yield None
-            continue
 
-        seq_type = identify_sequence_type(entry_seq)
-        if seq_type is None:
-            yield None
-            continue
+    Raises
+    ------
+    KeyError
+        If any of the requested identifiers is not present in the file.
+    """
+    if ids is not None:
+        records = fasta_fetch(filename, ids)
+    else:
+        records = read_fasta(filename, biopython=biopython)
 
-        yield Sequence(
-            seq_type=seq_type,
-            seq_name=entry_name.replace(' ', '_').replace('|', '_').replace(':', '_').strip(),
-            seq_str=entry_seq
-        )
+    for entry_name, entry_seq in records:
+        yield record2seq(entry_name, entry_seq)
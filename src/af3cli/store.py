@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+from typing import Iterable
+
+from .input import InputFile
+from .io import read_many
+from .batch import BatchReport
+from .sequence import MSA, Template, TemplateType, ProteinSequence
+from .lazy import LazyString, resolve
+
+# file extensions of the blobs within the store
+MSA_EXTENSION: str = ".a3m"
+MMCIF_EXTENSION: str = ".cif"
+
+
+class BlobStore(object):
+    """
+    Stores inline MSAs and templates as files that are addressed by the
+    SHA-256 hash of their content. Each unique content is written only
+    once, independent of the number of input files referencing it.
+
+    Blobs are placed in subdirectories named after the first two characters
+    of their hash to avoid directories with a very large number of files.
+
+    Attributes
+    ----------
+    root : str
+        The absolute path of the store directory.
+    num_written : int
+        The number of blobs that were written by this instance.
+    num_reused : int
+        The number of blobs that were already present in the store.
+    """
+    def __init__(self, root: str):
+        self.root: str = os.path.abspath(root)
+        self.num_written: int = 0
+        self.num_reused: int = 0
+        # paths of blobs known to exist, avoids repeated stat calls
+        self._known: set[str] = set()
+
+    def path(self, digest: str, ext: str) -> str:
+        """
+        Returns the path of a blob within the store.
+
+        Parameters
+        ----------
+        digest : str
+            The hexadecimal SHA-256 hash of the content.
+        ext : str
+            The file extension of the blob.
+
+        Returns
+        -------
+        str
+            The absolute path of the blob.
+        """
+        return os.path.join(self.root, digest[:2], f"{digest}{ext}")
+
+    def put(self, content: str | LazyString, ext: str) -> str:
+        """
+        Adds the content to the store, unless it is already present.
+
+        Parameters
+        ----------
+        content : str or LazyString
+            The content of the blob.
+        ext : str
+            The file extension of the blob.
+
+        Returns
+        -------
+        str
+            The absolute path of the blob.
+        """
+        data = resolve(content).encode()
+        digest = hashlib.sha256(data).hexdigest()
+        filename = self.path(digest, ext)
+
+        if filename in self._known or os.path.exists(filename):
+            self._known.add(filename)
+            self.num_reused += 1
+            return filename
+
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        # the temporary file prevents that concurrent writers or
+        # interrupted runs leave incomplete blobs behind
+        tmp_filename = f"{filename}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_filename, "wb") as blob_file:
+                blob_file.write(data)
+            os.replace(tmp_filename, filename)
+        except BaseException:
+            if os.path.exists(tmp_filename):
+                os.remove(tmp_filename)
+            raise
+        self._known.add(filename)
+        self.num_written += 1
+        return filename
+
+    def __str__(self) -> str:
+        return (f"BlobStore({self.root}, {self.num_written} written, "
+                f"{self.num_reused} reused)")
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}({self.root})>"
+
+
+def _externalize_msa(msa: MSA, store: BlobStore) -> int:
+    num_blobs = 0
+    if msa.paired is not None and not msa.paired_is_path:
+        msa.paired = store.put(msa.paired, MSA_EXTENSION)
+        msa.paired_is_path = True
+        num_blobs += 1
+    if msa.unpaired is not None and not msa.unpaired_is_path:
+        msa.unpaired = store.put(msa.unpaired, MSA_EXTENSION)
+        msa.unpaired_is_path = True
+        num_blobs += 1
+    return num_blobs
+
+
+def _externalize_template(template: Template, store: BlobStore) -> int:
+    if template.template_type != TemplateType.STRING:
+        return 0
+    template.mmcif = store.put(template.mmcif, MMCIF_EXTENSION)
+    template.template_type = TemplateType.FILE
+    return 1
+
+
+def externalize(input_file: InputFile, store: BlobStore | str) -> int:
+    """
+    Moves all inline MSAs and templates of an input file into a
+    content-addressed store. The entities are modified in place to
+    reference the absolute paths of the stored files
+    (`pairedMsaPath`, `unpairedMsaPath` and `mmcifPath`).
+
+    Parameters
+    ----------
+    input_file : InputFile
+        The input file whose sequences should be modified.
+    store : BlobStore or str
+        The store or the path of the store directory. Reusing a single
+        `BlobStore` instance for many input files avoids checking the
+        existence of already stored blobs.
+
+    Returns
+    -------
+    int
+        The number of externalized MSAs and templates.
+    """
+    if isinstance(store, str):
+        store = BlobStore(store)
+
+    num_blobs = 0
+    for sequence in input_file.sequences:
+        if sequence.msa is not None:
+            num_blobs += _externalize_msa(sequence.msa, store)
+        if isinstance(sequence, ProteinSequence):
+            for template in sequence.templates:
+                num_blobs += _externalize_template(template, store)
+    return num_blobs
+
+
+def externalize_files(
+    paths: str | Iterable[str],
+    store: str,
+    workers: int | None = None,
+    compact: bool = False
+) -> tuple[BatchReport, BlobStore]:
+    """
+    Externalizes the inline MSAs and templates of existing input files
+    and overwrites the files with the modified content.
+
+    The files are read concurrently and lazily, so that the large string
+    fields are only decoded for hashing. All files share a single store,
+    therefore each unique content is written only once.
+
+    Parameters
+    ----------
+    paths : str or iterable of str
+        A directory, a glob pattern or an iterable of file paths
+        (see `read_many`).
+    store : str
+        The path of the store directory.
+    workers : int or None, optional
+        The number of threads used for reading the files.
+    compact : bool, optional
+        If True, the JSON files are written without indentation.
+
+    Returns
+    -------
+    tuple of (BatchReport, BlobStore)
+        The number of processed files with failed files and the store
+        with the number of written and reused blobs.
+    """
+    blob_store = BlobStore(store)
+    report = BatchReport(unit="files")
+
+    start = time.perf_counter()
+    for filename, result in read_many(paths, workers=workers, lazy=True):
+        report.num_jobs += 1
+        try:
+            if isinstance(result, Exception):
+                raise result
+            externalize(result, blob_store)
+            result.write(filename, compact=compact)
+            report.num_written += 1
+        except Exception as e:
+            report.failed.append((filename, f"{e.__class__.__name__}: {e}"))
+    report.elapsed = time.perf_counter() - start
+    return report, blob_store
@@ -0,0 +1,755 @@
+from __future__ import annotations
+
+import json
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, Callable, Iterable
+
+from .io import read_raw, expand_paths
+from .lazy import LazyString
+from .sequence import SequenceType, find_invalid_residue
+
+# validators append the issues found at the given path of the document
+Validator = Callable[[Any, str, list["ValidationIssue"]], None]
+
+ENTITY_ID_PATTERN: re.Pattern = re.compile(r"[A-Z]+")
+VALIDATE_CHUNKSIZE: int = 64
+SUPPORTED_DIALECT: str = "alphafold3"
+# the fields containing the positions of modifications of each polymer
+MODIFICATION_POSITION_KEYS: dict[str, str] = {
+    SequenceType.PROTEIN.value: "ptmPosition",
+    SequenceType.RNA.value: "basePosition",
+    SequenceType.DNA.value: "basePosition",
+}
+
+_STRING_TYPES: tuple[type, ...] = (str, LazyString)
+
+
+class ValidationIssue(object):
+    """
+    Describes a single problem within an AlphaFold3 input file.
+
+    Attributes
+    ----------
+    path : str
+        The location of the problem in the document, e.g.
+        "$.sequences[0].protein.modifications[1].ptmPosition".
+    message : str
+        The description of the problem.
+    """
+    def __init__(self, path: str, message: str):
+        self.path: str = path
+        self.message: str = message
+
+    def to_dict(self) -> dict:
+        return {"path": self.path, "message": self.message}
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ValidationIssue):
+            return NotImplemented
+        return self.path == other.path and self.message == other.message
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.message}"
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}({self.path})>"
+
+
+def _type_name(value: Any) -> str:
+    if isinstance(value, LazyString):
+        return "str"
+    return type(value).__name__
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _string(
+    pattern: re.Pattern | None = None,
+    choices: tuple[str, ...] | None = None,
+    non_empty: bool = False
+) -> Validator:
+    """
+    Compiles a validator for string values with optional constraints.
+    """
+    def validate(value: Any, path: str, issues: list[ValidationIssue]) -> None:
+        if not isinstance(value, _STRING_TYPES):
+            issues.append(ValidationIssue(
+                path, f"Expected a string, got {_type_name(value)}."))
+            return
+        if isinstance(value, LazyString):
+            if non_empty and not value:
+                issues.append(ValidationIssue(path, "Must not be empty."))
+            return
+        if non_empty and not value:
+            issues.append(ValidationIssue(path, "Must not be empty."))
+        elif pattern is not None and not pattern.fullmatch(value):
+            issues.append(ValidationIssue(
+                path, f"Invalid value '{value}'."))
+        elif choices is not None and value not in choices:
+            issues.append(ValidationIssue(
+                path, f"Expected one of {', '.join(choices)}, got '{value}'."))
+    return validate
+
+
+def _integer(minimum: int | None = None) -> Validator:
+    """
+    Compiles a validator for integer values with an optional lower bound.
+    Booleans are rejected, although they are integers in Python.
+    """
+    def validate(value: Any, path: str, issues: list[ValidationIssue]) -> None:
+        if not _is_int(value):
+            issues.append(ValidationIssue(
+                path, f"Expected an integer, got {_type_name(value)}."))
+        elif minimum is not None and value < minimum:
+            issues.append(ValidationIssue(
+                path, f"Must be at least {minimum}, got {value}."))
+    return validate
+
+
+def _list_of(item: Validator, min_length: int = 0) -> Validator:
+    """
+    Compiles a validator for lists whose entries are checked by `item`.
+    """
+    def validate(value: Any, path: str, issues: list[ValidationIssue]) -> None:
+        if not isinstance(value, list):
+            issues.append(ValidationIssue(
+                path, f"Expected a list, got {_type_name(value)}."))
+            return
+        if len(value) < min_length:
+            issues.append(ValidationIssue(
+                path, f"Expected at least {min_length} entries."))
+        for index, entry in enumerate(value):
+            item(entry, f"{path}[{index}]", issues)
+    return validate
+
+
+def _tuple_of(*items: Validator) -> Validator:
+    """
+    Compiles a validator for lists with a fixed number of entries, which
+    are checked by the respective validator.
+    """
+    def validate(value: Any, path: str, issues: list[ValidationIssue]) -> None:
+        if not isinstance(value, list) or len(value) != len(items):
+            issues.append(ValidationIssue(
+                path, f"Expected a list with {len(items)} entries."))
+            return
+        for index, (item, entry) in enumerate(zip(items, value)):
+            item(entry, f"{path}[{index}]", issues)
+    return validate
+
+
+def _either(*validators: Validator) -> Validator:
+    """
+    Compiles a validator that accepts a value if any of the validators
+    reports no issue. Otherwise, the issues of the last validator are kept.
+    """
+    def validate(value: Any, path: str, issues: list[ValidationIssue]) -> None:
+        tmp_issues = []
+        for validator in validators:
+            tmp_issues = []
+            validator(value, path, tmp_issues)
+            if not tmp_issues:
+                return
+        issues.extend(tmp_issues)
+    return validate
+
+
+def _object(
+    required: dict[str, Validator],
+    optional: dict[str, Validator] | None = None,
+    exclusive: tuple[tuple[str, ...], ...] = (),
+    one_of: tuple[tuple[str, ...], ...] = (),
+    nullable: tuple[str, ...] = (),
+    check: Callable[[dict, str, list[ValidationIssue]], None] | None = None
+) -> Validator:
+    """
+    Compiles a validator for JSON objects.
+
+    Parameters
+    ----------
+    required : dict of str to Validator
+        The validators of the keys that must be present.
+    optional : dict of str to Validator, optional
+        The validators of the keys that may be present.
+    exclusive : tuple of tuple of str, optional
+        Groups of keys of which at most one may be present.
+    one_of : tuple of tuple of str, optional
+        Groups of keys of which exactly one must be present.
+    nullable : tuple of str, optional
+        Keys whose value may be null.
+    check : callable, optional
+        An additional check of the relations between the fields, which is
+        applied after the fields have been validated.
+
+    Returns
+    -------
+    Validator
+        The compiled validator.
+    """
+    fields = dict(required)
+    fields.update(optional or {})
+    required_keys = tuple(required)
+    nullable_keys = frozenset(nullable)
+    groups = [(group, False) for group in exclusive]
+    groups += [(group, True) for group in one_of]
+
+    def validate(value: Any, path: str, issues: list[ValidationIssue]) -> None:
+        if not isinstance(value, dict):
+            issues.append(ValidationIssue(
+                path, f"Expected an object, got {_type_name(value)}."))
+            return
+        for key, entry in value.items():
+            validator = fields.get(key)
+            if validator is None:
+                issues.append(ValidationIssue(
+                    f"{path}.{key}", "Unknown field."))
+            elif entry is None and key in nullable_keys:
+                continue
+            else:
+                validator(entry, f"{path}.{key}", issues)
+        for key in required_keys:
+            if key in value:
+                continue
+            issues.append(ValidationIssue(
+                f"{path}.{key}", "Missing required field."))
+        for group, exactly_one in groups:
+            num_present = sum(key in value for key in group)
+            if num_present > 1:
+                issues.append(ValidationIssue(
+                    path, f"Fields {', '.join(group)} are mutually exclusive."))
+            elif exactly_one and num_present == 0:
+                issues.append(ValidationIssue(
+                    path, f"One of the fields {', '.join(group)} is required."))
+        if check is not None:
+            check(value, path, issues)
+    return validate
+
+
+def _entity(variants: dict[str, Validator]) -> Validator:
+    """
+    Compiles a validator for entries of the `sequences` field, which
+    contain exactly one key that determines the type of the entity.
+    """
+    def validate(value: Any, path: str, issues: list[ValidationIssue]) -> None:
+        if not isinstance(value, dict) or len(value) != 1:
+            issues.append(ValidationIssue(
+                path, f"Expected an object with exactly one of the keys "
+                      f"{', '.join(variants)}."))
+            return
+        key, content = next(iter(value.items()))
+        validator = variants.get(key)
+        if validator is None:
+            issues.append(ValidationIssue(
+                f"{path}.{key}", "Unknown entity type."))
+            return
+        validator(content, f"{path}.{key}", issues)
+    return validate
+
+
+def _check_sequence(
+    seq_type: SequenceType
+) -> Callable[[dict, str, list[ValidationIssue]], None]:
+    """
+    Creates the check of the sequence content of a polymer entity. Values
+    with an invalid type are skipped, since they are already reported by
+    the field validators. The positions of modifications and templates are
+    checked for the whole document by `check_bounds`.
+    """
+    def check(value: dict, path: str, issues: list[ValidationIssue]) -> None:
+        seq_str = value.get("sequence")
+        if not isinstance(seq_str, str):
+            return
+        invalid_residue = find_invalid_residue(seq_type, seq_str)
+        if invalid_residue is not None:
+            position, residue = invalid_residue
+            issues.append(ValidationIssue(
+                f"{path}.sequence",
+                f"Invalid characters for sequence type {seq_type.name}: "
+                f"'{residue}' at position {position + 1}."))
+    return check
+
+
+def _check_template(
+    value: dict,
+    path: str,
+    issues: list[ValidationIssue]
+) -> None:
+    qidx = value.get("queryIndices")
+    tidx = value.get("templateIndices")
+    if isinstance(qidx, list) and isinstance(tidx, list) \
+            and len(qidx) != len(tidx):
+        issues.append(ValidationIssue(
+            path, "Fields queryIndices and templateIndices differ in length."))
+
+
+def _entity_ids(sequence: Any) -> tuple[str | None, list[str]]:
+    """
+    Returns the type and the IDs of an entry of the `sequences` field,
+    ignoring malformed entries.
+    """
+    if not isinstance(sequence, dict) or len(sequence) != 1:
+        return None, []
+    seq_type, content = next(iter(sequence.items()))
+    if not isinstance(content, dict):
+        return seq_type, []
+    seq_ids = content.get("id")
+    if isinstance(seq_ids, str):
+        seq_ids = [seq_ids]
+    if not isinstance(seq_ids, list):
+        return seq_type, []
+    return seq_type, [seq_id for seq_id in seq_ids if isinstance(seq_id, str)]
+
+
+def _check_document(
+    value: dict,
+    path: str,
+    issues: list[ValidationIssue]
+) -> None:
+    """
+    Checks the references between entities, i.e. unique entity IDs and
+    existing entities of bonded atom pairs, as well as the positions of
+    modifications and template indices.
+    """
+    sequences = value.get("sequences")
+    if not isinstance(sequences, list):
+        return
+    # values below the lower bounds are already reported by the schema
+    issues.extend(_check_bounds(sequences, path, lower=False))
+    entity_ids = set()
+    for index, sequence in enumerate(sequences):
+        seq_type, seq_ids = _entity_ids(sequence)
+        for seq_id in seq_ids:
+            if seq_id in entity_ids:
+                issues.append(ValidationIssue(
+                    f"{path}.sequences[{index}].{seq_type}.id",
+                    f"Duplicate entity ID '{seq_id}'."))
+            entity_ids.add(seq_id)
+
+    bonds = value.get("bondedAtomPairs")
+    if not isinstance(bonds, list):
+        return
+    for index, pair in enumerate(bonds):
+        if not isinstance(pair, list):
+            continue
+        for num_atom, atom in enumerate(pair):
+            if not isinstance(atom, list) or not atom:
+                continue
+            if isinstance(atom[0], str) and atom[0] not in entity_ids:
+                issues.append(ValidationIssue(
+                    f"{path}.bondedAtomPairs[{index}][{num_atom}][0]",
+                    f"Unknown entity ID '{atom[0]}'."))
+
+
+class _BoundsSegment(object):
+    """
+    A list of positions or indices of a single entity that must lie
+    between a lower bound and a limit derived from the sequence length.
+    """
+    __slots__ = ("path", "suffix", "kind", "entity", "values", "minimum",
+                 "limit", "length")
+
+    def __init__(
+        self,
+        path: str,
+        suffix: str,
+        kind: str,
+        entity: str,
+        values: list,
+        minimum: int | None,
+        limit: int,
+        length: int
+    ):
+        self.path: str = path
+        self.suffix: str = suffix
+        self.kind: str = kind
+        self.entity: str = entity
+        self.values: list = values
+        self.minimum: int | None = minimum
+        self.limit: int = limit
+        self.length: int = length
+
+    def violations(self) -> list[int]:
+        # the extrema are computed without a Python loop for valid segments
+        try:
+            if ((self.minimum is None or min(self.values) >= self.minimum)
+                    and max(self.values) <= self.limit):
+                return []
+        except TypeError:
+            pass
+        minimum = self.minimum
+        return [index for index, value in enumerate(self.values)
+                if _is_int(value) and (value > self.limit or (
+                    minimum is not None and value < minimum))]
+
+    def issue(self, index: int) -> ValidationIssue:
+        return ValidationIssue(
+            f"{self.path}[{index}]{self.suffix}",
+            f"{self.kind} {self.values[index]} of {self.entity} is out of "
+            f"range for the sequence length {self.length}."
+        )
+
+
+def _bounds_segments(
+    sequences: list,
+    path: str,
+    lower: bool
+) -> list[_BoundsSegment]:
+    """
+    Collects the modification positions (1-based) and query indices of
+    templates (0-based) of all polymer entities. If `lower` is False, the
+    lower bounds are not checked.
+    """
+    segments = []
+    for index, sequence in enumerate(sequences):
+        seq_type, seq_ids = _entity_ids(sequence)
+        position_key = MODIFICATION_POSITION_KEYS.get(seq_type)
+        if position_key is None or not isinstance(sequence[seq_type], dict):
+            continue
+        content = sequence[seq_type]
+        seq_str = content.get("sequence")
+        if not isinstance(seq_str, str):
+            continue
+
+        entity_path = f"{path}.sequences[{index}].{seq_type}"
+        entity = f"entity {','.join(seq_ids)}" if seq_ids else "the entity"
+        length = len(seq_str)
+        modifications = content.get("modifications")
+        if isinstance(modifications, list) and modifications:
+            positions = [modification.get(position_key)
+                         if isinstance(modification, dict) else None
+                         for modification in modifications]
+            segments.append(_BoundsSegment(
+                f"{entity_path}.modifications", f".{position_key}",
+                "Position", entity, positions, 1 if lower else None,
+                length, length
+            ))
+        templates = content.get("templates")
+        if not isinstance(templates, list):
+            continue
+        for num_template, template in enumerate(templates):
+            if not isinstance(template, dict):
+                continue
+            qidx = template.get("queryIndices")
+            if isinstance(qidx, list) and qidx:
+                segments.append(_BoundsSegment(
+                    f"{entity_path}.templates[{num_template}].queryIndices",
+                    "", "Query index", entity, qidx, 0 if lower else None,
+                    length - 1, length
+                ))
+    return segments
+
+
+def _check_bounds(
+    sequences: list,
+    path: str,
+    lower: bool = True
+) -> list[ValidationIssue]:
+    return [segment.issue(index)
+            for segment in _bounds_segments(sequences, path, lower)
+            for index in segment.violations()]
+
+
+def check_bounds(data: Any) -> list[ValidationIssue]:
+    """
+    Checks that the positions of all modifications (starting at 1) and the
+    query indices of all templates (starting at 0) lie within the sequences
+    of their entities.
+
+    The positions and indices of each entity are collected first and
+    only compared element-wise if their minimum or maximum is out of
+    range, so that valid documents are checked without iterating over
+    the index lists in Python. This check is part of
+    `validate_data`, but can be used separately, e.g. for the dictionary
+    of an `InputFile` before it is written. The template indices cannot
+    be checked, as this would require parsing the mmCIF data.
+
+    Parameters
+    ----------
+    data : Any
+        The parsed JSON document or the dictionary of an input file.
+
+    Returns
+    -------
+    list of ValidationIssue
+        An issue for each position or index that is out of range,
+        containing the entity IDs.
+    """
+    if not isinstance(data, dict) or not isinstance(data.get("sequences"), list):
+        return []
+    return _check_bounds(data["sequences"], "$")
+
+
+def _compile_schema() -> Validator:
+    """
+    Compiles the validator of complete AlphaFold3 input files.
+
+    Returns
+    -------
+    Validator
+        The validator of the top-level object.
+    """
+    entity_id = _either(
+        _string(pattern=ENTITY_ID_PATTERN),
+        _list_of(_string(pattern=ENTITY_ID_PATTERN), min_length=1)
+    )
+    position = _integer(minimum=1)
+    index = _integer(minimum=0)
+
+    protein_modification = _object({"ptmType": _string(non_empty=True),
+                                    "ptmPosition": position})
+    nucleotide_modification = _object({"modificationType": _string(non_empty=True),
+                                       "basePosition": position})
+    template = _object(
+        required={"queryIndices": _list_of(index),
+                  "templateIndices": _list_of(index)},
+        optional={"mmcif": _string(), "mmcifPath": _string(non_empty=True)},
+        one_of=(("mmcif", "mmcifPath"),),
+        check=_check_template
+    )
+    unpaired_msa = {"unpairedMsa": _string(),
+                    "unpairedMsaPath": _string(non_empty=True)}
+    paired_msa = {"pairedMsa": _string(),
+                  "pairedMsaPath": _string(non_empty=True)}
+    polymer = {"id": entity_id, "sequence": _string(non_empty=True)}
+
+    protein = _object(
+        required=polymer,
+        optional={"modifications": _list_of(protein_modification),
+                  "templates": _list_of(template),
+                  "description": _string(),
+                  **unpaired_msa, **paired_msa},
+        exclusive=(("unpairedMsa", "unpairedMsaPath"),
+                   ("pairedMsa", "pairedMsaPath")),
+        check=_check_sequence(SequenceType.PROTEIN)
+    )
+    rna = _object(
+        required=polymer,
+        optional={"modifications": _list_of(nucleotide_modification),
+                  "description": _string(),
+                  **unpaired_msa},
+        exclusive=(("unpairedMsa", "unpairedMsaPath"),),
+        check=_check_sequence(SequenceType.RNA)
+    )
+    dna = _object(
+        required=polymer,
+        optional={"modifications": _list_of(nucleotide_modification),
+                  "description": _string()},
+        check=_check_sequence(SequenceType.DNA)
+    )
+    ligand = _object(
+        required={"id": entity_id},
+        optional={"ccdCodes": _list_of(_string(non_empty=True), min_length=1),
+                  "smiles": _string(non_empty=True),
+                  "description": _string()},
+        one_of=(("ccdCodes", "smiles"),)
+    )
+    atom = _tuple_of(_string(pattern=ENTITY_ID_PATTERN), position,
+                     _string(non_empty=True))
+
+    return _object(
+        required={
+            "name": _string(non_empty=True),
+            "version": _integer(minimum=1),
+            "dialect": _string(choices=(SUPPORTED_DIALECT,)),
+            "modelSeeds": _list_of(_integer(minimum=0), min_length=1),
+            "sequences": _list_of(_entity({
+                SequenceType.PROTEIN.value: protein,
+                SequenceType.RNA.value: rna,
+                SequenceType.DNA.value: dna,
+                "ligand": ligand,
+            }), min_length=1),
+        },
+        optional={
+            "bondedAtomPairs": _list_of(_tuple_of(atom, atom)),
+            "userCCD": _string(),
+            "userCCDPath": _string(non_empty=True),
+        },
+        exclusive=(("userCCD", "userCCDPath"),),
+        nullable=("bondedAtomPairs",),
+        check=_check_document
+    )
+
+
+# the schema is compiled once when the module is imported
+_validate_document: Validator = _compile_schema()
+
+
+def validate_data(data: Any) -> list[ValidationIssue]:
+    """
+    Validates the structure of a parsed AlphaFold3 input file.
+
+    All entity types, modifications, templates, MSAs and bonded atom pairs
+    are checked in a single pass over the dictionary. Unknown fields,
+    missing required fields, invalid types, mutually exclusive fields,
+    invalid sequence characters, out-of-range positions and query indices
+    (see `check_bounds`), duplicate entity IDs and bonds to unknown
+    entities are reported.
+
+    Parameters
+    ----------
+    data : Any
+        The parsed JSON document.
+
+    Returns
+    -------
+    list of ValidationIssue
+        The issues found in the document. The list is empty if the
+        document is valid.
+    """
+    issues = []
+    _validate_document(data, "$", issues)
+    return issues
+
+
+def validate_file(
+    filename: str,
+    backend: str | None = None
+) -> list[ValidationIssue]:
+    """
+    Reads and validates an AlphaFold3 input file. Files that cannot be
+    read or parsed are reported as a single issue at the document root.
+
+    Parameters
+    ----------
+    filename : str
+        The path to the (compressed) JSON file.
+    backend : str or None, optional
+        The name of the JSON backend. If None, the default backend is used.
+
+    Returns
+    -------
+    list of ValidationIssue
+        The issues found in the file.
+    """
+    try:
+        data = read_raw(filename, backend=backend)
+    except Exception as e:
+        return [ValidationIssue("$", f"{e.__class__.__name__}: {e}")]
+    return validate_data(data)
+
+
+def _validate_one(
+    filename: str,
+    backend: str | None
+) -> tuple[str, list[dict]]:
+    return filename, [issue.to_dict()
+                      for issue in validate_file(filename, backend)]
+
+
+class ValidationReport(object):
+    """
+    Summarizes the validation of many input files.
+
+    Attributes
+    ----------
+    num_files : int
+        The number of validated files.
+    elapsed : float
+        The wall time of the validation in seconds.
+    invalid : dict of str to list of dict
+        The issues of each invalid file, given as dictionaries with
+        the keys "path" and "message".
+    """
+    def __init__(self):
+        self.num_files: int = 0
+        self.elapsed: float = 0.0
+        self.invalid: dict[str, list[dict]] = {}
+
+    @property
+    def num_invalid(self) -> int:
+        return len(self.invalid)
+
+    def to_dict(self) -> dict:
+        return {
+            "numFiles": self.num_files,
+            "numInvalid": self.num_invalid,
+            "elapsed": round(self.elapsed, 3),
+            "invalid": [
+                {"file": filename, "errors": issues}
+                for filename, issues in self.invalid.items()
+            ]
+        }
+
+    def __str__(self) -> str:
+        return (f"{self.num_files} files in {self.elapsed:.2f} s "
+                f"({self.num_invalid} invalid)")
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}({self.num_files})>"
+
+
+def validate_many(
+    paths: str | Iterable[str],
+    workers: int | None = None,
+    backend: str | None = None
+) -> ValidationReport:
+    """
+    Validates many input files using a process pool.
+
+    Parameters
+    ----------
+    paths : str or iterable of str
+        A directory, in which all (compressed) JSON files are validated,
+        a glob pattern or an iterable of file paths.
+    workers : int or None, optional
+        The number of worker processes. If None, the number of CPUs is used.
+        With a single worker, all files are validated in the current process.
+    backend : str or None, optional
+        The name of the JSON backend. If None, the default backend is used.
+
+    Returns
+    -------
+    ValidationReport
+        The number of validated files and the issues of invalid files.
+    """
+    report = ValidationReport()
+    filenames = expand_paths(paths)
+
+    start = time.perf_counter()
+    if workers == 1:
+        results = (_validate_one(filename, backend) for filename in filenames)
+        _collect_results(report, results)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                _validate_one, filenames, repeat(backend),
+                chunksize=VALIDATE_CHUNKSIZE
+            )
+            _collect_results(report, results)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def _collect_results(
+    report: ValidationReport,
+    results: Iterable[tuple[str, list[dict]]]
+) -> None:
+    for filename, issues in results:
+        report.num_files += 1
+        if issues:
+            report.invalid[filename] = issues
+
+
+def write_report(report: ValidationReport, filename: str | None) -> None:
+    """
+    Writes the validation report as JSON document.
+
+    Parameters
+    ----------
+    report : ValidationReport
+        The validation report.
+    filename : str or None
+        The path of the report file. If None, the report is printed
+        to the standard output.
+    """
+    content = json.dumps(report.to_dict(), indent=4)
+    if filename is None:
+        print(content)
+        return
+    with open(filename, "w") as report_file:
+        report_file.write(content + "\n")
@@ -0,0 +1,101 @@
+from pathlib import Path
+
+import pytest
+
+from af3cli import InputFile, ProteinSequence, Template, TemplateType
+from af3cli.align import align_sequences, align_template, align_templates
+from af3cli.exception import AFTemplateError
+
+MMCIF_STR = """\
+data_TEST
+loop_
+_atom_site.group_PDB
+_atom_site.id
+_atom_site.label_atom_id
+_atom_site.label_comp_id
+_atom_site.label_asym_id
+_atom_site.label_entity_id
+_atom_site.label_seq_id
+_atom_site.auth_asym_id
+ATOM 1 CA HIS A 1 1 A
+ATOM 2 CA HIS A 1 2 A
+ATOM 3 CA GLY A 1 3 A
+ATOM 4 CA VAL A 1 4 A
+ATOM 5 CA ASN A 1 5 A
+ATOM 6 CA GLY A 1 6 A
+ATOM 7 CA PHE A 1 7 A
+ATOM 8 CA GLY A 1 8 A
+ATOM 9 CA ARG A 1 9 A
+"""
+
+
+@pytest.mark.parametrize("query,target,expected", [
+    ("MVKVGVNGFGRIGR", "GVNGFGR",
+     ([4, 5, 6, 7, 8, 9, 10], [0, 1, 2, 3, 4, 5, 6])),
+    # deletion within the target
+    ("MVKVGVNGFGRIGRLVTRAAF", "MVKVGVNGFRLVTRAAF",
+     ([*range(9), *range(13, 21)], list(range(17)))),
+    # unaligned termini of both sequences
+    ("AAAAMVKVGVNGFGRIGR", "HHHHHHMVKVGVNGFGRIGR",
+     (list(range(4, 18)), list(range(6, 20)))),
+    ("MVKV", "", ([], [])),
+])
+def test_align_sequences(query: str, target: str,
+                         expected: tuple[list[int], list[int]]) -> None:
+    assert align_sequences(query, target) == expected
+    assert align_sequences(query, target, banded=False) == expected
+
+
+def test_align_sequences_banded() -> None:
+    query = "MVKVGVNGFGRIGRLVTRAAFNSGKVDIVAINDPFIDLNYMVYMFQYDSTHGKFHGTVKAEN"
+    # substitutions, an insertion and a deletion within the target
+    target = query[5:20] + "GSGSGS" + query[20:30] + query[36:55].replace(
+        "Y", "F")
+    banded = align_sequences(query, target)
+    assert banded == align_sequences(query, target, banded=False)
+    assert banded[0][:3] == [5, 6, 7] and banded[1][:3] == [0, 1, 2]
+    assert 36 in banded[0] and 30 not in banded[0]
+
+
+def test_align_template(tmp_path: Path) -> None:
+    template = Template(TemplateType.STRING, MMCIF_STR, [], [])
+    align_template(template, "MVKVGVNGFGRIGR")
+    assert template.qidx == [4, 5, 6, 7, 8, 9, 10]
+    assert template.tidx == [2, 3, 4, 5, 6, 7, 8]
+
+    filename = tmp_path / "template.cif"
+    filename.write_text(MMCIF_STR)
+    template = Template(TemplateType.FILE, str(filename), [], [])
+    assert align_template(template, "GVNGF", chain="A").qidx == \
+        [0, 1, 2, 3, 4]
+    with pytest.raises(AFTemplateError):
+        align_template(template, "GVNGF", chain="B")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_align_templates(tmp_path: Path, workers: int) -> None:
+    filename = tmp_path / "template.cif"
+    filename.write_text(MMCIF_STR)
+    afinput = InputFile()
+    afinput.sequences.append(ProteinSequence("MVKVGVNGFGRIGR", templates=[
+        Template(TemplateType.STRING, MMCIF_STR, [], []),
+        Template(TemplateType.FILE, str(filename), [0], [0]),
+    ]))
+    afinput.sequences.append(ProteinSequence("GVNGF", templates=[
+        Template(TemplateType.FILE, str(filename), [], []),
+        Template(TemplateType.FILE, str(tmp_path / "missing.cif"), [], []),
+    ]))
+
+    report = align_templates(afinput, workers=workers)
+    assert (report.num_jobs, report.num_written, report.num_skipped) == \
+        (4, 2, 1)
+    assert [name for name, _ in report.failed] == ["job:1"]
+    assert " templates in " in str(report)
+    first, second = afinput.sequences[0].templates
+    assert first.tidx == [2, 3, 4, 5, 6, 7, 8]
+    assert second.qidx == [0]
+    assert afinput.sequences[1].templates[0].qidx == [0, 1, 2, 3, 4]
+
+    report = align_templates([afinput], workers=workers, overwrite=True)
+    assert report.num_written == 3
+    assert second.qidx == [4, 5, 6, 7, 8, 9, 10]
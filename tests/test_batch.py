@@ -0,0 +1,204 @@
+from pathlib import Path
+import pytest
+
+from af3cli import InputFile
+from af3cli.sequence import SequenceType
+from af3cli.ligand import LigandType
+from af3cli.ligand import CCDLigand
+from af3cli.batch import read_manifest, build_job, run_batch, fasta_split
+from af3cli.io import HASH_MANIFEST_NAME
+
+
+@pytest.fixture
+def csv_manifest(tmp_path: Path) -> Path:
+    manifest = tmp_path / "manifest.csv"
+    manifest.write_text(
+        "name,protein,dna,rna,smiles,ccd,seeds\n"
+        "job1,MVKVGVNGF;AAQAA,GACCTCT,,CCC,ATP,1;2\n"
+        "job2,MVKVGVNGF,,AUGUGUAU,,,\n"
+        ",XVKV1,,,,,\n"
+    )
+    return manifest
+
+
+@pytest.fixture
+def jsonl_manifest(tmp_path: Path) -> Path:
+    manifest = tmp_path / "manifest.jsonl"
+    manifest.write_text(
+        '{"name": "job1", "protein": ["MVKVGVNGF"], "ccd": "ATP;MG"}\n'
+        '\n'
+        '{"name": "job2", "output": "other.json", "seeds": [3]}\n'
+    )
+    return manifest
+
+
+def test_read_manifest_csv(csv_manifest: Path) -> None:
+    jobs = list(read_manifest(str(csv_manifest)))
+    assert len(jobs) == 3
+    assert jobs[0]["protein"] == ["MVKVGVNGF", "AAQAA"]
+    assert jobs[0]["seeds"] == ["1", "2"]
+    assert jobs[1]["dna"] == []
+    assert jobs[2]["name"] == "job_2"
+    assert jobs[2]["output"] == "job_2.json"
+
+
+def test_read_manifest_jsonl(jsonl_manifest: Path) -> None:
+    jobs = list(read_manifest(str(jsonl_manifest)))
+    assert len(jobs) == 2
+    assert jobs[0]["ccd"] == ["ATP", "MG"]
+    assert jobs[1]["output"] == "other.json"
+    assert jobs[1]["seeds"] == [3]
+
+
+def test_read_manifest_invalid(tmp_path: Path) -> None:
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("")
+    with pytest.raises(ValueError):
+        list(read_manifest(str(manifest)))
+
+
+def test_build_job(csv_manifest: Path) -> None:
+    job = next(read_manifest(str(csv_manifest)))
+    afinput = build_job(job)
+    assert afinput.name == "job1"
+    assert afinput.seeds == {1, 2}
+    assert [s.sequence_type for s in afinput.sequences] == [
+        SequenceType.PROTEIN, SequenceType.PROTEIN, SequenceType.DNA
+    ]
+    assert [lig.ligand_type for lig in afinput.ligands] == [
+        LigandType.SMILES, LigandType.CCD
+    ]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_batch(tmp_path: Path, csv_manifest: Path, workers: int) -> None:
+    outdir = tmp_path / "out"
+    report = run_batch(str(csv_manifest), outdir=str(outdir), workers=workers)
+    assert report.num_jobs == 3
+    assert len(report.failed) == 1
+    assert report.failed[0][0] == "job_2"
+    assert (outdir / "job1.json").exists()
+    assert not (outdir / "job_2.json").exists()
+    afinput = InputFile.read(str(outdir / "job2.json"))
+    assert len(afinput.sequences) == 2
+
+
+def test_run_batch_invalid_seeds(tmp_path: Path) -> None:
+    manifest = tmp_path / "manifest.csv"
+    manifest.write_text("name,protein,seeds\njob1,MVKV,x\njob2,MVKV,1\n")
+    outdir = tmp_path / "out"
+    report = run_batch(str(manifest), outdir=str(outdir), workers=1)
+    assert (report.num_jobs, report.num_written) == (2, 1)
+    assert report.failed[0][0] == "job1"
+    assert "ValueError" in report.failed[0][1]
+    assert InputFile.read(str(outdir / "job2.json")).seeds == {1}
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_batch_duplicate_output(tmp_path: Path, workers: int) -> None:
+    manifest = tmp_path / "manifest.csv"
+    manifest.write_text("name,protein,output\n"
+                        "j,MVKV,\nj,GGGG,\nk,AAAA,j.json\nl,CCCC,\n")
+    outdir = tmp_path / "out"
+    report = run_batch(str(manifest), outdir=str(outdir), workers=workers)
+    assert (report.num_jobs, report.num_written) == (4, 2)
+    assert [name for name, _ in report.failed] == ["j", "k"]
+    assert "already written by job 'j'" in report.failed[0][1]
+    afinput = InputFile.read(str(outdir / "j.json"))
+    assert afinput.sequences[0].sequence == "MVKV"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_batch_incremental(
+        tmp_path: Path,
+        csv_manifest: Path,
+        workers: int
+) -> None:
+    outdir = tmp_path / "out"
+    report = run_batch(str(csv_manifest), outdir=str(outdir),
+                       workers=workers, incremental=True)
+    assert (report.num_written, report.num_skipped) == (2, 0)
+    assert (outdir / HASH_MANIFEST_NAME).exists()
+    mtime = (outdir / "job1.json").stat().st_mtime_ns
+
+    report = run_batch(str(csv_manifest), outdir=str(outdir),
+                       workers=workers, incremental=True)
+    assert (report.num_written, report.num_skipped) == (0, 2)
+    assert (outdir / "job1.json").stat().st_mtime_ns == mtime
+
+    # deleted files and changed content are written again
+    (outdir / "job2.json").unlink()
+    csv_manifest.write_text(csv_manifest.read_text().replace("ATP", "MG"))
+    report = run_batch(str(csv_manifest), outdir=str(outdir),
+                       workers=workers, incremental=True)
+    assert (report.num_written, report.num_skipped) == (2, 0)
+
+
+@pytest.fixture
+def fasta_records(tmp_path: Path) -> Path:
+    fasta = tmp_path / "records.fasta"
+    fasta.write_text(
+        ">sp|P1|protein\nMVKVGVNGF\nGRIGR\n"
+        ">dna1\nGACCTCT\n"
+        ">invalid\nXVKV1\n"
+    )
+    return fasta
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_fasta_split(tmp_path: Path, fasta_records: Path, workers: int) -> None:
+    base = InputFile(seeds=[3, 4])
+    base.ligands.append(CCDLigand(["ATP"], seq_id=["L"]))
+    outdir = tmp_path / "out"
+    report = fasta_split(str(fasta_records), outdir=str(outdir), base=base,
+                         prefix="job_", workers=workers)
+    assert (report.num_jobs, report.num_written) == (3, 2)
+    assert report.failed[0][0] == "invalid"
+    assert "position" in report.failed[0][1]
+
+    afinput = InputFile.read(str(outdir / "job_sp_P1_protein.json"))
+    assert afinput.name == "job_sp_P1_protein"
+    assert afinput.seeds == {3, 4}
+    assert afinput.sequences[0].sequence == "MVKVGVNGFGRIGR"
+    assert afinput.ligands[0].get_id() == ["L"]
+    afinput = InputFile.read(str(outdir / "job_dna1.json"))
+    assert afinput.sequences[0].sequence_type == SequenceType.DNA
+
+
+def test_fasta_split_path_separators(tmp_path: Path) -> None:
+    fasta = tmp_path / "records.fasta"
+    fasta.write_text(">sp|P12345|X_HUMAN/1-4\nMVKV\n")
+    outdir = tmp_path / "out"
+    report = fasta_split(str(fasta), outdir=str(outdir), workers=1)
+    assert (report.num_written, report.failed) == (1, [])
+    assert str(report).startswith("1 records in ")
+    afinput = InputFile.read(str(outdir / "sp_P12345_X_HUMAN_1-4.json"))
+    assert afinput.name == "sp_P12345_X_HUMAN_1-4"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_fasta_split_duplicate_ids(tmp_path: Path, workers: int) -> None:
+    fasta = tmp_path / "records.fasta"
+    fasta.write_text(">sp|P1|X_HUMAN\nMVKV\n>dna1\nGACCT\n"
+                     ">sp|P1|X_HUMAN\nGGGG\n>sp_P1_X_HUMAN\nAAAA\n")
+    outdir = tmp_path / "out"
+    for _ in range(2):
+        report = fasta_split(str(fasta), outdir=str(outdir),
+                             workers=workers, incremental=True)
+        assert report.num_jobs == 4
+        assert [name for name, _ in report.failed] == \
+            ["sp|P1|X_HUMAN", "sp_P1_X_HUMAN"]
+        assert "already written by record" in report.failed[0][1]
+    assert (report.num_written, report.num_skipped) == (0, 2)
+    afinput = InputFile.read(str(outdir / "sp_P1_X_HUMAN.json"))
+    assert afinput.sequences[0].sequence == "MVKV"
+
+
+def test_fasta_split_incremental(tmp_path: Path, fasta_records: Path) -> None:
+    outdir = tmp_path / "out"
+    report = fasta_split(str(fasta_records), outdir=str(outdir),
+                         workers=2, incremental=True)
+    assert (report.num_written, report.num_skipped) == (2, 0)
+    report = fasta_split(str(fasta_records), outdir=str(outdir),
+                         workers=1, incremental=True)
+    assert (report.num_written, report.num_skipped) == (0, 2)
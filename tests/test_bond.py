@@ -55,3 +55,13 @@ def test_bond_as_list(bond: Bond) -> None:
     assert isinstance(lst[1], list)
     assert lst[0][0] == bond.atom1.eid
     assert lst[1][0] == bond.atom2.eid
+
+
+@pytest.mark.parametrize("obj", [
+    Atom("A", 1, "CA"),
+    Bond(Atom("A", 1, "CA"), Atom("B", 2, "O"))
+])
+def test_bond_slots(obj: Atom | Bond) -> None:
+    assert not hasattr(obj, "__dict__")
+    with pytest.raises(AttributeError):
+        obj.unknown = None
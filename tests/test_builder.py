@@ -6,6 +6,7 @@ from af3cli.input import InputFile
 from af3cli.bond import Atom, Bond
 from af3cli.ligand import Ligand, LigandType, CCDLigand, SMILigand
 from af3cli.sequence import Sequence, SequenceType
+from af3cli.sequence import ProteinSequence, DNASequence, ResidueModification
 
 
 @pytest.fixture(scope="module")
@@ -144,3 +145,45 @@ def test_builder_reset_ids(
     for seq_type in [curr_input.sequences, curr_input.ligands]:
         for entry in seq_type:
             assert entry.get_id() is None
+
+
+def _collapse_input() -> InputFile:
+    afinput = InputBuilder() \
+        .add_sequence(ProteinSequence("MVKVGVNGF")) \
+        .add_sequence(DNASequence("GACCTCT")) \
+        .add_sequence(ProteinSequence("MVKVGVNGF", seq_id=["Z"])) \
+        .add_sequence(ProteinSequence(
+            "MVKVGVNGF", modifications=[ResidueModification("SEP", 2)])) \
+        .add_ligand(CCDLigand(["ATP"])) \
+        .add_ligand(CCDLigand(["ATP"], seq_id=["L"])) \
+        .add_bonded_atom_pair(Bond.from_string("L:1:C1-Z:1:CA")) \
+        .build()
+    return afinput
+
+
+def _entity_ids(afinput: InputFile) -> list[list[str]]:
+    return [next(iter(entry.values()))["id"]
+            for entry in afinput.to_dict()["sequences"]]
+
+
+def test_input_collapse_identical() -> None:
+    afinput = _collapse_input()
+    assert _entity_ids(afinput) == [["A"], ["B"], ["Z"], ["C"], ["D"], ["L"]]
+
+    assert afinput.collapse_identical() == 2
+    assert len(afinput.sequences) == 3
+    assert afinput.sequences[0].num == 2
+    assert _entity_ids(afinput) == [["A", "Z"], ["B"], ["C"], ["D", "L"]]
+    assert afinput.to_dict()["bondedAtomPairs"] == [
+        [["L", 1, "C1"], ["Z", 1, "CA"]]
+    ]
+    assert afinput.collapse_identical() == 0
+
+
+def test_input_collapse_identical_relabel() -> None:
+    afinput = _collapse_input()
+    assert afinput.collapse_identical(relabel=True) == 2
+    assert _entity_ids(afinput) == [["A", "B"], ["C"], ["D"], ["E", "F"]]
+    assert afinput.to_dict()["bondedAtomPairs"] == [
+        [["F", 1, "C1"], ["B", 1, "CA"]]
+    ]
@@ -0,0 +1,112 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from af3cli import InputFile, InputBuilder, ProteinSequence, RNASequence
+from af3cli import DNASequence, MSA, Template, TemplateType, SequenceType
+from af3cli.cache import MSACache, harvest, attach_cached, sequence_hash
+
+PROTEIN_STR = "MVKVGVNGFGRIGRL"
+MSA_STR = f">query\n{PROTEIN_STR}\n>hit\nMVKVGVNGFGRIGRV\n"
+RNA_MSA_STR = ">query\nAUGC\n>hit\nAUGG\n"
+MMCIF_STR = "data_test\n_entry.id test\n"
+
+
+def _data_file(directory: Path, name: str) -> Path:
+    # mimics the output of the AlphaFold3 data pipeline
+    afinput = InputFile(name=name)
+    afinput.sequences.append(ProteinSequence(
+        PROTEIN_STR,
+        msa=MSA(unpaired=MSA_STR),
+        templates=[Template(TemplateType.STRING, MMCIF_STR, [0, 1], [2, 3])]
+    ))
+    afinput.sequences.append(RNASequence(
+        "AUGC", msa=MSA(unpaired="msa.a3m", unpaired_is_path=True)
+    ))
+    afinput.sequences.append(DNASequence("ACGT"))
+    filename = directory / name / f"{name}_data.json"
+    filename.parent.mkdir(parents=True)
+    afinput.write(str(filename))
+    return filename
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path) -> str:
+    outdir = tmp_path / "output"
+    _data_file(outdir, "job1")
+    _data_file(outdir, "job2")
+    # files that are not written by the data pipeline are ignored
+    (outdir / "job1" / "job1_model.json").write_text("{}")
+
+    report, cache = harvest(str(outdir), str(tmp_path / "cache"))
+    assert (report.num_jobs, report.num_written, report.failed) == (2, 2, [])
+    assert len(cache) == 2
+    return cache.root
+
+
+def test_harvest(cache_dir: str, tmp_path: Path) -> None:
+    cache = MSACache(cache_dir)
+    assert len(cache) == 2
+    assert cache.get(SequenceType.DNA, "ACGT") is None
+
+    entry = cache.get(SequenceType.PROTEIN, PROTEIN_STR)
+    assert Path(entry["unpairedMsaPath"]).read_text() == MSA_STR
+    assert Path(entry["pairedMsaPath"]).read_text() == ""
+    template, = entry["templates"]
+    assert Path(template["mmcifPath"]).read_text() == MMCIF_STR
+    assert (template["queryIndices"], template["templateIndices"]) == \
+        ([0, 1], [2, 3])
+
+    # relative paths are resolved against the directory of the data file
+    entry = cache.get(SequenceType.RNA, "AUGC")
+    assert entry["unpairedMsaPath"] == \
+        str(tmp_path / "output" / "job2" / "msa.a3m")
+    assert "templates" not in entry
+    assert cache.index[SequenceType.RNA.value] == {
+        sequence_hash("AUGC"): entry
+    }
+
+
+def test_attach_cached(cache_dir: str) -> None:
+    existing = MSA(unpaired=MSA_STR)
+    afinput = InputFile()
+    afinput.sequences.append(ProteinSequence(PROTEIN_STR))
+    afinput.sequences.append(RNASequence("AUGC", msa=existing))
+    afinput.sequences.append(RNASequence("AUGU"))
+    afinput.sequences.append(DNASequence("ACGT"))
+
+    assert attach_cached(afinput, cache_dir) == 1
+    protein = afinput.sequences[0].to_dict()["protein"]
+    assert set(protein) >= {"pairedMsaPath", "unpairedMsaPath", "templates"}
+    assert protein["templates"][0]["queryIndices"] == [0, 1]
+    assert os.path.isabs(protein["templates"][0]["mmcifPath"])
+    assert afinput.sequences[1].msa is existing
+    assert afinput.sequences[2].msa is None
+
+    assert attach_cached(afinput, MSACache(cache_dir), overwrite=True) == 2
+    assert afinput.sequences[1].msa.unpaired_is_path
+
+
+def test_attach_cached_templates(cache_dir: str) -> None:
+    template = Template(TemplateType.STRING, MMCIF_STR, [0], [0])
+    afinput = InputFile()
+    afinput.sequences.append(ProteinSequence(PROTEIN_STR,
+                                             templates=[template]))
+
+    assert attach_cached(afinput, cache_dir) == 1
+    assert afinput.sequences[0].msa.unpaired_is_path
+    assert afinput.sequences[0].templates == [template]
+
+    assert attach_cached(afinput, cache_dir, overwrite=True) == 1
+    template, = afinput.sequences[0].templates
+    assert template.template_type == TemplateType.FILE
+
+
+def test_builder_attach_cached(cache_dir: str) -> None:
+    afinput = (InputBuilder()
+               .add_sequence(ProteinSequence(PROTEIN_STR))
+               .attach_cached(cache_dir)
+               .build())
+    assert afinput.sequences[0].msa.unpaired_is_path
+    assert len(afinput.sequences[0].templates) == 1
@@ -1,10 +1,15 @@
 import json
 import io
+import pickle
 from pathlib import Path
 import pytest
 
-from af3cli import InputFile
-from af3cli.io import read_json, write_json
+from af3cli import InputFile, Atom, Bond, ProteinSequence, ResidueModification
+from af3cli.io import read_json, write_json, iter_json, read_many
+from af3cli.io import HashManifest, content_hash
+from af3cli.lazy import LazyString
+from af3cli.backend import get_json_backend, set_json_backend
+from af3cli.backend import get_encoder_backend
 
 
 @pytest.fixture(scope="module")
@@ -109,3 +114,246 @@ def test_json_rw(
     assert afinput.dialect == sample_data_dict["dialect"]
     assert sorted(list(afinput.seeds)) == sorted(sample_data_dict["modelSeeds"])
     assert len(afinput.sequences) == len(sample_data_dict["sequences"])
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_json_stream_write(
+        tmp_file_write: Path,
+        tmp_file_read: Path,
+        compact: bool
+) -> None:
+    afinput = read_json(str(tmp_file_read.resolve()))
+    afinput.bonded_atoms.append(Bond(Atom("A", 1, "CA"), Atom("G", 1, "C1")))
+    afinput.user_ccd = "data_\nCCD"
+    write_json(str(tmp_file_write), afinput, compact=compact)
+
+    content = tmp_file_write.read_text()
+    if compact:
+        assert "\n" not in content
+        assert json.loads(content) == afinput.to_dict()
+    else:
+        assert content == json.dumps(afinput.to_dict(), indent=4)
+
+
+def test_json_stream_default_indent(tmp_file_lazy: Path) -> None:
+    # the indented output does not depend on the installed libraries
+    afinput = read_json(str(tmp_file_lazy))
+    afinput.name = "caf\u00e9"
+    content = b"".join(iter_json(afinput)).decode()
+    assert content == json.dumps(afinput.to_dict(), indent=4)
+    assert get_encoder_backend(compact=True).name == get_json_backend().name
+
+
+def test_json_stream_empty() -> None:
+    afinput = InputFile()
+    content = b"".join(iter_json(afinput)).decode()
+    assert content == json.dumps(afinput.to_dict(), indent=4)
+
+
+@pytest.fixture
+def tmp_file_lazy(tmp_path: Path) -> Path:
+    content = {
+        "name": "lazy \"mmcif\": \"x",
+        "version": 1,
+        "dialect": "alphafold3",
+        "modelSeeds": [1],
+        "sequences": [
+            {"protein": {
+                "id": ["A"],
+                "sequence": "MVKVGVNGF",
+                "unpairedMsa": ">query\nMVKVGVNGF\n>\"hit\\\"\nMVKV-VNGF\n",
+                "pairedMsa": "",
+                "templates": [{
+                    "mmcif": "data_test\n_entry.id \"test\"\n",
+                    "queryIndices": [0, 1],
+                    "templateIndices": [0, 1]
+                }]
+            }},
+        ],
+        "userCCD": "data_CCD\n\\\\"
+    }
+    tmp_file = tmp_path / "test_lazy.json"
+    with open(tmp_file, "w") as json_file:
+        json.dump(content, json_file, indent=4)
+    return tmp_file
+
+
+def test_json_lazy_read(tmp_file_lazy: Path) -> None:
+    eager = read_json(str(tmp_file_lazy))
+    afinput = read_json(str(tmp_file_lazy), lazy=True)
+    msa = afinput.sequences[0].msa
+    template = afinput.sequences[0].templates[0]
+    assert isinstance(msa._unpaired, LazyString)
+    assert isinstance(template._mmcif, LazyString)
+    assert isinstance(afinput._user_ccd, LazyString)
+    assert afinput.name == eager.name
+    assert msa.unpaired == eager.sequences[0].msa.unpaired
+    assert template.mmcif == eager.sequences[0].templates[0].mmcif
+    assert afinput.user_ccd == eager.user_ccd
+    assert isinstance(msa._unpaired, str)
+
+
+def test_json_lazy_rw(tmp_file_lazy: Path, tmp_file_write: Path) -> None:
+    expected = read_json(str(tmp_file_lazy)).to_dict()
+    afinput = InputFile.read(str(tmp_file_lazy), lazy=True)
+    afinput.write(str(tmp_file_write))
+    assert json.loads(tmp_file_write.read_text()) == expected
+
+    # overwrite the memory-mapped file itself
+    afinput.seeds.add(2)
+    afinput.write(str(tmp_file_lazy), compact=True)
+    expected["modelSeeds"] = [1, 2]
+    assert json.loads(tmp_file_lazy.read_text()) == expected
+
+
+def test_json_lazy_copy(tmp_file_lazy: Path) -> None:
+    afinput = read_json(str(tmp_file_lazy), lazy=True)
+    other = InputFile()
+    other.merge(afinput, userccd=True)
+    assert other.user_ccd == afinput.user_ccd
+    restored = pickle.loads(pickle.dumps(afinput))
+    assert restored.sequences[0].msa._unpaired == afinput.sequences[0].msa.unpaired
+
+
+@pytest.mark.parametrize("backend", ["json", "orjson", "ujson", "auto"])
+@pytest.mark.parametrize("compact", [False, True])
+def test_json_backend_rw(
+        tmp_file_lazy: Path,
+        tmp_file_write: Path,
+        backend: str,
+        compact: bool
+) -> None:
+    try:
+        get_json_backend(backend)
+    except ImportError:
+        pytest.skip(f"{backend} is not installed")
+    expected = read_json(str(tmp_file_lazy), backend="json").to_dict()
+    for lazy in [False, True]:
+        afinput = read_json(str(tmp_file_lazy), lazy=lazy, backend=backend)
+        write_json(str(tmp_file_write), afinput,
+                   compact=compact, backend=backend)
+        assert json.loads(tmp_file_write.read_text()) == expected
+
+
+def test_json_backend_select() -> None:
+    with pytest.raises(ValueError):
+        get_json_backend("unknown")
+    try:
+        assert set_json_backend("json").name == "json"
+        assert get_json_backend().name == "json"
+    finally:
+        set_json_backend("auto")
+
+
+@pytest.mark.parametrize("ext,magic", [
+    ("json.gz", b"\x1f\x8b"),
+    ("json.bz2", b"BZh"),
+    ("json.xz", b"\xfd7zXZ"),
+])
+def test_json_compressed_rw(
+        tmp_path: Path,
+        tmp_file_lazy: Path,
+        ext: str,
+        magic: bytes
+) -> None:
+    expected = read_json(str(tmp_file_lazy)).to_dict()
+    filename = tmp_path / f"test_compressed.{ext}"
+    InputFile.read(str(tmp_file_lazy), lazy=True).write(str(filename))
+    assert filename.read_bytes().startswith(magic)
+    for lazy in [False, True]:
+        afinput = InputFile.read(str(filename), lazy=lazy)
+        assert afinput.to_dict() == expected
+
+
+@pytest.fixture(scope="module")
+def tmp_dir_many(tmp_path_factory) -> Path:
+    tmp_dir = tmp_path_factory.mktemp("many")
+    for i in range(10):
+        afinput = InputFile(name=f"job{i}")
+        afinput.sequences.append(ProteinSequence("MVKVGVNGFGRIGRL"))
+        afinput.write(str(tmp_dir / f"job{i}.json"))
+    (tmp_dir / "invalid.json").write_text("{")
+    (tmp_dir / "notes.txt").write_text("not an input file")
+    return tmp_dir
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_read_many(tmp_dir_many: Path, executor: str) -> None:
+    results = list(read_many(str(tmp_dir_many), workers=2, prefetch=3,
+                             executor=executor))
+    assert len(results) == 11
+    paths = [path for path, _ in results]
+    assert paths == sorted(paths)
+    errors = {path: r for path, r in results if isinstance(r, Exception)}
+    assert list(errors) == [str(tmp_dir_many / "invalid.json")]
+    names = {r.name for _, r in results if isinstance(r, InputFile)}
+    assert names == {f"job{i}" for i in range(10)}
+
+
+def test_read_many_unordered(tmp_dir_many: Path) -> None:
+    pattern = str(tmp_dir_many / "job*.json")
+    results = list(read_many(pattern, workers=4, ordered=False))
+    assert sorted(path for path, _ in results) == \
+           sorted(str(p) for p in tmp_dir_many.glob("job*.json"))
+    assert all(isinstance(r, InputFile) for _, r in results)
+
+
+def test_read_many_early_stop(tmp_dir_many: Path) -> None:
+    paths = [str(tmp_dir_many / f"job{i}.json") for i in range(10)]
+    reader = read_many(paths, workers=1, prefetch=2)
+    path, afinput = next(reader)
+    assert path == paths[0]
+    assert afinput.name == "job0"
+    reader.close()
+
+
+def test_read_many_invalid() -> None:
+    with pytest.raises(ValueError):
+        next(read_many([], executor="fiber"))
+    with pytest.raises(ValueError):
+        next(read_many([], prefetch=0))
+
+
+def test_content_hash(tmp_file_lazy: Path) -> None:
+    afinput = read_json(str(tmp_file_lazy))
+    digest = content_hash(afinput)
+    assert digest == content_hash(read_json(str(tmp_file_lazy), lazy=True))
+    afinput.name = "other"
+    assert digest != content_hash(afinput)
+
+
+def test_json_write_incremental(tmp_path: Path, tmp_file_lazy: Path) -> None:
+    afinput = read_json(str(tmp_file_lazy))
+    filename = tmp_path / "incremental.json"
+    assert afinput.write(str(filename), incremental=True)
+    # the existing file is compared independent of the formatting
+    assert not afinput.write(str(filename), compact=True, incremental=True)
+
+    hashes = HashManifest(str(tmp_path))
+    assert not write_json(str(filename), afinput, incremental=True,
+                          hashes=hashes)
+    hashes.save()
+    assert HashManifest(str(tmp_path)).get(str(filename)) == \
+           content_hash(afinput)
+
+    afinput.seeds.add(42)
+    assert write_json(str(filename), afinput, incremental=True, hashes=hashes)
+    assert read_json(str(filename)).seeds == afinput.seeds
+
+    # a precomputed hash is used instead of hashing the data again
+    digest = content_hash(afinput)
+    assert not write_json(str(filename), afinput, incremental=True,
+                          digest=digest)
+    assert write_json(str(filename), afinput, incremental=True,
+                      digest="other")
+
+
+def test_json_rw_modifications(tmp_file_write: Path) -> None:
+    afinput = InputFile()
+    afinput.sequences.append(ProteinSequence(
+        "MVKVGVNGFGRIGRL",
+        modifications=[ResidueModification("HY3", 2)]
+    ))
+    afinput.write(str(tmp_file_write))
+    modification = read_json(str(tmp_file_write)).sequences[0].modifications[0]
+    assert (modification.mod_str, modification.mod_pos) == ("HY3", 2)
@@ -0,0 +1,153 @@
+import gzip
+from pathlib import Path
+
+import pytest
+
+from af3cli.mmcif import trim_mmcif, mmcif_sequence
+from af3cli.exception import AFTemplateError
+
+MMCIF_STR = """\
+data_1ABC
+#
+_entry.id 1ABC
+#
+_pdbx_audit_revision_history.revision_date 2001-01-01
+#
+loop_
+_entity.id
+_entity.type
+_entity.pdbx_description
+1 polymer 'Protein A'
+2 polymer 'Protein B'
+#
+loop_
+_entity_poly.entity_id
+_entity_poly.type
+_entity_poly.pdbx_seq_one_letter_code
+1 polypeptide(L)
+;MVK
+;
+2 polypeptide(L)
+;GW
+;
+#
+loop_
+_entity_poly_seq.entity_id
+_entity_poly_seq.num
+_entity_poly_seq.mon_id
+1 1 MET
+1 2 VAL
+1 3 LYS
+2 1 GLY
+2 2 TRP
+#
+loop_
+_struct_asym.id
+_struct_asym.entity_id
+A 1
+B 2
+#
+_struct_keywords.text "not kept"
+#
+loop_
+_atom_site.group_PDB
+_atom_site.id
+_atom_site.label_atom_id
+_atom_site.label_comp_id
+_atom_site.label_asym_id
+_atom_site.label_entity_id
+_atom_site.label_seq_id
+_atom_site.auth_asym_id
+_atom_site.pdbx_PDB_model_num
+ATOM 1 N MET A 1 1 X 1
+ATOM 2 CA VAL A 1 2 X 1
+ATOM 3 "O5'" LYS A 1 3 X 1
+ATOM 4 CA GLY B 2 1 Y 1
+ATOM 5 CA TRP B 2 2 Y 1
+ATOM 6 N MET A 1 1 X 2
+#
+"""
+SINGLE_ENTITY_STR = """\
+data_2XYZ
+_entity_poly.entity_id 1
+_entity_poly.type polypeptide(L)
+#
+loop_
+_atom_site.group_PDB
+_atom_site.id
+_atom_site.label_asym_id
+_atom_site.label_entity_id
+ATOM 1 A 1
+ATOM 2 B 1
+"""
+
+
+@pytest.fixture
+def mmcif_file(tmp_path: Path) -> str:
+    filename = tmp_path / "1abc.cif"
+    filename.write_text(MMCIF_STR)
+    return str(filename)
+
+
+def test_trim_mmcif(mmcif_file: str) -> None:
+    trimmed = trim_mmcif(mmcif_file, "Y")
+    assert trimmed.startswith("data_1ABC\n")
+    assert "_pdbx_audit_revision_history.revision_date 2001-01-01" in trimmed
+    assert "_struct_keywords" not in trimmed
+    assert "'Protein B'" in trimmed and "Protein A" not in trimmed
+    assert ";GW\n;" in trimmed and "MVK" not in trimmed
+    assert "2 1 GLY" in trimmed and "1 1 MET" not in trimmed
+    assert "B 2\n" in trimmed and "A 1\n" not in trimmed
+    assert trimmed.count("ATOM") == 2
+
+    # only the first model is kept, quoted values are supported
+    trimmed = trim_mmcif(mmcif_file, "X")
+    assert trimmed.count("ATOM") == 3
+    assert "ATOM 3 \"O5'\" LYS A 1 3 X 1" in trimmed
+
+
+def test_trim_mmcif_categories(mmcif_file: str, tmp_path: Path) -> None:
+    trimmed = trim_mmcif(mmcif_file, "Y", categories=("_struct_keywords",))
+    assert "_struct_keywords.text" in trimmed and "_entry.id" not in trimmed
+
+    filename = tmp_path / "1abc.cif.gz"
+    filename.write_bytes(gzip.compress(MMCIF_STR.encode()))
+    assert trim_mmcif(str(filename), "Y") == trim_mmcif(mmcif_file, "Y")
+
+
+def test_trim_mmcif_label_asym(tmp_path: Path) -> None:
+    filename = tmp_path / "2xyz.cif"
+    filename.write_text(SINGLE_ENTITY_STR)
+    trimmed = trim_mmcif(str(filename), "B")
+    assert "_entity_poly.entity_id 1" in trimmed
+    assert "ATOM 2 B 1" in trimmed and "ATOM 1 A 1" not in trimmed
+
+
+def test_trim_mmcif_invalid(mmcif_file: str, tmp_path: Path) -> None:
+    with pytest.raises(AFTemplateError, match="Chain 'Z'"):
+        trim_mmcif(mmcif_file, "Z")
+
+    filename = tmp_path / "empty.cif"
+    filename.write_text("")
+    with pytest.raises(AFTemplateError, match="no atom sites"):
+        trim_mmcif(str(filename), "A")
+
+    filename.write_text(MMCIF_STR.replace("ATOM 4 CA GLY B 2 1 Y 1",
+                                          "ATOM 4 CA GLY B 2 1\nY 1"))
+    with pytest.raises(AFTemplateError, match="multiple lines"):
+        trim_mmcif(str(filename), "Y")
+
+
+def test_mmcif_sequence(mmcif_file: str) -> None:
+    assert mmcif_sequence(mmcif_file, is_path=True) == "MVK"
+    assert mmcif_sequence(mmcif_file, is_path=True, chain="Y") == "GW"
+    assert mmcif_sequence(trim_mmcif(mmcif_file, "Y")) == "GW"
+
+    # the resolved residues are used without polymer categories
+    start = MMCIF_STR.index("loop_\n_entity_poly_seq")
+    end = MMCIF_STR.index("loop_\n_struct_asym")
+    content = MMCIF_STR[:start] + MMCIF_STR[end:]
+    assert mmcif_sequence(content.replace("GLY", "SEP"), chain="Y") == "XW"
+
+    with pytest.raises(AFTemplateError, match="Chain 'Z'"):
+        mmcif_sequence(MMCIF_STR, chain="Z")
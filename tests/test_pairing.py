@@ -0,0 +1,103 @@
+from pathlib import Path
+
+import pytest
+
+from af3cli import InputFile, ProteinSequence, RNASequence, MSA
+from af3cli.pairing import species_key, pair_a3m, pair_msas, GAP_DESCRIPTION
+from af3cli.sequence import parse_a3m
+from af3cli.exception import AFMSAError
+
+CHAIN_A = (
+    ">query\nMVKV\n"
+    ">sp|P11111|XA_HUMAN desc\nMVKA\n"
+    ">tr|Q22222|YA_MOUSE\nMVKC\n"
+    ">sp|P33333|ZA_HUMAN\nMVKD\n"
+    ">UniRef100_A unknown species\nMVKE\n"
+    ">tr|Q55555|WA_YEAST\nMVKF\n"
+)
+CHAIN_B = (
+    ">query\nGGG\n"
+    ">tr|Q44444|XB_MOUSE\nGaGC\n"
+    ">tr|Q66666|YB_HUMAN\nGGA\n"
+)
+CHAIN_C = ">query\nWW\n>UniRef100_C n=1 TaxID=4932\nWA\n"
+
+
+@pytest.mark.parametrize("description,expected", [
+    ("sp|P69905|HBA_HUMAN Hemoglobin", "HUMAN"),
+    ("tr|A0A024R161|A0A024R161_9BACT/1-100", "9BACT"),
+    ("UniRef100_Q6GZX4 n=1 Tax=Frog virus 3 TaxID=654924", "654924"),
+    ("A0A0 Protein OS=Homo sapiens OX=9606 GN=HBA", "9606"),
+    ("sp|P68871|HBB_HUMAN Hemoglobin OS=Homo sapiens OX=9606", "9606"),
+    ("UniRef100_Q6GZX4", None),
+    ("hit1", None),
+])
+def test_species_key(description: str, expected: str | None) -> None:
+    assert species_key(description) == expected
+
+
+def test_pair_a3m() -> None:
+    paired_a, paired_b = [list(parse_a3m(msa))
+                          for msa in pair_a3m([CHAIN_A, CHAIN_B])]
+    # HUMAN is ranked before MOUSE and the rows of a species keep their order
+    assert paired_a == [("query", "MVKV"),
+                        ("sp|P11111|XA_HUMAN desc", "MVKA"),
+                        ("tr|Q22222|YA_MOUSE", "MVKC")]
+    assert paired_b == [("query", "GGG"),
+                        ("tr|Q66666|YB_HUMAN", "GGA"),
+                        ("tr|Q44444|XB_MOUSE", "GaGC")]
+
+    paired = pair_a3m([CHAIN_A, CHAIN_B], max_rows=2)
+    assert [msa.count("\n") for msa in paired] == [4, 4]
+
+
+def test_pair_a3m_mixed_databases() -> None:
+    uniprot = ">query\nMVKV\n>sp|P68871|HBB_HUMAN Hemoglobin OX=9606\nMVKA\n"
+    uniref = ">query\nGGG\n>UniRef100_P69905 n=1 TaxID=9606\nGGA\n"
+    paired_a, paired_b = [list(parse_a3m(msa))
+                          for msa in pair_a3m([uniprot, uniref])]
+    assert paired_a[1] == ("sp|P68871|HBB_HUMAN Hemoglobin OX=9606", "MVKA")
+    assert paired_b[1] == ("UniRef100_P69905 n=1 TaxID=9606", "GGA")
+
+
+def test_pair_a3m_min_chains(tmp_path: Path) -> None:
+    filename = tmp_path / "c.a3m"
+    filename.write_text(CHAIN_C)
+    paired = pair_a3m([CHAIN_A, CHAIN_B, str(filename)],
+                      is_path=[False, False, True])
+    assert [msa.count("\n") for msa in paired] == [2, 2, 2]
+
+    paired_a, paired_b, paired_c = [
+        list(parse_a3m(msa)) for msa in
+        pair_a3m([CHAIN_A, CHAIN_B, str(filename)],
+                 is_path=[False, False, True], min_chains=2)
+    ]
+    assert len(paired_a) == len(paired_b) == len(paired_c) == 3
+    # the insertions are not part of the width of the gap rows
+    assert paired_c[1] == (GAP_DESCRIPTION, "--")
+    assert paired_b[2] == ("tr|Q44444|XB_MOUSE", "GaGC")
+
+    with pytest.raises(ValueError):
+        pair_a3m([CHAIN_A])
+    with pytest.raises(ValueError):
+        pair_a3m([CHAIN_A, CHAIN_B], min_chains=3)
+    with pytest.raises(AFMSAError):
+        pair_a3m([CHAIN_A, ""])
+
+
+def test_pair_msas() -> None:
+    afinput = InputFile()
+    afinput.sequences.append(ProteinSequence("MVKV", msa=MSA(
+        paired=">query\nMVKV\n", unpaired=CHAIN_A
+    )))
+    afinput.sequences.append(ProteinSequence("GGG", msa=MSA(unpaired=CHAIN_B)))
+    afinput.sequences.append(ProteinSequence("WW"))
+    afinput.sequences.append(RNASequence("AUGC", msa=MSA(unpaired=CHAIN_C)))
+
+    assert pair_msas(afinput) == 2
+    assert afinput.sequences[0].msa.paired.count("\n") == 6
+    assert afinput.sequences[1].to_dict()["protein"]["pairedMsa"] == \
+        ">query\nGGG\n>tr|Q66666|YB_HUMAN\nGGA\n>tr|Q44444|XB_MOUSE\nGaGC\n"
+    assert afinput.sequences[3].msa.paired is None
+
+    assert pair_msas(InputFile()) == 0
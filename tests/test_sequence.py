@@ -1,6 +1,10 @@
 import pytest
 
+import copy
+import pickle
+import gzip
 import io
+import os
 
 from af3cli.sequence import (SequenceType, Sequence,
                              ProteinSequence,
@@ -10,7 +14,15 @@ from af3cli.sequence import (Modification, ResidueModification,
                              NucleotideModification)
 from af3cli.sequence import MSA
 from af3cli.sequence import is_valid_sequence, identify_sequence_type
-from af3cli.sequence import read_fasta, fasta2seq
+from af3cli.sequence import find_invalid_residue
+from af3cli.sequence import reverse_complement, reverse_complements
+from af3cli.sequence import classify_sequence, classify_sequences
+from af3cli import sequence
+from af3cli.exception import AFSequenceError, AFModificationError
+from af3cli.sequence import read_fasta, fasta2seq, parse_fasta
+from af3cli.sequence import fasta_fetch, fasta_index
+from af3cli.sequence import parse_a3m, a3m_stats, cap_a3m, a3m_identity
+from af3cli.exception import AFMSAError
 
 
 @pytest.fixture(scope="module")
@@ -320,6 +332,28 @@ def test_is_seq_type(seq_type: SequenceType, seq_str: str, result: bool):
     assert is_valid_sequence(seq_type=seq_type, seq_str=seq_str) == result
 
 
+@pytest.mark.parametrize("seq_type,seq_str,result", [
+    (SequenceType.PROTEIN, "MVKVGVNGF", None),
+    (SequenceType.PROTEIN, "", None),
+    (SequenceType.PROTEIN, "AAQAAU", (5, "U")),
+    (SequenceType.RNA, "AUGTU", (3, "T")),
+    (SequenceType.DNA, "GACcTCT", (3, "c")),
+    (SequenceType.DNA, "GAC\u00c4TCT", (3, "\u00c4")),
+])
+def test_find_invalid_residue(
+        seq_type: SequenceType,
+        seq_str: str,
+        result: tuple[int, str] | None
+):
+    assert find_invalid_residue(seq_type, seq_str) == result
+
+
+def test_sequence_invalid_residue():
+    seq = Sequence(SequenceType.PROTEIN, "MVKXGV")
+    with pytest.raises(AFSequenceError, match="'X' at position 4"):
+        seq.to_dict()
+
+
 @pytest.mark.parametrize("seq_str,result", [
     ("MVKVGVNGF", SequenceType.PROTEIN),
     ("AUGUGUAU", SequenceType.RNA),
@@ -332,6 +366,43 @@ def test_identify_seq_type(seq_str: str, result: SequenceType | None):
     assert identify_sequence_type(seq_str=seq_str) == result
 
 
+@pytest.mark.parametrize("seq_str,seq_type,reason", [
+    ("MVKVGVNGF", SequenceType.PROTEIN, None),
+    ("GACCTCT", SequenceType.DNA, None),
+    ("AUGUGUAU", SequenceType.RNA, None),
+    ("GACCCAAGG", None, "only A, C, G: valid DNA and RNA sequence"),
+    ("", None, "empty sequence"),
+    ("MVK1VG", None, "invalid character '1' at position 4"),
+    ("ACGTU", None, "residues A, C, G, T, U do not belong to a single alphabet"),
+])
+def test_classify_sequence(
+        seq_str: str,
+        seq_type: SequenceType | None,
+        reason: str | None
+):
+    result = classify_sequence(seq_str)
+    assert result.seq_type == seq_type
+    assert result.reason == reason
+    assert bool(result) == (seq_type is not None)
+
+
+def test_classify_sequence_chunks(monkeypatch):
+    monkeypatch.setattr(sequence, "CLASSIFY_CHUNKSIZE", 4)
+    # protein is unambiguous after the first chunk
+    assert classify_sequence("MVKVACGT").seq_type == SequenceType.PROTEIN
+    assert classify_sequence("MVKVACGTX").reason == \
+           "invalid character 'X' at position 9"
+    assert classify_sequence("ACGTACGTU").reason == \
+           "residues A, C, G, T, U do not belong to a single alphabet"
+    assert classify_sequence("ACGUACGUAC").seq_type == SequenceType.RNA
+
+
+def test_classify_sequences():
+    seq_strs = ["MVKVGVNGF", "AUGUGUAU", "ACG"]
+    assert [r.seq_type for r in classify_sequences(seq_strs)] == \
+           [SequenceType.PROTEIN, SequenceType.RNA, None]
+
+
 def test_read_fasta_single(single_fasta_file):
     for entry in read_fasta(single_fasta_file):
         assert entry[0] is not None
@@ -386,6 +457,52 @@ def test_dna_complement():
     assert complement.sequence == "CGAATTCGC"
 
 
+def test_rna_complement():
+    seq = RNASequence("GCGAAUUCGA", seq_name="rna")
+    complement = seq.reverse_complement()
+    assert isinstance(complement, RNASequence)
+    assert complement.sequence == "UCGAAUUCGC"
+    assert complement.seq_name == "rna"
+
+
+@pytest.mark.parametrize("seq_str,seq_type,iupac,expected", [
+    ("", SequenceType.DNA, False, ""),
+    ("AACGTT", SequenceType.DNA, False, "AACGTT"),
+    ("ACGUN", SequenceType.RNA, True, "NACGU"),
+    ("ARYSWKMBDHVN", SequenceType.DNA, True, "NBDHVKMWSRYT"),
+])
+def test_reverse_complement(
+        seq_str: str,
+        seq_type: SequenceType,
+        iupac: bool,
+        expected: str
+) -> None:
+    assert reverse_complement(seq_str, seq_type, iupac) == expected
+
+
+@pytest.mark.parametrize("seq_str,seq_type,iupac", [
+    ("ACGN", SequenceType.DNA, False),
+    ("ACGT", SequenceType.RNA, True),
+    ("ACGÄ", SequenceType.DNA, True),
+    ("ACGT", SequenceType.PROTEIN, False),
+])
+def test_reverse_complement_invalid(
+        seq_str: str,
+        seq_type: SequenceType,
+        iupac: bool
+) -> None:
+    with pytest.raises(AFSequenceError):
+        reverse_complement(seq_str, seq_type, iupac)
+
+
+def test_reverse_complements() -> None:
+    sequences = (seq for seq in ["ACG", DNASequence("AAC"), "NNA"])
+    complements = list(reverse_complements(sequences, iupac=True))
+    assert complements[0] == "CGT"
+    assert complements[1].sequence == "GTT"
+    assert complements[2] == "TNN"
+
+
 @pytest.mark.parametrize("cls,seq_str,seq_id,num", [
     (ProteinSequence, "MVKVGVNGF", "A", 1),
     (DNASequence, "AUGUGUAU", ["A", "B"], 1),
@@ -403,3 +520,243 @@ def test_num_sequences(
             assert seq.num == num_ids
         else:
             assert seq.num == num
+
+
+FASTA_CONTENT = (
+    "preamble line\n"
+    ">sp|Q9H165|BC11A_HUMAN B-cell lymphoma\r\n"
+    "MSRRKQGKPQ\r\n"
+    "hlskrefspe PLEA\r\n"
+    ">empty\n"
+    ">dna  with spaces \n"
+    "AATT>TTCC\n"
+    "\n"
+    "CGGG"
+)
+FASTA_RECORDS = [
+    ("sp|Q9H165|BC11A_HUMAN", "sp|Q9H165|BC11A_HUMAN B-cell lymphoma",
+     "MSRRKQGKPQHLSKREFSPEPLEA"),
+    ("empty", "empty", ""),
+    ("dna", "dna  with spaces", "AATT>TTCCCGGG"),
+]
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 3, 7, 1 << 20])
+def test_parse_fasta_chunks(monkeypatch, chunksize: int):
+    monkeypatch.setattr(sequence, "FASTA_CHUNKSIZE", chunksize)
+    assert list(parse_fasta(io.StringIO(FASTA_CONTENT))) == FASTA_RECORDS
+    assert list(parse_fasta(io.BytesIO(FASTA_CONTENT.encode()))) == \
+           FASTA_RECORDS
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_parse_fasta_file(tmp_path, compress: bool):
+    filename = tmp_path / "test.fasta"
+    data = FASTA_CONTENT.encode()
+    if compress:
+        data = gzip.compress(data)
+    filename.write_bytes(data)
+    assert list(parse_fasta(str(filename))) == FASTA_RECORDS
+    assert list(read_fasta(filename)) == \
+           [(seq_id, seq_str) for seq_id, _, seq_str in FASTA_RECORDS]
+
+
+@pytest.fixture
+def indexed_fasta_file(tmp_path):
+    filename = tmp_path / "proteome.fasta"
+    filename.write_text(
+        ">P1 first record\nMVKVGVNGFG\nRIGRL\n"
+        ">P2\nmsrrkqgkpq\r\nhlskrefspe\r\n"
+        ">P3\n"
+        ">P4 last\nAAQAA"
+    )
+    return filename
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_fasta_fetch(tmp_path, indexed_fasta_file, compress: bool):
+    filename = indexed_fasta_file
+    if compress:
+        filename = tmp_path / "proteome.fasta.gz"
+        filename.write_bytes(gzip.compress(indexed_fasta_file.read_bytes()))
+    records = list(fasta_fetch(str(filename), ["P4", "P2", "P3", "P1"]))
+    assert records == [
+        ("P4", "AAQAA"),
+        ("P2", "MSRRKQGKPQHLSKREFSPE"),
+        ("P3", ""),
+        ("P1", "MVKVGVNGFGRIGRL"),
+    ]
+    with pytest.raises(KeyError):
+        list(fasta_fetch(str(filename), ["P1", "P9"]))
+
+
+def test_fasta_index(indexed_fasta_file):
+    index = fasta_index(str(indexed_fasta_file))
+    index_file = indexed_fasta_file.with_suffix(".fasta.fai")
+    assert index_file.exists()
+    # samtools faidx columns: name, length, offset, line bases, line width
+    assert index_file.read_text().splitlines()[0] == "P1\t15\t17\t10\t11"
+    assert index["P2"].length == 20
+
+    # the index is reused until the FASTA file is modified
+    index_file.write_text("P1\t3\t17\t10\t11\n")
+    assert list(fasta_index(str(indexed_fasta_file))) == ["P1"]
+    mtime = index_file.stat().st_mtime_ns + 1_000_000_000
+    os.utime(indexed_fasta_file, ns=(mtime, mtime))
+    assert list(fasta_index(str(indexed_fasta_file))) == ["P1", "P2", "P3", "P4"]
+
+
+def test_fasta2seq_ids(indexed_fasta_file):
+    sequences = list(fasta2seq(str(indexed_fasta_file), ids=["P4", "P1"]))
+    assert [seq.sequence for seq in sequences] == ["AAQAA", "MVKVGVNGFGRIGRL"]
+
+
+@pytest.mark.parametrize("obj", [
+    ProteinSequence("MVKVGVNGF", msa=MSA(unpaired="a3m"),
+                    modifications=[ResidueModification("SEP", 2)],
+                    templates=[Template(TemplateType.FILE, "t.cif", [1], [1])]),
+    DNASequence("ACGT", seq_id=["B"]),
+    RNASequence("ACGU"),
+])
+def test_sequence_slots(obj: Sequence) -> None:
+    assert not hasattr(obj, "__dict__")
+    for copied in (copy.deepcopy(obj), pickle.loads(pickle.dumps(obj))):
+        assert copied.to_dict() == obj.to_dict()
+
+
+def test_sequence_validation_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+
+    def counting_find_invalid_residue(seq_type, seq_str):
+        calls.append(seq_str)
+        return find_invalid_residue(seq_type, seq_str)
+
+    monkeypatch.setattr(sequence, "find_invalid_residue",
+                        counting_find_invalid_residue)
+    sequence._cached_invalid_residue.cache_clear()
+
+    # the sequence string is validated once for all objects
+    receptor = "MVKVGVNGFGRIGRLVTRAAFNS"
+    for _ in range(3):
+        ProteinSequence(receptor).to_dict()
+    assert calls == [receptor]
+
+    # modifications are checked again when the list changes
+    seq = ProteinSequence(receptor)
+    seq.to_dict()
+    seq.modifications.append(NucleotideModification("6OG", 1))
+    with pytest.raises(AFModificationError):
+        seq.to_dict()
+    seq.modifications[0] = ResidueModification("SEP", 1)
+    assert "modifications" in seq.to_dict()["protein"]
+
+    with pytest.raises(AFSequenceError):
+        ProteinSequence("MVKV1").to_dict()
+    with pytest.raises(AFSequenceError):
+        ProteinSequence("MVKV1").to_dict()
+    assert calls == [receptor, "MVKV1"]
+
+
+A3M_CONTENT = (
+    ">query\nMVKVGVNGF\n"
+    ">hit1 species=1\nMV-VgGVNGF\n"
+    ">hit2\nMVKV\nGV..NGF\n"
+)
+
+
+def test_parse_a3m() -> None:
+    rows = list(parse_a3m(A3M_CONTENT))
+    assert rows[1] == ("hit1 species=1", "MV-VgGVNGF")
+    assert rows[2] == ("hit2", "MVKVGV..NGF")
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_a3m_stats_path(tmp_path, compress: bool) -> None:
+    filename = tmp_path / "msa.a3m"
+    data = A3M_CONTENT.encode()
+    filename.write_bytes(gzip.compress(data) if compress else data)
+    stats = a3m_stats(str(filename), is_path=True, query="MVKVGVNGF")
+    assert (stats.depth, stats.width) == (3, 9)
+    assert stats.query == "MVKVGVNGF"
+
+
+@pytest.mark.parametrize("content,query,message", [
+    (A3M_CONTENT, "MVKVGVNGA", "position 9"),
+    (A3M_CONTENT, "MVKV", "position 5"),
+    (A3M_CONTENT + ">hit3\nMVKVG", None, "Row 4"),
+])
+def test_a3m_stats_invalid(content: str, query: str, message: str) -> None:
+    with pytest.raises(AFMSAError, match=message):
+        a3m_stats(content, query=query)
+
+
+def test_sequence_check_msa(tmp_path) -> None:
+    filename = tmp_path / "msa.a3m"
+    filename.write_text(A3M_CONTENT)
+    seq = ProteinSequence("MVKVGVNGF", msa=MSA(
+        paired="", unpaired=str(filename), unpaired_is_path=True
+    ))
+    stats = seq.check_msa()
+    assert stats["paired"].depth == 0
+    assert stats["unpaired"].depth == 3
+    assert ProteinSequence("MVKVGVNGF").check_msa() == {}
+
+    seq = RNASequence("AUGC", msa=MSA(unpaired=">query\nAUGG\n"))
+    with pytest.raises(AFMSAError, match="unpaired"):
+        seq.check_msa()
+
+
+CAP_CONTENT = ">query\nMVKV\n" + "".join(
+    f">hit{i}\n{'MVKV' if i % 2 else 'MA-A'}\n" for i in range(10)
+)
+
+
+def test_a3m_identity() -> None:
+    assert a3m_identity("MVKV", "MVKV") == 1.0
+    assert a3m_identity("MA-A", "MVKV") == pytest.approx(1 / 3)
+    assert a3m_identity("MaA-V", "MVKV") == pytest.approx(2 / 3)
+    assert a3m_identity("----", "MVKV") == 0.0
+
+
+@pytest.mark.parametrize("strategy,options,expected", [
+    ("top", {}, ["query", "hit0", "hit1"]),
+    ("identity", {}, ["query", "hit0", "hit2"]),
+    ("identity", {"min_identity": 0.5, "max_identity": 1.0},
+     ["query", "hit1", "hit3"]),
+])
+def test_cap_a3m(strategy: str, options: dict, expected: list[str]) -> None:
+    rows = list(parse_a3m(cap_a3m(CAP_CONTENT, 3, strategy=strategy,
+                                  **options)))
+    assert [description for description, _ in rows] == expected
+
+
+def test_cap_a3m_random(tmp_path) -> None:
+    filename = tmp_path / "msa.a3m"
+    filename.write_text(CAP_CONTENT)
+    first = cap_a3m(str(filename), 4, is_path=True, strategy="random", seed=7)
+    assert first == cap_a3m(CAP_CONTENT, 4, strategy="random", seed=7)
+    rows = [description for description, _ in parse_a3m(first)]
+    assert len(rows) == 4 and rows[0] == "query"
+    # the sampled rows keep their original order
+    assert rows[1:] == sorted(rows[1:], key=lambda row: int(row[3:]))
+    assert cap_a3m(CAP_CONTENT, 100, strategy="random") == CAP_CONTENT
+    assert cap_a3m("", 3) == ""
+
+    with pytest.raises(ValueError, match="strategy"):
+        cap_a3m(CAP_CONTENT, 3, strategy="best")
+    with pytest.raises(ValueError):
+        cap_a3m(CAP_CONTENT, 0)
+
+
+def test_msa_cap(tmp_path) -> None:
+    filename = tmp_path / "msa.a3m"
+    filename.write_text(CAP_CONTENT)
+    output = tmp_path / "capped.a3m"
+    msa = MSA(paired=CAP_CONTENT, unpaired=str(filename),
+              unpaired_is_path=True)
+    msa.cap(2, unpaired_output=str(output))
+    assert msa.paired == ">query\nMVKV\n>hit0\nMA-A\n"
+    assert not msa.paired_is_path
+    assert msa.unpaired == str(output) and msa.unpaired_is_path
+    assert output.read_text() == msa.paired
+    assert filename.read_text() == CAP_CONTENT
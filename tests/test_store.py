@@ -0,0 +1,75 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from af3cli import InputFile, ProteinSequence, RNASequence
+from af3cli import MSA, Template, TemplateType
+from af3cli.store import BlobStore, externalize, externalize_files
+
+MSA_STR = ">query\nMVKVGVNGFGRIGRL\n>hit\nMVKVGVNGFGRIGRV\n"
+MMCIF_STR = "data_test\n_entry.id test\n"
+
+
+def _input_file(name: str) -> InputFile:
+    afinput = InputFile(name=name)
+    afinput.sequences.append(ProteinSequence(
+        "MVKVGVNGFGRIGRL",
+        msa=MSA(paired=MSA_STR, unpaired=MSA_STR),
+        templates=[Template(TemplateType.STRING, MMCIF_STR, [0, 1], [0, 1])]
+    ))
+    afinput.sequences.append(RNASequence(
+        "AUGC", msa=MSA(unpaired="relative.a3m", unpaired_is_path=True)
+    ))
+    return afinput
+
+
+def test_blob_store(tmp_path: Path) -> None:
+    store = BlobStore(str(tmp_path / "store"))
+    path1 = store.put(MSA_STR, ".a3m")
+    path2 = store.put(MSA_STR, ".a3m")
+    assert path1 == path2
+    assert os.path.isabs(path1)
+    assert Path(path1).read_text() == MSA_STR
+    assert (store.num_written, store.num_reused) == (1, 1)
+    assert store.put(MMCIF_STR, ".cif") != path1
+
+    # blobs written by other instances are reused
+    other_store = BlobStore(str(tmp_path / "store"))
+    assert other_store.put(MSA_STR, ".a3m") == path1
+    assert other_store.num_written == 0
+
+
+def test_externalize(tmp_path: Path) -> None:
+    afinput = _input_file("test")
+    assert externalize(afinput, str(tmp_path / "store")) == 3
+
+    content = afinput.to_dict()["sequences"]
+    protein = content[0]["protein"]
+    assert "pairedMsa" not in protein and "unpairedMsa" not in protein
+    assert protein["pairedMsaPath"] == protein["unpairedMsaPath"]
+    assert Path(protein["unpairedMsaPath"]).read_text() == MSA_STR
+    template = protein["templates"][0]
+    assert Path(template["mmcifPath"]).read_text() == MMCIF_STR
+    # existing paths are not modified
+    assert content[1]["rna"]["unpairedMsaPath"] == "relative.a3m"
+
+
+def test_externalize_files(tmp_path: Path) -> None:
+    for i in range(5):
+        _input_file(f"job{i}").write(str(tmp_path / f"job{i}.json"))
+    (tmp_path / "invalid.json").write_text("{")
+    store_dir = tmp_path / "store"
+
+    report, store = externalize_files(str(tmp_path), str(store_dir))
+    assert report.num_jobs == 6
+    assert str(report).startswith("6 files in ")
+    assert [Path(f).name for f, _ in report.failed] == ["invalid.json"]
+    assert store.num_written == 2
+    assert store.num_reused == 13
+    assert len(list(store_dir.rglob("*.*"))) == 2
+
+    afinput = InputFile.read(str(tmp_path / "job3.json"))
+    seq = afinput.sequences[0]
+    assert seq.msa.unpaired_is_path and seq.msa.paired_is_path
+    assert seq.templates[0].template_type == TemplateType.FILE
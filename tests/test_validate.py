@@ -0,0 +1,153 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from af3cli import InputFile, ProteinSequence, RNASequence, DNASequence
+from af3cli import CCDLigand, Template, TemplateType, MSA, Atom, Bond
+from af3cli import ResidueModification
+from af3cli.validate import (validate_data, validate_file, validate_many,
+                             check_bounds)
+
+
+@pytest.fixture
+def valid_data() -> dict:
+    afinput = InputFile(name="test", seeds=[1, 2])
+    afinput.sequences.append(ProteinSequence(
+        "MVKVGVNGFGRIGRL",
+        modifications=[ResidueModification("HY3", 1)],
+        templates=[Template(TemplateType.STRING, "data_", [0, 1], [2, 3])],
+        msa=MSA(paired="", unpaired="/msa/unpaired.a3m",
+                unpaired_is_path=True)
+    ))
+    afinput.sequences.append(RNASequence("AUGC", msa=MSA(unpaired="")))
+    afinput.sequences.append(DNASequence("GACC", num=2))
+    afinput.ligands.append(CCDLigand(["ATP"]))
+    afinput.bonded_atoms.append(Bond(Atom("A", 1, "CA"), Atom("E", 1, "C1")))
+    return afinput.to_dict()
+
+
+def _messages(data: dict) -> dict[str, str]:
+    return {issue.path: issue.message for issue in validate_data(data)}
+
+
+def test_validate_valid(valid_data: dict) -> None:
+    assert validate_data(valid_data) == []
+
+
+def test_validate_top_level(valid_data: dict) -> None:
+    del valid_data["name"]
+    valid_data["modelSeeds"] = []
+    valid_data["dialect"] = "other"
+    valid_data["version"] = True
+    valid_data["unknown"] = 1
+    issues = _messages(valid_data)
+    assert "Missing" in issues["$.name"]
+    assert "at least 1" in issues["$.modelSeeds"]
+    assert "alphafold3" in issues["$.dialect"]
+    assert "integer" in issues["$.version"]
+    assert issues["$.unknown"] == "Unknown field."
+
+
+def test_validate_entities(valid_data: dict) -> None:
+    protein = valid_data["sequences"][0]["protein"]
+    protein["modifications"][0] = {"ptmType": "HY3", "position": 1}
+    protein["templates"][0]["mmcifPath"] = "template.cif"
+    protein["pairedMsaPath"] = "paired.a3m"
+    valid_data["sequences"][1]["rna"]["pairedMsa"] = ""
+    valid_data["sequences"][2]["dna"]["id"] = ["C", "d"]
+    valid_data["sequences"][3] = {"ligand": {"id": "E"}}
+    valid_data["sequences"].append({"protein": {}, "dna": {}})
+
+    issues = _messages(valid_data)
+    mod_path = "$.sequences[0].protein.modifications[0]"
+    assert issues[f"{mod_path}.position"] == "Unknown field."
+    assert "Missing" in issues[f"{mod_path}.ptmPosition"]
+    assert "exclusive" in issues["$.sequences[0].protein.templates[0]"]
+    assert "exclusive" in issues["$.sequences[0].protein"]
+    assert issues["$.sequences[1].rna.pairedMsa"] == "Unknown field."
+    assert "Invalid value" in issues["$.sequences[2].dna.id[1]"]
+    assert "ccdCodes" in issues["$.sequences[3].ligand"]
+    assert "exactly one" in issues["$.sequences[4]"]
+
+
+def test_validate_consistency(valid_data: dict) -> None:
+    protein = valid_data["sequences"][0]["protein"]
+    protein["sequence"] = "MVKX"
+    protein["templates"][0]["queryIndices"] = [0]
+    valid_data["sequences"][1]["rna"]["modifications"] = [
+        {"modificationType": "2MG", "basePosition": 10}
+    ]
+    issues = _messages(valid_data)
+    assert "Invalid characters" in issues["$.sequences[0].protein.sequence"]
+    assert "length" in issues["$.sequences[0].protein.templates[0]"]
+    assert "sequence length" in \
+           issues["$.sequences[1].rna.modifications[0].basePosition"]
+
+
+def test_check_bounds(valid_data: dict) -> None:
+    protein = valid_data["sequences"][0]["protein"]
+    protein["modifications"].append({"ptmType": "HY3", "ptmPosition": 16})
+    protein["templates"][0]["queryIndices"] = [0, 15, "x", 14]
+    protein["templates"][0]["templateIndices"] = [0, 1, 2, 3]
+    issues = check_bounds(valid_data)
+    assert [issue.path for issue in issues] == [
+        "$.sequences[0].protein.modifications[1].ptmPosition",
+        "$.sequences[0].protein.templates[0].queryIndices[1]",
+    ]
+    assert issues[0].message == ("Position 16 of entity A is out of range "
+                                 "for the sequence length 15.")
+    assert "Query index 15 of entity A" in issues[1].message
+
+    # the bounds are part of the complete validation
+    paths = [issue.path for issue in validate_data(valid_data)]
+    assert paths == ["$.sequences[0].protein.templates[0].queryIndices[2]",
+                     *(issue.path for issue in issues)]
+    assert check_bounds({"sequences": [{"ligand": {"id": "L"}}, 1]}) == []
+
+
+def test_check_bounds_lower(valid_data: dict) -> None:
+    protein = valid_data["sequences"][0]["protein"]
+    protein["modifications"].append({"ptmType": "HY3", "ptmPosition": 0})
+    protein["templates"][0]["queryIndices"] = [-1, 0]
+    protein["templates"][0]["templateIndices"] = [0, 1]
+    issues = check_bounds(valid_data)
+    assert [issue.path for issue in issues] == [
+        "$.sequences[0].protein.modifications[1].ptmPosition",
+        "$.sequences[0].protein.templates[0].queryIndices[0]",
+    ]
+    assert "Position 0 of entity A" in issues[0].message
+
+    # the schema reports these values only once
+    paths = [issue.path for issue in validate_data(valid_data)]
+    assert sorted(paths) == sorted(issue.path for issue in issues)
+
+
+def test_validate_references(valid_data: dict) -> None:
+    valid_data["sequences"][1]["rna"]["id"] = "A"
+    valid_data["bondedAtomPairs"][0][1][0] = "Z"
+    issues = _messages(valid_data)
+    assert "Duplicate" in issues["$.sequences[1].rna.id"]
+    assert "Unknown entity" in issues["$.bondedAtomPairs[0][1][0]"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_validate_many(
+        tmp_path: Path,
+        valid_data: dict,
+        workers: int
+) -> None:
+    for i in range(3):
+        (tmp_path / f"job{i}.json").write_text(json.dumps(valid_data))
+    valid_data["sequences"] = []
+    (tmp_path / "empty.json").write_text(json.dumps(valid_data))
+    (tmp_path / "broken.json").write_text("{")
+
+    assert validate_file(str(tmp_path / "job0.json")) == []
+    report = validate_many(str(tmp_path), workers=workers)
+    assert report.num_files == 5
+    assert sorted(Path(f).name for f in report.invalid) == \
+           ["broken.json", "empty.json"]
+    content = report.to_dict()
+    assert content["numInvalid"] == 2
+    json.dumps(content)